@@ -23,6 +23,7 @@ from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryError
 from homeassistant.helpers import issue_registry as ir, restore_state
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.typing import ConfigType
 
 from . import api_client
@@ -57,10 +58,13 @@ from .const import (
     LOGGER,
     PLATFORMS,
     REGISTERED_EXCLUDES,
+    REQUEST_SCHEDULER,
 )
 from .coordinator import AnkerSolixDataUpdateCoordinator
 from .services import async_setup_services  # async_remove_services
 from .solixapi.apitypes import ApiCategories, SolixDeviceType
+from .solixapi.energystore import AnkerSolixEnergyStore
+from .solixapi.session import AnkerSolixRequestScheduler
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -73,6 +77,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
     hass.data.setdefault(DOMAIN, {})
+    # shared request scheduler for fair queuing of all account requests per server
+    scheduler: AnkerSolixRequestScheduler = hass.data[DOMAIN].setdefault(
+        REQUEST_SCHEDULER, AnkerSolixRequestScheduler()
+    )
     username = entry.data.get(CONF_USERNAME)
     excludes = set(entry.options.get(CONF_EXCLUDE, []))
     # Add the actual MQTT usage as exclude as well if disabled, it will be used to exclude certain entities
@@ -97,6 +105,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         # set testmode for client and json test file folder for api
         if coordinator and coordinator.client:
+            # submit all client session requests to the shared scheduler
+            coordinator.client.api.apisession.scheduler = scheduler
+            # keep daily energy history locally to query only missing or mutable days
+            coordinator.client.api.energyStore = AnkerSolixEnergyStore(
+                energy_store_file(hass, entry), logger=coordinator.client.api.logger()
+            )
             # load authentication info to get client nickname for coordinator
             await coordinator.client.authenticate()
         # Introduce delay for staggered reloads of multiple hubs
@@ -165,12 +179,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     # Clear old issue if last enabled config loads successfully
     entries = hass.config_entries.async_entries(DOMAIN, include_disabled=False)
-    active = hass.data.get(DOMAIN) or []
+    active = [
+        c
+        for c in (hass.data.get(DOMAIN) or {}).values()
+        if isinstance(c, AnkerSolixDataUpdateCoordinator)
+    ]
     if len(active) >= len(entries):
         ir.async_delete_issue(hass, DOMAIN, "duplicate_devices")
 
     # forward to platform to create entities
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # activate consumer registry of created entities to skip optional endpoints without enabled entities
+    coordinator.client.api.consumers.activate()
     return True
 
 
@@ -179,6 +199,9 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     coordinator: AnkerSolixDataUpdateCoordinator = hass.data[DOMAIN].get(entry.entry_id)
     do_reload = True
     if coordinator and coordinator.client:
+        # drop the mutable days of the local energy history upon option changes, final days are kept
+        if coordinator.client.api.energyStore:
+            await coordinator.client.api.energyStore.clear(mutable=True)
         testmode = bool(entry.options.get(CONF_TEST_OPTIONS, {}).get(TESTMODE, False))
         testfolder = entry.options.get(CONF_TEST_OPTIONS, {}).get(TESTFOLDER, "")
         excluded = entry.options.get(CONF_EXCLUDE, [])
@@ -272,7 +295,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     #     # unregister services if no config remains
     #     async_remove_services(hass)
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        if coordinator and coordinator.client and coordinator.client.api.energyStore:
+            await hass.async_add_executor_job(coordinator.client.api.energyStore.close)
+        # remove the shared request scheduler when the last entry was unloaded
+        if not [
+            c
+            for c in hass.data[DOMAIN].values()
+            if isinstance(c, AnkerSolixDataUpdateCoordinator)
+        ]:
+            hass.data[DOMAIN].pop(REQUEST_SCHEDULER, None)
     return unloaded
 
 
@@ -280,9 +312,20 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry. The config entry is deleted from hass.config_entries before this is called."""
     # Clear old issue if remaining configs are all loaded
     entries = hass.config_entries.async_entries(DOMAIN, include_disabled=False)
-    active = hass.data.get(DOMAIN) or []
+    active = [
+        c
+        for c in (hass.data.get(DOMAIN) or {}).values()
+        if isinstance(c, AnkerSolixDataUpdateCoordinator)
+    ]
     if len(active) >= len(entries):
         ir.async_delete_issue(hass, DOMAIN, "duplicate_devices")
+    # remove the local energy history of the entry
+    await hass.async_add_executor_job(energy_store_file(hass, entry).unlink, True)
+
+
+def energy_store_file(hass: HomeAssistant, entry: ConfigEntry) -> Path:
+    """Get the local energy history store file of the config entry."""
+    return Path(hass.config.path(STORAGE_DIR)) / f"{DOMAIN}.{entry.entry_id}.energy.db"
 
 
 async def async_remove_config_entry_device(
@@ -1,7 +1,7 @@
 """Anker Solix API Client Wrapper."""
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import os
 from pathlib import Path
@@ -38,6 +38,7 @@ from .const import (
 from .solixapi import errors
 from .solixapi.api import AnkerSolixApi
 from .solixapi.apitypes import ApiCategories, SolixDefaults, SolixDeviceType
+from .solixapi.helpers import PollScheduler
 from .solixapi.mqtt_device import SolixMqttDevice
 from .solixapi.mqtt_factory import SolixMqttDeviceFactory
 from .solixapi.mqttcmdmap import SolixMqttCommands
@@ -94,6 +95,30 @@ API_CATEGORIES: list = [
     ApiCategories.device_tag,
     ApiCategories.site_price,
 ]
+# Poll groups refreshed with the device interval multiplier in priority order
+# Site details must run in the same tick after device details, only device energy is phase shifted across the multiplier
+DEVICE_POLL_GROUPS: list = ["device_details", "site_details", "device_energy"]
+# Poll groups refreshed with their own interval, as part of the parent group run
+INTERVAL_POLL_GROUPS: dict = {
+    # site prices and dynamic price providers
+    "prices": {
+        "interval": timedelta(hours=1),
+        "parent": "site_details",
+        "categories": {ApiCategories.site_price},
+    },
+    # OTA settings and firmware update info
+    "ota": {
+        "interval": timedelta(days=1),
+        "parent": "device_details",
+        "categories": {ApiCategories.device_auto_upgrade},
+    },
+    # vehicle details, refreshed daily or on demand
+    "vehicles": {
+        "interval": timedelta(days=1),
+        "parent": "device_details",
+        "categories": {SolixDeviceType.VEHICLE.value},
+    },
+}
 DEFAULT_EXCLUDE_CATEGORIES: list = [
     ApiCategories.solarbank_energy,
     ApiCategories.solarbank_pps_energy,
@@ -145,7 +170,7 @@ class AnkerSolixApiClient:
     deferred_data: bool
     cache_valid: bool
     active_device_refresh: bool
-    _intervalcount: int
+    scheduler: PollScheduler
     _allow_refresh: bool
     _startup: bool
 
@@ -207,7 +232,8 @@ class AnkerSolixApiClient:
                 INTERVALMULT, DEFAULT_DEVICE_MULTIPLIER
             )
         )
-        self._intervalcount = 0
+        self.scheduler = PollScheduler()
+        self._setup_scheduler()
         self._allow_refresh = True
         self._mqtt_usage = bool(
             (data.get(CONF_MQTT_OPTIONS) or {}).get(CONF_MQTT_USAGE, DEFAULT_MQTT_USAGE)
@@ -321,7 +347,7 @@ class AnkerSolixApiClient:
                 f"Api Client Error: {type(exception)}: {exception}"
             ) from exception
 
-    async def async_get_data(
+    async def async_get_data(  # noqa: C901
         self,
         from_cache: bool = False,
         device_details: bool = False,
@@ -329,6 +355,7 @@ class AnkerSolixApiClient:
         reset_cache: bool = False,
     ) -> any:
         """Get data from the API."""
+        start_time = datetime.now()
         try:
             if self._allow_refresh:
                 if reset_cache:
@@ -350,6 +377,8 @@ class AnkerSolixApiClient:
                     self.mqtt_devices = {}
                     self.startup = True
                     self.deferred_data = False
+                    # make all poll groups due again
+                    self.scheduler.reset()
                 if from_cache:
                     # if refresh from cache is requested, only the actual api cache will be returned for coordinator data
                     _LOGGER.debug(
@@ -375,6 +404,7 @@ class AnkerSolixApiClient:
                                 vehicleId=vehicle.get("vehicle_id"),
                                 fromFile=self._testmode,
                             )
+                        self.scheduler.mark("vehicles")
                 elif device_details:
                     # if device_details requested manually, enforce site and device refresh and reset intervals
                     # avoid consecutive executions within 60 seconds
@@ -433,7 +463,13 @@ class AnkerSolixApiClient:
                                 fromFile=self._testmode,
                                 exclude=set(self.exclude_categories),
                             )
-                        self._intervalcount = self._deviceintervals
+                        # restart the cadence of all groups that were refreshed
+                        self.scheduler.mark("sites")
+                        self.scheduler.force("ota", "prices", "vehicles")
+                        self.scheduler.mark("device_details")
+                        self.scheduler.mark("site_details")
+                        if not self.startup:
+                            self.scheduler.mark("device_energy")
                         self.last_site_refresh = datetime.now().astimezone()
                         self.last_device_refresh = datetime.now().astimezone()
                         self.active_device_refresh = False
@@ -450,63 +486,71 @@ class AnkerSolixApiClient:
                         self.api.apisession.nickname,
                         f"from folder {self.api.testDir()}" if self._testmode else "",
                     )
+                    # advance the scheduler tick and run only the due poll groups
+                    due = self.scheduler.advance()
                     await self.api.update_sites(
                         fromFile=self._testmode,
                         exclude=set(self.exclude_categories),
                     )
-                    # update device details only after given refresh interval count
-                    self._intervalcount -= 1
-                    if self._intervalcount <= 0:
+                    self.scheduler.mark("sites")
+                    if set(due) & set(DEVICE_POLL_GROUPS):
                         self.active_device_refresh = True
-                        _LOGGER.log(
-                            logging.INFO if ALLOW_TESTMODE else logging.DEBUG,
-                            "Api Coordinator %s is updating devices %s",
-                            self.api.apisession.nickname,
-                            f"from folder {self.api.testDir()}"
-                            if self._testmode
-                            else "",
-                        )
-                        # Fetch device details without excluded types or categories
-                        await self.api.update_device_details(
-                            fromFile=self._testmode,
-                            exclude=set(self.exclude_categories),
-                        )
-                        # Fetch site details without excluded types or categories
-                        # This must be run after the device details, which may create virtual sites for standalone devices
-                        await self.api.update_site_details(
-                            fromFile=self._testmode,
-                            exclude=set(self.exclude_categories),
-                        )
-                        # Fetch energy if not excluded via options
-                        if self.startup:
-                            _LOGGER.info(
-                                "Api Coordinator %s is deferring energy updates",
+                        if "device_details" in due:
+                            _LOGGER.log(
+                                logging.INFO if ALLOW_TESTMODE else logging.DEBUG,
+                                "Api Coordinator %s is updating devices %s",
                                 self.api.apisession.nickname,
+                                f"from folder {self.api.testDir()}"
+                                if self._testmode
+                                else "",
                             )
-                        else:
-                            await self.api.update_device_energy(
+                            # Fetch device details without excluded types or categories or groups not due
+                            await self.api.update_device_details(
                                 fromFile=self._testmode,
-                                exclude=set(self.exclude_categories),
+                                exclude=set(self.exclude_categories)
+                                | self.scheduler.skipped_categories("device_details"),
                             )
-                        self._intervalcount = self._deviceintervals
-                        self.last_device_refresh = datetime.now().astimezone()
+                            self.scheduler.mark("device_details")
+                            self.last_device_refresh = datetime.now().astimezone()
+                        if "site_details" in due:
+                            # Fetch site details without excluded types or categories or groups not due
+                            # This must be run after the device details, which may create virtual sites for standalone devices
+                            await self.api.update_site_details(
+                                fromFile=self._testmode,
+                                exclude=set(self.exclude_categories)
+                                | self.scheduler.skipped_categories("site_details"),
+                            )
+                            self.scheduler.mark("site_details")
+                        if "device_energy" in due:
+                            # Defer energy of first device refresh to next tick
+                            if (
+                                self.startup
+                                and "device_details" in due
+                                and self.scheduler.runs("device_details") <= 1
+                            ):
+                                _LOGGER.info(
+                                    "Api Coordinator %s is deferring energy updates",
+                                    self.api.apisession.nickname,
+                                )
+                            else:
+                                if self.startup:
+                                    # Fetch deferred energy skipped from first device refresh
+                                    _LOGGER.info(
+                                        "Api Coordinator %s is updating deferred energy data",
+                                        self.api.apisession.nickname,
+                                    )
+                                # Fetch energy if not excluded via options
+                                await self.api.update_device_energy(
+                                    fromFile=self._testmode,
+                                    exclude=set(self.exclude_categories),
+                                )
+                                self.scheduler.mark("device_energy")
+                                if self.startup:
+                                    self.deferred_data = True
+                                    self.startup = False
                         self.active_device_refresh = False
                         # ensure MQTT session status is as required
                         await self.check_mqtt_session()
-                    elif self.startup and not self.deferred_data:
-                        self.active_device_refresh = True
-                        # Fetch deferred energy skipped from first device refresh
-                        _LOGGER.info(
-                            "Api Coordinator %s is updating deferred energy data",
-                            self.api.apisession.nickname,
-                        )
-                        await self.api.update_device_energy(
-                            fromFile=self._testmode,
-                            exclude=set(self.exclude_categories),
-                        )
-                        self.deferred_data = True
-                        self.startup = False
-                        self.active_device_refresh = False
                     self.last_site_refresh = datetime.now().astimezone()
                     if not self._testmode:
                         _LOGGER.debug(
@@ -514,6 +558,13 @@ class AnkerSolixApiClient:
                             self.api.apisession.nickname,
                             self.api.request_count,
                         )
+                # record the duration of the complete poll cycle in the request statistics of the account cache
+                if not from_cache and self.api.account:
+                    self.api.apisession.request_stats.add_cycle(
+                        (datetime.now() - start_time).total_seconds()
+                    )
+                    # refresh the account details with the updated request statistics
+                    self.api._update_account()  # noqa: SLF001
                 # combine api sites, devices and account dictionaries for single data cache
                 data = self.api.getCaches()
             else:
@@ -557,22 +608,50 @@ class AnkerSolixApiClient:
             )
         return self._testmode
 
+    def _setup_scheduler(self) -> None:
+        """Define the poll groups with their cadence and priority in the scheduler."""
+        self.scheduler.add_group("sites", ticks=1, priority=0)
+        for prio, group in enumerate(DEVICE_POLL_GROUPS, start=1):
+            self.scheduler.add_group(
+                group,
+                ticks=self._deviceintervals,
+                priority=prio,
+                phase=self._group_phase(group),
+            )
+        for prio, (group, options) in enumerate(
+            INTERVAL_POLL_GROUPS.items(), start=len(DEVICE_POLL_GROUPS) + 1
+        ):
+            self.scheduler.add_group(group, priority=prio, **options)
+
+    def _group_phase(self, group: str) -> int:
+        """Get the tick phase of a device poll group, device energy is shifted to half the device interval multiplier."""
+        return self._deviceintervals // 2 if group == "device_energy" else 0
+
     def intervalcount(self, newcount: int | None = None) -> int:
         """Query or set actual interval count for next device refresh."""
+        count = self.scheduler.ticks_until("device_details")
         if (
             newcount is not None
             and isinstance(newcount, float | int)
-            and self._intervalcount != int(newcount)
+            and count != int(newcount)
         ):
             _LOGGER.log(
                 logging.INFO if ALLOW_TESTMODE else logging.DEBUG,
                 "Api Coordinator %s device refresh counter was changed from %s to %s",
                 self.api.apisession.nickname,
-                self._intervalcount,
+                count,
                 int(newcount),
             )
-            self._intervalcount = int(newcount)
-        return self._intervalcount
+            # shift all device poll groups to keep their phase
+            for group in DEVICE_POLL_GROUPS:
+                self.scheduler.ticks_until(
+                    group,
+                    ticks=max(
+                        0, self.scheduler.ticks_until(group) + int(newcount) - count
+                    ),
+                )
+            count = int(newcount)
+        return count
 
     def deviceintervals(self, intervals: int | None = None) -> int:
         """Query or set deviceintervals for client."""
@@ -588,7 +667,12 @@ class AnkerSolixApiClient:
                 int(intervals),
             )
             self._deviceintervals = int(intervals)
-            self._intervalcount = min(self._deviceintervals, self._intervalcount)
+            for group in DEVICE_POLL_GROUPS:
+                self.scheduler.set_cadence(
+                    group,
+                    ticks=self._deviceintervals,
+                    phase=self._group_phase(group),
+                )
         return self._deviceintervals
 
     def delay_time(self, seconds: float | None = None) -> float:
@@ -745,6 +829,7 @@ class AnkerSolixApiClient:
     async def check_mqtt_session(self) -> None:
         """Check mqtt usage and status of session, restart if required."""
         if self._mqtt_usage:
+            start_time = datetime.now()
             # restart connection if not connected
             if not self.api.mqttsession or not self.api.mqttsession.is_connected():
                 _LOGGER.info(
@@ -821,6 +906,9 @@ class AnkerSolixApiClient:
                     ):
                         # clear mqtt data cache to avoid orphaned data
                         mdev.mqttdata.clear()
+            self.api.apisession.request_stats.add_phase(
+                "mqtt_check", (datetime.now() - start_time).total_seconds()
+            )
 
     def subscribe_device(self, deviceDict: dict) -> bool:
         """Subscribe a device to MQTT messages."""
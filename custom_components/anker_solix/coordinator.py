@@ -1,6 +1,7 @@
 """DataUpdateCoordinator for Anker Solix."""
 
 from asyncio import sleep
+from collections.abc import Callable
 from datetime import datetime, timedelta
 import logging
 from typing import Any
@@ -212,6 +213,40 @@ class AnkerSolixDataUpdateCoordinator(DataUpdateCoordinator):
             ):
                 await self.async_remove_device(devices=removed)
 
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates and register the entity as consumer of its cache keys."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        entity = getattr(update_callback, "__self__", None)
+        if not (
+            self.client
+            and (description := getattr(entity, "entity_description", None))
+            and (consumer := getattr(entity, "unique_id", None))
+        ):
+            return remove_listener
+        # normalize nested contexts to the base device SN and add the site ID of devices as parent context
+        base = (
+            context
+            if not isinstance(context, str) or context in (self.data or {})
+            else context.split("_")[0]
+        )
+        self.client.api.consumers.register(
+            consumer=consumer,
+            keys={description.key, getattr(description, "json_key", None)},
+            context=context,
+            parents={base, ((self.data or {}).get(base) or {}).get("site_id")},
+        )
+
+        @callback
+        def remove_consumer() -> None:
+            """Remove the consumer and the listener."""
+            self.client.api.consumers.unregister(consumer)
+            remove_listener()
+
+        return remove_consumer
+
     def update_callback(self, sn: str | None = None, **args) -> None:
         """Define callback for coordinator updates upon MQTT value changes."""
         LOGGER.debug(
@@ -363,7 +398,8 @@ class AnkerSolixDataUpdateCoordinator(DataUpdateCoordinator):
         active_crds: list[AnkerSolixDataUpdateCoordinator] = [
             c
             for c in (self.hass.data.get(DOMAIN) or {}).values()
-            if c.config_entry.entry_id != self.config_entry.entry_id
+            if isinstance(c, AnkerSolixDataUpdateCoordinator)
+            and c.config_entry.entry_id != self.config_entry.entry_id
         ]
         # determine a staggered delay based on last data collections of active coordinators or configuration index if none active yet
         next_refreshes: list[datetime] = [
@@ -444,7 +480,8 @@ class AnkerSolixDataUpdateCoordinator(DataUpdateCoordinator):
         active_crds: list[AnkerSolixDataUpdateCoordinator] = [
             c
             for c in (self.hass.data.get(DOMAIN) or {}).values()
-            if c.config_entry.entry_id != self.config_entry.entry_id
+            if isinstance(c, AnkerSolixDataUpdateCoordinator)
+            and c.config_entry.entry_id != self.config_entry.entry_id
             and c.client.deviceintervals() > 2
         ]
         # determine a staggered delay based on running or delayed clients that cannot be delayed further
@@ -7,7 +7,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .const import DOMAIN
+from .const import DOMAIN, REQUEST_SCHEDULER
 from .coordinator import AnkerSolixDataUpdateCoordinator
 
 TO_REDACT = {"ip_address", "unique_id", "username", "password", "email", "owner_user_id", "bt_ble_mac", "wifi_mac", "wifi_name"}
@@ -25,9 +25,18 @@ async def async_get_config_entry_diagnostics(
         # redact keys from cache
         entry_dict = entry.as_dict()
         cache["account"] = cache.pop(entry_dict.get("unique_id"),{})
+        scheduler = coordinator.client.api.apisession.scheduler or hass.data[
+            DOMAIN
+        ].get(REQUEST_SCHEDULER)
         return {
             "config_entry": async_redact_data(entry_dict, TO_REDACT),
             "cached_data": async_redact_data(cache, TO_REDACT),
+            "request_scheduler": scheduler.metrics(
+                account=coordinator.client.api.apisession.email
+            )
+            if scheduler
+            else {},
+            "request_statistics": coordinator.client.api.apisession.request_stats.asdict(),
         }
     return {}
 
@@ -3757,6 +3757,16 @@ ACCOUNT_SENSORS = [
             "runtime_seconds": d.get("details_poll_seconds"),
         },
     ),
+    AnkerSolixSensorDescription(
+        key="site_details_poll_time",
+        translation_key="site_details_poll_time",
+        json_key="site_details_poll_time",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        attrib_fn=lambda d, _: {
+            "runtime_seconds": d.get("site_details_poll_seconds"),
+        },
+    ),
     AnkerSolixSensorDescription(
         key="energy_poll_time",
         translation_key="energy_poll_time",
@@ -3767,6 +3777,50 @@ ACCOUNT_SENSORS = [
             "runtime_seconds": d.get("energy_poll_seconds"),
         },
     ),
+    AnkerSolixSensorDescription(
+        # Api request statistics
+        key="request_statistic",
+        translation_key="request_statistic",
+        json_key="request_statistic",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda d, jk, _: (d.get(jk) or {}).get("avg_ms"),
+        native_unit_of_measurement="ms",
+        suggested_display_precision=0,
+        attrib_fn=lambda d, _: {
+            key: (d.get("request_statistic") or {}).get(key)
+            for key in [
+                "requests",
+                "p90_ms",
+                "max_ms",
+                "avg_bytes",
+                "errors",
+                "error_codes",
+                "throttled",
+                "busy",
+                "slowest",
+            ]
+        },
+    ),
+    AnkerSolixSensorDescription(
+        # Poller phase timings
+        key="poll_phase_statistic",
+        translation_key="poll_phase_statistic",
+        json_key="request_statistic",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda d, jk, _: ((d.get(jk) or {}).get("cycle") or {}).get("seconds"),
+        native_unit_of_measurement="s",
+        suggested_display_precision=3,
+        attrib_fn=lambda d, _: (
+            {
+                "cycle_time": (
+                    (d.get("request_statistic") or {}).get("cycle") or {}
+                ).get("time")
+            }
+            | ((d.get("request_statistic") or {}).get("phases") or {})
+        ),
+    ),
     AnkerSolixSensorDescription(
         # MQTT statistics
         key="mqtt_statistic",
@@ -4340,8 +4394,23 @@ class AnkerSolixSensor(CoordinatorEntity, SensorEntity):
                 # Wait until client cache is valid
                 await self.coordinator.client.validate_cache()
                 if kwargs.get(INCLUDE_CACHE):
+                    api = self.coordinator.client.api
+                    if api.consumers.active:
+                        # Regular polls skip optional endpoints without enabled entity consumers, poll them once for the full cache
+                        api.consumers.activate(False)
+                        try:
+                            await api.update_device_details(
+                                fromFile=self.coordinator.client.testmode(),
+                                exclude=set(self.coordinator.client.exclude_categories),
+                            )
+                            await api.update_site_details(
+                                fromFile=self.coordinator.client.testmode(),
+                                exclude=set(self.coordinator.client.exclude_categories),
+                            )
+                        finally:
+                            api.consumers.activate()
                     result = (
-                        await self.coordinator.client.api.update_sites(
+                        await api.update_sites(
                             siteId=self._context_base,
                             fromFile=self.coordinator.client.testmode(),
                             exclude=set(self.coordinator.client.exclude_categories),
@@ -1,8 +1,6 @@
 """Class for interacting with the Anker Power / Solix API."""
 # ruff: noqa: N806
 
-import contextlib
-from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 from typing import Any
@@ -13,33 +11,17 @@ from .apibase import AnkerSolixBaseApi
 from .apitypes import (
     API_ENDPOINTS,
     API_FILEPREFIXES,
-    PowerdockStatus,
-    SmartmeterStatus,
     SolarbankAiemsRuntimeStatus,
-    SolarbankDeviceMetrics,
     SolarbankParallelTypes,
-    SolarbankPpsStatus,
     SolarbankRatePlan,
-    SolarbankStatus,
     SolarbankUsageMode,
-    SolixDefaults,
-    SolixDeviceCapacity,
-    SolixDeviceCategory,
-    SolixDeviceNames,
-    SolixDeviceStatus,
     SolixDeviceType,
-    SolixGridStatus,
-    SolixNetworkStatus,
-    SolixOcppConnectionStatus,
     SolixParmType,
     SolixPriceTypes,
-    SolixRoleStatus,
-    SolixTariffTypes,
 )
+from .device import DEVICE_KEY_HANDLERS, get_model_facts
 from .helpers import get_enum_name, get_solix_product_code
 from .hesapi import AnkerSolixHesApi
-from .mqttcmdmap import COMMAND_LIST, COMMAND_NAME, SolixMqttCommands
-from .mqttmap import SOLIXMQTTMAP
 from .poller import (
     poll_device_details,
     poll_device_energy,
@@ -72,6 +54,7 @@ class AnkerSolixApi(AnkerSolixBaseApi):
     from .energy import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
         device_pv_energy_daily,
         energy_analysis,
+        energy_analysis_plan,
         energy_daily,
         get_device_charge_order_stats,
         get_device_pv_statistics,
@@ -136,6 +119,7 @@ class AnkerSolixApi(AnkerSolixBaseApi):
         """Update the internal device details dictionary with the given data. The device_sn key must be set in the data dict for the update to be applied.
 
         This method is used to consolidate various device related key values from various requests under a common set of device keys.
+        The key specific consolidation is dispatched to the handlers registered in DEVICE_KEY_HANDLERS.
         """
         if sn := devData.pop("device_sn", None):
             device: dict = self.devices.get(sn) or {}  # lookup old device info if any
@@ -157,1005 +141,12 @@ class AnkerSolixApi(AnkerSolixBaseApi):
                     device["owner_user_id"] = value
             calc_capacity = False  # Flag whether capacity may need recalculation
             for key, value in devData.items():
+                # dispatch only keys with registered handler
+                if not (handler := DEVICE_KEY_HANDLERS.get(key)):
+                    continue
                 try:
-                    if key in ["product_code", "device_pn"] and value:
-                        device["device_pn"] = str(value)
-                        # Get device code features once
-                        if "device_code_features" not in device:
-                            device["device_code_features"] = (
-                                self.account.get("products", {})
-                                .get(str(value), {})
-                                .get("product_codes", {})
-                                .get(device.get("device_code", ""), {})
-                                .get("custom_fields", {})
-                            )
-                        # Flag device for supported mqtt trigger if admin and device not passive
-                        if (
-                            device.get("is_admin") or device.get("owner_user_id")
-                        ) and not (
-                            device.get("is_passive") or devData.get("is_passive")
-                        ):
-                            device["mqtt_supported"] = True
-                            # update customizable setting whether MQTT values should overlay Api values upon cache merge
-                            device["mqtt_overlay"] = bool(
-                                device.get("mqtt_overlay") or False
-                            )
-                            # check once if device supports status requests from description
-                            if "mqtt_status_request" not in device:
-                                device["mqtt_status_request"] = bool(
-                                    [
-                                        cmd
-                                        for cmd in SOLIXMQTTMAP.get(
-                                            str(value), {}
-                                        ).values()
-                                        if SolixMqttCommands.status_request
-                                        in [
-                                            cmd.get(COMMAND_NAME),
-                                            *cmd.get(COMMAND_LIST, []),
-                                        ]
-                                    ]
-                                )
-                        # check if capacity should be calculated
-                        if not device.get("battery_capacity") and hasattr(
-                            SolixDeviceCapacity, str(value)
-                        ):
-                            calc_capacity = True
-                        # try to get type for standalone device from category definitions if not defined yet
-                        if (
-                            hasattr(SolixDeviceCategory, str(value))
-                            and "type" not in device
-                        ):
-                            dev_type = str(
-                                getattr(SolixDeviceCategory, str(value))
-                            ).split("_")
-                            if dev_type[-1].isdigit():
-                                gen = int(dev_type.pop(-1))
-                            else:
-                                gen = None
-                            device["type"] = "_".join(dev_type)
-                            # update generation if specified in device type definitions
-                            if gen:
-                                device["generation"] = gen
-                    elif key == "device_name" and value:
-                        device["name"] = str(value)
-                    elif key == "alias_name" and value:
-                        device["alias"] = str(value)
-                        # preset default device name if only alias provided, fallback to alias if product name not listed
-                        if (
-                            pn := device.get("device_pn")
-                            or devData.get("device_pn")
-                            or None
-                        ) and (not device.get("name") or devData.get("device_name")):
-                            device["name"] = (
-                                devData.get("device_name")
-                                or (
-                                    (self.account.get("products") or {}).get(pn) or {}
-                                ).get("name")
-                                or getattr(SolixDeviceNames, pn, "")
-                                or str(value)
-                            )
-                    elif key == "device_sw_version" and value:
-                        device["sw_version"] = str(value).lstrip("v")
-                    elif key == "preset_inverter_limit" and str(value):
-                        device.update(
-                            {
-                                "preset_inverter_limit": str(value)
-                                .lower()
-                                .replace("w", "")
-                            }
-                        )
-                    elif key in [
-                        # keys to be updated independent of value
-                        "relate_type",
-                        "intgr_device",
-                        "feature_switch",
-                        "pv_name",
-                        "pv_power",
-                        "group_info",
-                        "power_limit_option",
-                        "power_limit_option_real",
-                        "all_power_limit_option",
-                        "station_sn",
-                        "total_stats",
-                        "energy_details",
-                    ]:
-                        if key == "power_limit_option":
-                            if key in getattr(
-                                SolarbankDeviceMetrics,
-                                device.get("device_pn") or "",
-                                {},
-                            ):
-                                # mark power limit option as Auto if empty like in app
-                                device[key] = value or ["Auto"]
-                        elif key == "feature_switch":
-                            # keep existing features, just update with new features provided
-                            device[key] = (device.get(key) or {}) | (value or {})
-                        else:
-                            device[key] = value
-                    elif (
-                        key
-                        in [
-                            # keys with boolean values that should only be updated if value returned
-                            "wifi_online",
-                            "is_support_wired",
-                            "wired_connected",
-                            "data_valid",
-                            "charge",
-                            "auto_upgrade",
-                            "is_ota_update",
-                            "cascaded",
-                            "is_passive",
-                            "allow_grid_export",
-                        ]
-                        and value is not None
-                    ):
-                        device[key] = bool(value)
-                    elif key in [
-                        # keys with string values
-                        "wireless_type",
-                        "charging_power",
-                        "output_power",
-                        "power_unit",
-                        "bws_surplus",
-                        "current_power",
-                        "tag",
-                        "platform_tag",
-                        "ota_version",
-                        "bat_charge_power",
-                        "bat_discharge_power",
-                        "all_ac_input_limit",
-                        "all_power_limit",
-                    ] or (
-                        key
-                        in [
-                            # keys with string values that should only be updated if value returned
-                            "wifi_name",
-                            "bt_ble_mac",
-                            "wifi_mac",
-                            "energy_today",
-                            "energy_last_period",
-                            "time_zone",
-                            "grid_export_limit",
-                            "owner_user_id",
-                            "img_url",
-                        ]
-                        and value
-                    ):
-                        device[key] = str(value)
-                    elif key == "mqtt_overlay" and value is not None:
-                        # keys that are customized
-                        custom = (device.get("customized") or {}).get(key)
-                        device[key] = custom if custom is not None else value
-                    elif key == "bt_ble_id" and value and not devData.get("bt_ble_mac"):
-                        # Make sure that BT ID is added if mac not in data
-                        device["bt_ble_mac"] = str(value).replace(":", "")
-                    elif key == "wifi_signal":
-                        # Make sure that key is added, but update only if new value provided to avoid deletion of value from rssi calculation
-                        if value or device.get(key) is None:
-                            device[key] = str(value)
-                    elif key == "rssi":
-                        # This is actually not a relative rssi value (0-255), but a negative value and seems to be the absolute dBm of the signal strength
-                        device[key] = str(value)
-                        # calculate the wifi_signal percentage if that is not provided for the device while rssi is available
-                        with contextlib.suppress(ValueError):
-                            if float(value) and not devData.get("wifi_signal"):
-                                # the percentage will be calculated in the range between -50 dBm (very good) and -85 dBm (no connection) as following.
-                                dbmmax = -50
-                                dbmmin = -85
-                                device.update(
-                                    {
-                                        "wifi_signal": str(
-                                            round(
-                                                max(
-                                                    0,
-                                                    min(
-                                                        100,
-                                                        (float(value) - dbmmin)
-                                                        * 100
-                                                        / (dbmmax - dbmmin),
-                                                    ),
-                                                )
-                                            )
-                                        )
-                                    }
-                                )
-                    elif key == "battery_power" and value:
-                        # This is a percentage value for the battery state of charge, not power
-                        calc_capacity |= device.get("battery_soc") != str(value)
-                        device["battery_soc"] = str(value)
-                    elif key == "photovoltaic_power":
-                        device["input_power"] = str(value)
-                    elif (
-                        # Add solarbank string metrics depending on device type or generation
-                        key
-                        in [
-                            "solar_power_1",
-                            "solar_power_2",
-                            "solar_power_3",
-                            "solar_power_4",
-                            "ac_power",
-                            "to_home_load",
-                            "other_input_power",
-                            "micro_inverter_power",
-                            "micro_inverter_power_limit",
-                            "micro_inverter_low_power_limit",
-                            "grid_to_battery_power",
-                            "pei_heating_power",
-                        ]
-                    ):
-                        if (
-                            value != ""
-                            and value is not None
-                            and key
-                            in getattr(
-                                SolarbankDeviceMetrics,
-                                device.get("device_pn") or "",
-                                {},
-                            )
-                        ):
-                            device[key] = str(value)
-                    elif (
-                        # Add solarbank int metrics depending on device type or generation
-                        key
-                        in [
-                            "power_limit",
-                            "pv_power_limit",
-                            "ac_input_limit",
-                        ]
-                    ):
-                        if str(value).isdigit() and key in getattr(
-                            SolarbankDeviceMetrics, device.get("device_pn") or "", {}
-                        ):
-                            device[key] = int(value)
-                    elif (
-                        # Add solarbank int metrics depending on device type or generation and features
-                        key
-                        in [
-                            "charge_upper_limit",
-                            "discharge_lower_limit",
-                            "backup_reserve",
-                            "backup_reserve_switch",
-                        ]
-                    ):
-                        if (
-                            value is not None
-                            and key
-                            in getattr(
-                                SolarbankDeviceMetrics,
-                                device.get("device_pn") or "",
-                                {},
-                            )
-                            and (
-                                (device.get("feature_switch") or {})
-                                | (devData.get("feature_switch") or {})
-                            ).get("soc_enable")
-                        ):
-                            if key == "backup_reserve_switch":
-                                device[key] = bool(value)
-                            else:
-                                device[key] = str(value)
-                    elif key == "sub_package_num" and str(value).isdigit():
-                        if key in getattr(
-                            SolarbankDeviceMetrics, device.get("device_pn") or "", {}
-                        ):
-                            calc_capacity |= device.get(key) != int(value)
-                            device[key] = int(value)
-                    elif key == "battery_capacity" and str(value).isdigit():
-                        # This key is only used as trigger for customization to recalculate modified capacity dependent values
-                        device[key] = value
+                    if handler(self, device, key, value, devData):
                         calc_capacity = True
-                    # solarbank info shows the load preset per device, which is identical to device parallel_home_load for 2 solarbanks, or current homeload for single solarbank
-                    elif key in ["set_load_power", "parallel_home_load"] and value:
-                        # Value may include unit, remove unit to have content consistent
-                        device["set_output_power"] = str(value).replace("W", "")
-                    # The current_home_load from get_device_load always shows the system wide settings made via the schedule
-                    # get_device_load cannot be used for SB2 schedules, but site refresh will pass this as workaround.
-                    elif key == "current_home_load" and value:
-                        # Value may include unit, remove unit to have content consistent
-                        home_load = str(value).replace("W", "")
-                        device["set_system_output_power"] = home_load
-                        # Value for device set home load may be empty for single solarbank, use this setting also for device preset in this case
-                        if not device.get("set_output_power"):
-                            device.update(
-                                {
-                                    "set_output_power": str(
-                                        round(
-                                            int(home_load)
-                                            / devData.get("solarbank_count", 1)
-                                        )
-                                    )
-                                    if home_load.isdigit()
-                                    else home_load
-                                }
-                            )
-                    elif key == "status":
-                        # decode the device status into a description
-                        device.update(
-                            {
-                                key: str(value),
-                                "status_desc": get_enum_name(
-                                    SolixDeviceStatus,
-                                    str(value),
-                                    SolixDeviceStatus.unknown.name,
-                                ),
-                            }
-                        )
-                    elif (
-                        key == "charging_status"
-                        and device.get("type") == SolixDeviceType.SOLARBANK_PPS.value
-                    ):
-                        # handle Solarbank PPS charging status
-                        device[key] = str(value)
-                        # TODO: Use proper status definitions once all state descriptions are known
-                        description = get_enum_name(
-                            SolarbankPpsStatus,
-                            str(value),
-                            SolarbankPpsStatus.unknown.name,
-                        )
-                        device["charging_status_desc"] = description
-                    elif key == "charging_status":
-                        device[key] = str(value)
-                        # decode the charging status into a description
-                        description = get_enum_name(
-                            SolarbankStatus, str(value), SolarbankStatus.unknown.name
-                        )
-                        # check if battery has bypass during charge (if output during charge)
-                        # This key can be passed separately, make sure the other values are looked up in provided data first, then in device details
-                        # NOTE: charging power may be updated after initial device details update
-                        # NOTE: SB1: If status is 3=charging and larger than preset but nothing goes out, the charge priority is active (e.g. 0 Watt switch)
-                        # NOTE: SB2: Preset must be replaced by house demand for SB2 when running auto usage mode
-                        preset = devData.get("set_load_power") or device.get(
-                            "set_output_power"
-                        )
-                        out = devData.get("output_power") or device.get("output_power")
-                        solar = devData.get("photovoltaic_power") or device.get(
-                            "input_power"
-                        )
-                        generation = int(device.get("generation", 0))
-                        charge = devData.get("charging_power") or device.get(
-                            "charging_power"
-                        )
-                        homeload = devData.get("to_home_load") or device.get(
-                            "to_home_load"
-                        )
-                        demand = devData.get("home_load_power") or 0
-                        ac_input = (
-                            devData.get("grid_to_battery_power")
-                            or device.get("grid_to_battery_power")
-                            or 0
-                        )
-                        soc = (
-                            devData.get("battery_power")
-                            or device.get("battery_soc")
-                            or 0
-                        )
-                        # use house demand for preset if in auto mode
-                        if generation >= 2 and (
-                            (
-                                device.get("preset_usage_mode")
-                                or devData.get("scene_mode")
-                                or SolixDefaults.USAGE_MODE
-                            )
-                            in [
-                                SolarbankUsageMode.smartmeter.value,
-                                SolarbankUsageMode.smartplugs.value,
-                                SolarbankUsageMode.use_time.value,
-                                SolarbankUsageMode.time_slot.value,
-                                SolarbankUsageMode.smart.value,
-                            ]
-                        ):
-                            preset = demand
-                        if (
-                            description == SolarbankStatus.charge.name
-                            and preset is not None
-                            and out is not None
-                            and solar is not None
-                        ):
-                            with contextlib.suppress(ValueError):
-                                if (
-                                    int(out) == 0
-                                    and int(solar) > int(preset)
-                                    and int(charge) > 0
-                                    # and generation < 2
-                                ):
-                                    # Charge and 0 W output while solar larger than preset must be active charge priority
-                                    description = SolarbankStatus.charge_priority.name
-                                elif int(out) > 0:
-                                    # Charge with output must be bypass charging
-                                    description = SolarbankStatus.charge_bypass.name
-                        elif (
-                            description == SolarbankStatus.detection.name
-                            and generation >= 2
-                            and charge is not None
-                            and homeload is not None
-                            and preset is not None
-                        ):
-                            # Solarbank models with hybrid inverter no longer use charge status, translate detection into proper description
-                            with contextlib.suppress(ValueError):
-                                if int(charge) > 0:
-                                    # charge modes
-                                    description = (
-                                        SolarbankStatus.charge_bypass.name
-                                        if int(out) > 0
-                                        else SolarbankStatus.charge_ac.name
-                                        if int(ac_input) > 0 or int(solar) == 0
-                                        # Charge > 0 and home load < demand must be enforced charging (if home load value reliable)
-                                        else SolarbankStatus.protection_charge.name
-                                        if int(homeload) < int(preset)
-                                        else SolarbankStatus.charge.name
-                                    )
-                                elif int(charge) < 0:
-                                    # discharge modes
-                                    description = (
-                                        SolarbankStatus.bypass_discharge.name
-                                        if int(solar) > 0
-                                        else SolarbankStatus.discharge.name
-                                    )
-                                elif int(soc) == 100:
-                                    # other modes
-                                    description = SolarbankStatus.fully_charged.name
-                                elif int(solar) > 0:
-                                    description = SolarbankStatus.bypass.name
-                        elif (
-                            description == SolarbankStatus.bypass.name
-                            and generation >= 2
-                            and charge is not None
-                        ):
-                            with contextlib.suppress(ValueError):
-                                # New SB2 Mode for Bypass and discharge
-                                if int(charge) < 0:
-                                    description = SolarbankStatus.bypass_discharge.name
-
-                        device["charging_status_desc"] = description
-                    elif (
-                        # items with int value
-                        key
-                        in [
-                            "power_cutoff",
-                            "output_cutoff_data",
-                        ]
-                        and str(value).isdigit()
-                    ):
-                        device[key] = int(value)
-                    elif key in ["power_cutoff_data", "ota_children"] and value:
-                        # list items with value
-                        device[key] = list(value)
-                    elif key == "fittings":
-                        # update nested dictionary
-                        if key in device:
-                            device[key].update(dict(value))
-                        else:
-                            device[key] = dict(value)
-                    elif key == "solar_info" and isinstance(value, dict):
-                        # remove unnecessary keys from solar_info
-                        keylist = value.keys()
-                        for extra in [
-                            x
-                            for x in ("brand_id", "model_img", "version", "ota_status")
-                            if x in keylist
-                        ]:
-                            value.pop(extra, None)
-                        device[key] = value
-                    elif key == "solarbank_count" and value:
-                        device[key] = value
-                    # schedule is currently a site wide setting. However, we save this with device details to retain info across site updates
-                    # When individual device schedules are supported in future, this info is needed per device anyway
-                    elif key == "schedule" and isinstance(value, dict):
-                        device[key] = dict(value)
-                        # set default presets for no active schedule slot
-                        if device.get("type") == SolixDeviceType.COMBINER_BOX.value:
-                            # assume generation and ac type for tracking schedule data in combiner box
-                            generation = 3
-                            ac_type = True
-                        else:
-                            generation = int(device.get("generation", 0))
-                            ac_type = bool(device.get("grid_to_battery_power") or False)
-                        # flag if rate plan charge type supported
-                        charge_enabled = bool(
-                            (device.get("feature_switch") or {}).get(
-                                "custom_rate_charge_enable"
-                            )
-                        )
-                        # Count solarbanks for device output presets (only used for SB1)
-                        cnt = device.get("solarbank_count", 0)
-                        mysite = self.sites.get(device.get("site_id") or "") or {}
-                        if generation >= 2:
-                            # Solarbank 2+ schedule
-                            mode_type = (
-                                value.get("mode_type") or SolixDefaults.USAGE_MODE
-                            )
-                            # define default presets, will be updated if active slot found for mode
-                            device.update(
-                                {
-                                    "preset_usage_mode": mode_type,
-                                    "preset_system_output_power": value.get(
-                                        "default_home_load"
-                                    )
-                                    or SolixDefaults.PRESET_NOSCHEDULE
-                                    if mode_type == SolarbankUsageMode.manual.value
-                                    else 0
-                                    if mode_type == SolarbankUsageMode.smartplugs.value
-                                    else None,
-                                }
-                            )
-                            if charge_enabled:
-                                # SB3+ unique settings
-                                device["preset_load_type"] = SolixDefaults.PRESET_TYPE
-                            if ac_type:
-                                # update default with site currency if found
-                                if not (
-                                    curr_def := (mysite.get("site_details") or {}).get(
-                                        "site_price_unit"
-                                    )
-                                    or ""
-                                ):
-                                    curr_def = SolixDefaults.CURRENCY_DEF
-                                device.update(
-                                    {
-                                        "preset_manual_backup_start": 0,
-                                        "preset_manual_backup_end": 0,
-                                        "preset_backup_option": False,
-                                        "preset_tariff": SolixTariffTypes.UNKNOWN.value,
-                                        "preset_tariff_price": SolixDefaults.TARIFF_PRICE_DEF,
-                                        "preset_tariff_currency": curr_def,
-                                    }
-                                )
-                        else:
-                            # Solarbank 1 schedule
-                            # define default presets, will be updated if active slot found
-                            device.update(
-                                {
-                                    "preset_system_output_power": SolixDefaults.PRESET_NOSCHEDULE,
-                                    "preset_allow_export": SolixDefaults.ALLOW_EXPORT,
-                                    "preset_discharge_priority": SolixDefaults.DISCHARGE_PRIORITY_DEF,
-                                    "preset_charge_priority": SolixDefaults.CHARGE_PRIORITY_DEF,
-                                }
-                            )
-                            if cnt > 1:
-                                device.update(
-                                    {
-                                        "preset_power_mode": SolixDefaults.POWER_MODE,
-                                        "preset_device_output_power": int(
-                                            SolixDefaults.PRESET_NOSCHEDULE / cnt
-                                        ),
-                                    }
-                                )
-                        # get actual presets from current slot
-                        # Consider time zone shifts
-                        tz_offset = (
-                            self.sites.get(device.get("site_id") or "") or {}
-                        ).get("energy_offset_tz") or 0
-                        now = datetime.now() + timedelta(seconds=tz_offset)
-                        now_time = now.time().replace(microsecond=0)
-                        sys_power = None
-                        dev_power = None
-                        # set now to new daytime if close to end of day
-                        if now_time >= datetime.strptime("23:59:58", "%H:%M:%S").time():
-                            now_time = datetime.strptime("00:00", "%H:%M").time()
-                        if generation >= 2:
-                            # Solarbank 2+ schedule, weekday starts with 0=Sunday)
-                            # datetime isoweekday starts with 1=Monday - 7 = Sunday, strftime('%w') starts also 0 = Sunday
-                            weekday = int(now.strftime("%w"))
-                            month = now.month
-                            # get rate_plan_name depending on use usage mode_type
-                            rate_plan_name = getattr(
-                                SolarbankRatePlan,
-                                get_enum_name(
-                                    SolarbankUsageMode,
-                                    mode_type,
-                                    default=SolarbankUsageMode.manual.name,
-                                ),
-                                SolarbankRatePlan.manual,
-                            )
-                            day_ranges = next(
-                                iter(
-                                    [
-                                        day.get("ranges") or []
-                                        for day in (value.get(rate_plan_name) or [{}])
-                                        if weekday in (day.get("week") or [])
-                                    ]
-                                ),
-                                [],
-                            )
-                            for slot in day_ranges:
-                                with contextlib.suppress(ValueError):
-                                    start_time = datetime.strptime(
-                                        slot.get("start_time") or "00:00", "%H:%M"
-                                    ).time()
-                                    end_time = slot.get("end_time") or "00:00"
-                                    # "24:00" format not supported in strptime
-                                    if end_time == "24:00":
-                                        end_time = datetime.strptime(
-                                            "23:59:59", "%H:%M:%S"
-                                        ).time()
-                                    else:
-                                        end_time = datetime.strptime(
-                                            end_time, "%H:%M"
-                                        ).time()
-                                    if start_time <= now_time < end_time:
-                                        sys_power = slot.get("power")
-                                        device["preset_system_output_power"] = sys_power
-                                        if charge_enabled:
-                                            # SB3+ unique settings
-                                            device["preset_load_type"] = (
-                                                slot.get("charging_type")
-                                                or SolixDefaults.PRESET_TYPE
-                                            )
-                                        break
-                            if ac_type and (
-                                backup := value.get(SolarbankRatePlan.backup) or {}
-                            ):
-                                # check whether now in active backup interval to update usage mode info because active backup mode is not reflected in schedule object
-                                start = (backup.get("ranges") or [{}])[0].get(
-                                    "start_time"
-                                ) or 0
-                                end = (backup.get("ranges") or [{}])[0].get(
-                                    "end_time"
-                                ) or 0
-                                switch = backup.get("switch") or False
-                                # update valid backup list item data
-                                device.update(
-                                    {
-                                        "preset_usage_mode": SolarbankUsageMode.backup
-                                        if switch and start < now.timestamp() < end
-                                        else mode_type,
-                                        "preset_manual_backup_start": start,
-                                        "preset_manual_backup_end": end,
-                                        "preset_backup_option": switch,
-                                    }
-                                )
-                            if ac_type and (
-                                use_time := value.get(SolarbankRatePlan.use_time) or {}
-                            ):
-                                for season in [
-                                    sea
-                                    for sea in use_time
-                                    if ((sea.get("sea") or {}).get("start_month") or 1)
-                                    <= month
-                                    <= ((sea.get("sea") or {}).get("end_month") or 12)
-                                ]:
-                                    if weekday in range(1, 6) or season.get("is_same"):
-                                        dayplan = season.get("weekday") or []
-                                        prices = season.get("weekday_price") or []
-                                    else:
-                                        dayplan = season.get("weekend") or []
-                                        prices = season.get("weekend_price") or []
-                                    tariff = next(
-                                        iter(
-                                            [
-                                                slot
-                                                for slot in dayplan
-                                                if (slot.get("start_time") or 0)
-                                                <= now_time.hour
-                                                < (slot.get("end_time") or 24)
-                                            ]
-                                        ),
-                                        {},
-                                    ).get("type")
-                                    price = next(
-                                        iter(
-                                            [
-                                                slot
-                                                for slot in prices
-                                                if slot.get("type") == tariff
-                                            ]
-                                        ),
-                                        {},
-                                    ).get("price")
-                                    device.update(
-                                        {
-                                            "preset_tariff": tariff
-                                            or SolixTariffTypes.UNKNOWN.value,
-                                            "preset_tariff_price": price
-                                            or SolixDefaults.TARIFF_PRICE_DEF,
-                                            "preset_tariff_currency": season.get("unit")
-                                            or curr_def,
-                                        }
-                                    )
-
-                            # adjust schedule preset for eventual reuse as active presets
-                            # Active Preset must only be considered if usage mode is manual
-                            sys_power = (
-                                str(device.get("preset_system_output_power") or "")
-                                if (mode_type or 0) == SolarbankUsageMode.manual.value
-                                else None
-                            )
-                            dev_power = sys_power
-                        else:
-                            # Solarbank 1 schedule
-                            for slot in value.get("ranges") or []:
-                                with contextlib.suppress(ValueError):
-                                    start_time = datetime.strptime(
-                                        slot.get("start_time") or "00:00", "%H:%M"
-                                    ).time()
-                                    end_time = slot.get("end_time") or "00:00"
-                                    # "24:00" format not supported in strptime
-                                    if end_time == "24:00":
-                                        end_time = datetime.strptime(
-                                            "23:59:59", "%H:%M:%S"
-                                        ).time()
-                                    else:
-                                        end_time = datetime.strptime(
-                                            end_time, "%H:%M"
-                                        ).time()
-                                    if start_time <= now_time < end_time:
-                                        preset_power = (
-                                            slot.get("appliance_loads") or [{}]
-                                        )[0].get("power")
-                                        export = slot.get("turn_on")
-                                        prio = slot.get("charge_priority")
-                                        if bool(
-                                            value.get("is_show_priority_discharge")
-                                        ):
-                                            discharge_prio = slot.get(
-                                                "priority_discharge_switch"
-                                            )
-                                        else:
-                                            discharge_prio = None
-                                        # For enforced SB1 schedule by SB2, the export switch setting is None and all other will be set to None either
-                                        device.update(
-                                            {
-                                                "preset_system_output_power": None
-                                                if export is None
-                                                else preset_power,
-                                                "preset_allow_export": None
-                                                if export is None
-                                                else export,
-                                                "preset_discharge_priority": None
-                                                if export is None
-                                                else discharge_prio,
-                                                "preset_charge_priority": None
-                                                if export is None
-                                                else prio,
-                                            }
-                                        )
-                                        # add presets for dual solarbank setups, default to None if schedule does not support new keys yet
-                                        power_mode = slot.get("power_setting_mode")
-                                        dev_presets = slot.get(
-                                            "device_power_loads"
-                                        ) or [{}]
-                                        dev_power = next(
-                                            iter(
-                                                [
-                                                    d.get("power")
-                                                    for d in dev_presets
-                                                    if d.get("device_sn") == sn
-                                                ]
-                                            ),
-                                            None,
-                                        )
-                                        if cnt > 1:
-                                            # adjust device power value for default share which is always using 50%, also for single solarbank setups
-                                            # For enforced SB1 schedule by SB2, the export switch setting is None and all other will be set to None either
-                                            device.update(
-                                                {
-                                                    "preset_power_mode": None
-                                                    if export is None
-                                                    else power_mode,
-                                                    "preset_device_output_power": None
-                                                    if export is None
-                                                    else dev_power,
-                                                }
-                                            )
-                                        break
-                            # adjust schedule presets for eventual reuse as active presets
-                            # Charge priority and SOC must only be considered if MI80 inverter is configured for SB1
-                            prio = (
-                                (device.get("preset_charge_priority") or 0)
-                                if (
-                                    (device.get("solar_info") or {}).get("solar_model")
-                                    or ""
-                                )
-                                == "A5143"
-                                else 0
-                            )
-                            if device.get("preset_allow_export") and int(prio) <= int(
-                                device.get("battery_soc") or "0"
-                            ):
-                                sys_power = str(
-                                    device.get("preset_system_output_power") or ""
-                                )
-                                # active device power depends on SB count
-                                dev_power = (
-                                    device.get("preset_device_output_power") or None
-                                )
-                                dev_power = str(
-                                    dev_power
-                                    if dev_power is not None and cnt > 1
-                                    else sys_power
-                                )
-                            else:
-                                sys_power = "0"
-                                dev_power = "0"
-                        # update appliance load in site cache upon device details or schedule updates not triggered by sites update
-                        if not devData.get("retain_load") and mysite and sys_power:
-                            mysite["retain_load"] = sys_power
-                            # update also device fields for output power if not provided along with schedule update
-                            if not devData.get("current_home_load") and sys_power:
-                                device["set_system_output_power"] = sys_power
-                                if not devData.get("parallel_home_load") and dev_power:
-                                    device["set_output_power"] = dev_power
-
-                    # inverter specific keys
-                    elif key == "generate_power":
-                        device[key] = str(value)
-
-                    # Power Panel specific keys
-                    elif key == "average_power" and isinstance(value, dict):
-                        device[key] = value
-
-                    # smartmeter specific keys
-                    elif key == "grid_status":
-                        # decode the grid status into a description
-                        device.update(
-                            {
-                                key: str(value),
-                                "grid_status_desc": get_enum_name(
-                                    SmartmeterStatus,
-                                    str(value),
-                                    SmartmeterStatus.unknown.name,
-                                ),
-                            }
-                        )
-                    elif (
-                        key
-                        in [
-                            "photovoltaic_to_grid_power",
-                            "grid_to_home_power",
-                        ]
-                        and value
-                    ):
-                        device[key] = str(value)
-
-                    # smartplug specific keys
-                    elif key in ["err_code", "priority", "auto_switch", "running_time"]:
-                        device[key] = value
-
-                    # power dock specific keys
-                    elif key == "dock_status":
-                        # decode the dock status into a description
-                        device.update(
-                            {
-                                key: str(value),
-                                "dock_status_desc": next(
-                                    iter(
-                                        [
-                                            item.name
-                                            for item in PowerdockStatus
-                                            if item.value == str(value)
-                                        ]
-                                    ),
-                                    PowerdockStatus.unknown.name,
-                                ),
-                            }
-                        )
-
-                    # Solarbank PPS specific keys, map them to solarbank keys where applicable
-                    elif key == "pv_high_power":
-                        device["solar_power_1"] = str(value)
-                    elif key == "pv_low_power":
-                        device["solar_power_2"] = str(value)
-                    elif key == "pv_high_name":
-                        device["pv_name"] = (device.get("pv_name") or {}) | {
-                            "pv1_name": str(value)
-                        }
-                    elif key == "pv_low_name":
-                        device["pv_name"] = (device.get("pv_name") or {}) | {
-                            "pv2_name": str(value)
-                        }
-                    elif key in [
-                        "phase",
-                        "main_ct_number",
-                        "branch_ct_number",
-                        "main_branch_check_status",
-                        "sub_pack_temp_alarm",
-                        "protection_status",
-                        "charge_protect_threshold",
-                        "discharge_protect_threshold",
-                    ]:
-                        device[key] = value
-
-                    # hes specific keys
-                    elif key == "hes_data" and isinstance(value, dict):
-                        # decode the status into a description
-                        if "online_status" in value:
-                            code = str(value.get("online_status"))
-                            # use same field name as for balcony power devices
-                            value["status_desc"] = next(
-                                iter(
-                                    [
-                                        item.name
-                                        for item in SolixDeviceStatus
-                                        if item.value == code
-                                    ]
-                                ),
-                                SolixDeviceStatus.unknown.name,
-                            )
-                        if "master_slave_status" in value:
-                            code = str(value.get("master_slave_status"))
-                            value["role_status_desc"] = next(
-                                iter(
-                                    [
-                                        item.name
-                                        for item in SolixRoleStatus
-                                        if item.value == code
-                                    ]
-                                ),
-                                SolixRoleStatus.unknown.name,
-                            )
-                        if "grid_status" in value:
-                            code = str(value.get("grid_status"))
-                            value["grid_status_desc"] = next(
-                                iter(
-                                    [
-                                        item.name
-                                        for item in SolixGridStatus
-                                        if item.value == code
-                                    ]
-                                ),
-                                SolixGridStatus.unknown.name,
-                            )
-                        if "network_status" in value:
-                            code = str(value.get("network_status"))
-                            value["network_status_desc"] = next(
-                                iter(
-                                    [
-                                        item.name
-                                        for item in SolixNetworkStatus
-                                        if item.value == code
-                                    ]
-                                ),
-                                SolixNetworkStatus.unknown.name,
-                            )
-                        device[key] = value
-
-                    # EV charger specific keys
-                    elif key == "ev_charger_status":
-                        device[key] = value
-                    elif (
-                        key == "ocpp_connect_status"
-                        and device.get("type") == SolixDeviceType.EV_CHARGER.value
-                    ):
-                        if key == "ocpp_connect_status":
-                            # decode the status into a description, assuming same code translation as for device connection status
-                            device.update(
-                                {
-                                    key: value,
-                                    "ocpp_status_desc": get_enum_name(
-                                        SolixOcppConnectionStatus,
-                                        str(value),
-                                        SolixOcppConnectionStatus.unknown.name,
-                                    ),
-                                }
-                            )
-
-                    # Mini charger specific keys
-                    elif key in [
-                        "protocol_status",
-                        "port_remarks",
-                        "device_setting",
-                        "custom_modes",
-                        "screensaver",
-                        "modes",
-                    ]:
-                        device[key] = value
-                        # update selected theme if custom theme
-                        if (
-                            key == "screensaver"
-                            and (
-                                theme_id := device.get("mqtt_data", {}).get("theme_id")
-                            )
-                            and (theme := (value or {}).get(str(theme_id), {}))
-                        ):
-                            device["display_theme"] = theme
-                    elif key == "theme_id" and value is not None:
-                        # update only if cached value different
-                        if str(value) != str(
-                            device.get("display_theme", {}).get("id", "")
-                        ):
-                            device["display_theme"] = self.get_charger_themes(
-                                deviceSn=sn
-                            ).get(str(value), {})
                 except Exception as err:  # pylint: disable=broad-exception-caught  # noqa: BLE001
                     self._logger.error(
                         "Api %s error %s occurred when updating device details for key '%s' with value %s: %s",
@@ -1176,8 +167,9 @@ class AnkerSolixApi(AnkerSolixBaseApi):
                     cap_change = False
                     # calculate size only once based on PN
                     if not (size := device.get("battery_size")):
-                        size = getattr(
-                            SolixDeviceCapacity, str(device.get("device_pn")), 0
+                        size = (
+                            get_model_facts(str(device.get("device_pn")))["capacity"]
+                            or 0
                         )
                         device["battery_size"] = size
                         cap_change = True
@@ -12,6 +12,7 @@ from typing import Any
 from aiohttp import ClientError, ClientSession
 
 from .apitypes import (
+    API_ENDPOINT_CACHE_KEYS,
     API_ENDPOINTS,
     API_FILEPREFIXES,
     API_HES_SVC_ENDPOINTS,
@@ -23,7 +24,14 @@ from .apitypes import (
     SolixPriceProvider,
     SolixPriceTypes,
 )
-from .helpers import get_enum_name, get_solix_product_code
+from .energystore import AnkerSolixEnergyStore
+from .helpers import (
+    ConsumerRegistry,
+    DerivedDataCache,
+    get_enum_name,
+    get_solix_product_code,
+)
+from .intraday import AnkerSolixIntradayCache
 from .mqtt import AnkerSolixMqttSession, MessageCallback
 from .mqttcmdmap import EMBEDDED
 from .session import AnkerSolixClientSession
@@ -73,6 +81,20 @@ class AnkerSolixBaseApi:
         self.sites: dict[str, dict] = {}
         self.devices: dict[str, dict] = {}
         self._device_callbacks: dict[str, dict] = {}
+        # optional local store for daily energy history
+        self.energyStore: AnkerSolixEnergyStore | None = None
+        # cache for intraday energy statistics series of sites
+        self.intradayCache: AnkerSolixIntradayCache = AnkerSolixIntradayCache(
+            logger=self._logger
+        )
+        # response fingerprints already processed into the cache per category and key
+        self._processed: dict[str, dict[str, str]] = {}
+        # cache of price and forecast data derived from other cache data per site
+        self.derived: DerivedDataCache = DerivedDataCache()
+        # registry of cache key consumers to skip optional endpoints without consumers
+        self.consumers: ConsumerRegistry = ConsumerRegistry(
+            endpoint_keys=API_ENDPOINT_CACHE_KEYS
+        )
 
     def testDir(self, subfolder: str | None = None) -> str:
         """Get or set the subfolder for local API test files in the api session."""
@@ -82,6 +104,24 @@ class AnkerSolixBaseApi:
         """Get or set the api request limit per endpoint per minute."""
         return self.apisession.endpointLimit(limit)
 
+    def requestFreshness(self, seconds: float | None = None) -> float:
+        """Get or set the window in seconds to reuse a completed read response for identical reads."""
+        return self.apisession.requestFreshness(seconds)
+
+    def _payload_unchanged(
+        self, category: str, key: str, endpoint: str, json: dict | None = None
+    ) -> bool:
+        """Check whether the last response for the endpoint and body was already processed for the category key and remember it otherwise."""
+        fingerprint = self.apisession.fingerprint(endpoint, json)
+        processed = self._processed.setdefault(category, {})
+        if fingerprint and processed.get(key) == fingerprint:
+            return True
+        if fingerprint:
+            processed[key] = fingerprint
+        else:
+            processed.pop(key, None)
+        return False
+
     def logger(self, logger: logging.Logger | None = None) -> logging.Logger:
         """Get or set the logger for API client."""
         if logger:
@@ -125,6 +165,9 @@ class AnkerSolixBaseApi:
         self.sites = {}
         self.devices = {}
         self.account = {}
+        self._processed = {}
+        self.derived = DerivedDataCache()
+        self.intradayCache.clear()
         # check active MQTT session and stop it
         if self.mqttsession:
             self.stopMqttSession()
@@ -142,6 +185,8 @@ class AnkerSolixBaseApi:
                     else value
                 )
                 data["customized"] = customized
+                # customized site values change the derived site data
+                self.derived.invalidate(id)
                 # trigger an update of cached data depending on customized value
                 # customized keys that are used as alternate value must be handled separately since they may not exist in cache
                 if (
@@ -344,12 +389,13 @@ class AnkerSolixBaseApi:
                     "server": self.apisession.server,
                 }
             )
-        # update extra details and always request counts and mqtt connection state
+        # update extra details and always request counts, request statistics and mqtt connection state
         account_details.update(
             details
             | {
                 "requests_last_min": self.apisession.request_count.last_minute(),
                 "requests_last_hour": self.apisession.request_count.last_hour(),
+                "request_statistic": self.apisession.request_stats.summary(),
                 "mqtt_connection": self.mqttsession.is_connected()
                 if self.mqttsession
                 else False,
@@ -1448,7 +1494,14 @@ class AnkerSolixBaseApi:
             resp = await self.apisession.request("post", API_ENDPOINTS["bind_devices"])
         data = resp.get("data") or {}
         active_devices = set()
+        # skip consolidation of cached devices if response is unchanged
+        unchanged = not fromFile and self._payload_unchanged(
+            "bind_devices", "", API_ENDPOINTS["bind_devices"]
+        )
         for device in data.get("data") or []:
+            if unchanged and (sn := device.get("device_sn")) in self.devices:
+                active_devices.add(sn)
+                continue
             # ensure to get product list once if needed if no device name in response
             if not device.get("device_name") and "products" not in self.account:
                 self._update_account(
@@ -2137,6 +2190,8 @@ class AnkerSolixBaseApi:
                 "post", API_ENDPOINTS["get_dynamic_price_details"], json=data
             )
         data = resp.get("data") or {}
+        # new spot prices change the derived price data of all sites
+        self.derived.invalidate()
         # update account details with spot prices for provider and add last poll time
         self._update_account(
             {
@@ -2243,16 +2298,28 @@ class AnkerSolixBaseApi:
         priceData["dynamic_price_total"] = ""
         # Assume end price for any other provider than nordpool
         endprice = provider.company != "Nordpool"
-        if (
-            spot_prices := self.account.get(
-                f"price_details_{str(provider).replace('/', '_')}"
-            )
-            or {}
+        spot_prices = (
+            self.account.get(f"price_details_{str(provider).replace('/', '_')}") or {}
+        )
+        # consider different timezone if recognized in energy data
+        now = datetime.now() + timedelta(seconds=site.get("energy_offset_tz") or 0)
+        last_details = details.get("dynamic_price_details") or {}
+        # reuse derived price data within the hour slot until the inputs change
+        pricekey = (
+            now.strftime("%Y-%m-%d %H"),
+            str(provider),
+            priceData["dynamic_price_fee"],
+            priceData["dynamic_price_vat"],
+            spot_prices.get("poll_time"),
+            last_details.get("dynamic_price_poll_time"),
+            str(last_details.get("dynamic_price_provider")),
+        )
+        if not forceCalc and (
+            cached := self.derived.get(siteId, "dynamic_price", pricekey)
         ):
-            # consider different timezone if recognized in energy data
-            now = datetime.now() + timedelta(seconds=site.get("energy_offset_tz") or 0)
+            return dict(cached)
+        if spot_prices:
             nowstring = now.strftime("%Y-%m-%d %H:%M")
-            last_details = details.get("dynamic_price_details") or {}
             # get last poll time from site details
             poll_time = spot_prices.get("poll_time")
             last_calc = last_details.get("dynamic_price_poll_time") or ""
@@ -2374,6 +2441,7 @@ class AnkerSolixBaseApi:
                 )
                 else ""
             )
+        self.derived.set(siteId, "dynamic_price", dict(priceData), pricekey)
         return priceData
 
     def extractSolarForecast(self, siteId: str) -> None:
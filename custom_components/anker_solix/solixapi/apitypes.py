@@ -205,6 +205,25 @@ API_ENDPOINTS: Final[dict] = {
     "charger_get_protocol_status": "mini_power/v1/app/setting/get_protocol_status",  # get protocol details per mode {"device_sn": deviceSn})
 }
 
+"""Following are the optional endpoints queried by the poller and the cache keys they fill.
+The keys comprise the cache fields and the keys of consumers presenting them, so the poller can skip an endpoint if no registered consumer needs any of its keys."""
+API_ENDPOINT_CACHE_KEYS: Final[dict[str, set]] = {
+    "get_message_unread": {"has_unread_msg"},
+    "get_co2_ranking": {"co2_ranking", "total_co2_saving"},
+    "get_ai_ems_status": {"ai_ems_runtime", "aiems_runtime_status"},
+    "get_device_pv_total_statistics": {
+        "statistics",
+        "total_output_energy",
+        "total_co2_saving",
+        "total_saved_money",
+        "micro_inverter_power_limit",
+        "preset_inverter_limit",
+    },
+    "charger_get_screensavers": {"screensaver", "display_theme"},
+    "charger_get_port_remarks": {"port_remarks", "remark"},
+    "wifi_list": {"wifi_name", "wifi_signal", "rssi", "wifi_online", "wifi_connection"},
+}
+
 """Following are the Anker Power/Solix Cloud API charging_energy_service endpoints known so far. They are used for Power Panels."""
 API_CHARGING_ENDPOINTS: Final[dict] = {
     "get_error_info": "charging_energy_service/get_error_infos",  # No input param needed, show errors for account?
@@ -1580,10 +1599,32 @@ class SolixDefaults:
     REQUEST_TIMEOUT_DEF: int = 10
     # Request limit per endpoint per minute
     ENDPOINT_LIMIT_DEF: int = 10
+    # Seconds window to reuse a completed read response for identical reads
+    REQUEST_FRESHNESS_MIN: float = 0.0
+    REQUEST_FRESHNESS_MAX: float = 30.0
+    REQUEST_FRESHNESS_DEF: float = 2.0
+    # Maximum number of response fingerprints kept per session and response fields ignored for fingerprints
+    FINGERPRINTS_MAX: int = 500
+    FINGERPRINT_IGNORED_KEYS: ClassVar[set] = {"trace_id", "updated_time"}
+    # Request scheduler defaults for parallel requests per server and request budgets per minute, 0 disables the budget
+    SCHEDULER_CONCURRENCY: int = 2
+    SCHEDULER_GLOBAL_LIMIT: int = 300
+    SCHEDULER_ACCOUNT_LIMIT: int = 120
+    # Concurrent planned energy analysis queries of daily energy tables
+    ENERGY_QUERY_CONCURRENCY: int = 3
+    # Concurrent submitted queries of the account data export
+    EXPORT_QUERY_CONCURRENCY: int = 3
     # Seconds timeout for MQTT realtime trigger
     TRIGGER_TIMEOUT_MIN: int = 30
     TRIGGER_TIMEOUT_MAX: int = 600
     TRIGGER_TIMEOUT_DEF: int = 300
+    # Seconds age of last MQTT message to consider realtime device data as fresh
+    MQTT_FRESH_SECONDS: int = 90
+    # Seconds to stretch the scene info query interval for sites fully covered by fresh MQTT data
+    MQTT_SCENE_INTERVAL: int = 600
+    # Seconds deadline per device and interval of status requests while collecting expected MQTT message types for export
+    MQTT_EXPORT_TIMEOUT: int = 310
+    MQTT_EXPORT_REQUEST_INTERVAL: int = 10
     # Inverter limit
     MICRO_INVERTER_LIMIT_MIN: int = 0
     MICRO_INVERTER_LIMIT_MAX: int = 800
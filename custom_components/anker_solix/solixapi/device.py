@@ -0,0 +1,1264 @@
+"""Anker Power/Solix Cloud API class device details consolidation handlers."""
+# ruff: noqa: N806
+
+from __future__ import annotations  # noqa: TID251
+
+from collections.abc import Callable
+import contextlib
+from datetime import datetime, timedelta
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from .apitypes import (
+    PowerdockStatus,
+    SmartmeterStatus,
+    SolarbankDeviceMetrics,
+    SolarbankPpsStatus,
+    SolarbankRatePlan,
+    SolarbankStatus,
+    SolarbankUsageMode,
+    SolixDefaults,
+    SolixDeviceCapacity,
+    SolixDeviceCategory,
+    SolixDeviceNames,
+    SolixDeviceStatus,
+    SolixDeviceType,
+    SolixGridStatus,
+    SolixNetworkStatus,
+    SolixOcppConnectionStatus,
+    SolixRoleStatus,
+    SolixTariffTypes,
+)
+from .helpers import get_enum_name
+from .mqttcmdmap import COMMAND_LIST, COMMAND_NAME, SolixMqttCommands
+from .mqttmap import SOLIXMQTTMAP
+
+if TYPE_CHECKING:
+    from .api import AnkerSolixApi
+    from .hesapi import AnkerSolixHesApi
+    from .powerpanel import AnkerSolixPowerpanelApi
+
+
+@cache
+def get_model_facts(pn: str) -> dict:
+    """Get the static capability facts for a device model PN, computed only once per PN."""
+    facts: dict = {
+        "capacity": getattr(SolixDeviceCapacity, pn, None),
+        "metrics": getattr(SolarbankDeviceMetrics, pn, None) or frozenset(),
+        # check if device supports status requests from description
+        "mqtt_status_request": any(
+            SolixMqttCommands.status_request
+            in [cmd.get(COMMAND_NAME), *cmd.get(COMMAND_LIST, [])]
+            for cmd in SOLIXMQTTMAP.get(pn, {}).values()
+        ),
+    }
+    # get type and optional generation for standalone device from category definitions
+    if hasattr(SolixDeviceCategory, pn):
+        dev_type = str(getattr(SolixDeviceCategory, pn)).split("_")
+        facts["generation"] = int(dev_type.pop(-1)) if dev_type[-1].isdigit() else None
+        facts["type"] = "_".join(dev_type)
+    return facts
+
+
+# Common device keys
+
+
+def _dev_pn(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> bool:
+    """Update device PN and model dependent details."""
+    if not value:
+        return False
+    pn = str(value)
+    facts = get_model_facts(pn)
+    device["device_pn"] = pn
+    # Get device code features once
+    if "device_code_features" not in device:
+        device["device_code_features"] = (
+            self.account.get("products", {})
+            .get(pn, {})
+            .get("product_codes", {})
+            .get(device.get("device_code", ""), {})
+            .get("custom_fields", {})
+        )
+    # Flag device for supported mqtt trigger if admin and device not passive
+    if (device.get("is_admin") or device.get("owner_user_id")) and not (
+        device.get("is_passive") or devData.get("is_passive")
+    ):
+        device["mqtt_supported"] = True
+        # update customizable setting whether MQTT values should overlay Api values upon cache merge
+        device["mqtt_overlay"] = bool(device.get("mqtt_overlay") or False)
+        if "mqtt_status_request" not in device:
+            device["mqtt_status_request"] = facts["mqtt_status_request"]
+    # try to get type for standalone device from category definitions if not defined yet
+    if "type" in facts and "type" not in device:
+        device["type"] = facts["type"]
+        # update generation if specified in device type definitions
+        if facts["generation"]:
+            device["generation"] = facts["generation"]
+    # check if capacity should be calculated
+    return bool(not device.get("battery_capacity") and facts["capacity"] is not None)
+
+
+def _dev_name(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update device name."""
+    if value:
+        device["name"] = str(value)
+
+
+def _dev_alias(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update device alias and preset default device name if only alias provided."""
+    if not value:
+        return
+    device["alias"] = str(value)
+    # fallback to alias if product name not listed
+    if (pn := device.get("device_pn") or devData.get("device_pn") or None) and (
+        not device.get("name") or devData.get("device_name")
+    ):
+        device["name"] = (
+            devData.get("device_name")
+            or ((self.account.get("products") or {}).get(pn) or {}).get("name")
+            or getattr(SolixDeviceNames, pn, "")
+            or str(value)
+        )
+
+
+def _dev_sw_version(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update device software version."""
+    if value:
+        device["sw_version"] = str(value).lstrip("v")
+
+
+def _dev_any(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys independent of value."""
+    device[key] = value
+
+
+def _dev_bool(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys with boolean values only if value returned."""
+    if value is not None:
+        device[key] = bool(value)
+
+
+def _dev_str(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys with string values."""
+    device[key] = str(value)
+
+
+def _dev_str_value(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys with string values only if value returned."""
+    if value:
+        device[key] = str(value)
+
+
+def _dev_int(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys with int values."""
+    if str(value).isdigit():
+        device[key] = int(value)
+
+
+def _dev_list(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update list keys with value."""
+    if value:
+        device[key] = list(value)
+
+
+def _dev_feature_switch(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Keep existing features, just update with new features provided."""
+    device[key] = (device.get(key) or {}) | (value or {})
+
+
+def _dev_mqtt_overlay(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update customizable keys."""
+    if value is not None:
+        custom = (device.get("customized") or {}).get(key)
+        device[key] = custom if custom is not None else value
+
+
+def _dev_bt_ble_id(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Make sure that BT ID is added if mac not in data."""
+    if value and not devData.get("bt_ble_mac"):
+        device["bt_ble_mac"] = str(value).replace(":", "")
+
+
+def _dev_wifi_signal(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Make sure that key is added, but update only if new value provided to avoid deletion of value from rssi calculation."""
+    if value or device.get(key) is None:
+        device[key] = str(value)
+
+
+def _dev_rssi(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update rssi and calculated wifi signal percentage."""
+    # This is actually not a relative rssi value (0-255), but a negative value and seems to be the absolute dBm of the signal strength
+    device[key] = str(value)
+    # calculate the wifi_signal percentage if that is not provided for the device while rssi is available
+    with contextlib.suppress(ValueError):
+        if float(value) and not devData.get("wifi_signal"):
+            # the percentage will be calculated in the range between -50 dBm (very good) and -85 dBm (no connection) as following.
+            dbmmax = -50
+            dbmmin = -85
+            device["wifi_signal"] = str(
+                round(
+                    max(0, min(100, (float(value) - dbmmin) * 100 / (dbmmax - dbmmin)))
+                )
+            )
+
+
+def _dev_status(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the device status into a description."""
+    device.update(
+        {
+            key: str(value),
+            "status_desc": get_enum_name(
+                SolixDeviceStatus, str(value), SolixDeviceStatus.unknown.name
+            ),
+        }
+    )
+
+
+def _dev_battery_capacity(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> bool:
+    """Use key only as trigger for customization to recalculate modified capacity dependent values."""
+    if str(value).isdigit():
+        device[key] = value
+        return True
+    return False
+
+
+def _dev_fittings(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update nested dictionary."""
+    if key in device:
+        device[key].update(dict(value))
+    else:
+        device[key] = dict(value)
+
+
+def _dev_generic(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update keys only if value returned."""
+    if value:
+        device[key] = value
+
+
+# Solarbank specific keys
+
+
+def _dev_inverter_limit(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update preset inverter limit without unit."""
+    if str(value):
+        device[key] = str(value).lower().replace("w", "")
+
+
+def _dev_power_limit_option(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Mark power limit option as Auto if empty like in app."""
+    if key in get_model_facts(device.get("device_pn") or "")["metrics"]:
+        device[key] = value or ["Auto"]
+
+
+def _dev_battery_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> bool:
+    """Update battery SOC, which is a percentage value and not power."""
+    if not value:
+        return False
+    calc_capacity = device.get("battery_soc") != str(value)
+    device["battery_soc"] = str(value)
+    return calc_capacity
+
+
+def _dev_photovoltaic_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update solar input power."""
+    device["input_power"] = str(value)
+
+
+def _dev_metric_str(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Add solarbank string metrics depending on device type or generation."""
+    if (
+        value != ""
+        and value is not None
+        and key in get_model_facts(device.get("device_pn") or "")["metrics"]
+    ):
+        device[key] = str(value)
+
+
+def _dev_metric_int(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Add solarbank int metrics depending on device type or generation."""
+    if (
+        str(value).isdigit()
+        and key in get_model_facts(device.get("device_pn") or "")["metrics"]
+    ):
+        device[key] = int(value)
+
+
+def _dev_metric_soc(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Add solarbank int metrics depending on device type or generation and features."""
+    if (
+        value is not None
+        and key in get_model_facts(device.get("device_pn") or "")["metrics"]
+        and (
+            (device.get("feature_switch") or {}) | (devData.get("feature_switch") or {})
+        ).get("soc_enable")
+    ):
+        device[key] = bool(value) if key == "backup_reserve_switch" else str(value)
+
+
+def _dev_sub_package_num(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> bool:
+    """Update number of expansion packs."""
+    if (
+        str(value).isdigit()
+        and key in get_model_facts(device.get("device_pn") or "")["metrics"]
+    ):
+        calc_capacity = device.get(key) != int(value)
+        device[key] = int(value)
+        return calc_capacity
+    return False
+
+
+def _dev_load_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update device load preset, which is identical to device parallel_home_load for 2 solarbanks, or current homeload for single solarbank."""
+    if value:
+        # Value may include unit, remove unit to have content consistent
+        device["set_output_power"] = str(value).replace("W", "")
+
+
+def _dev_home_load(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update system wide load setting made via the schedule.
+
+    get_device_load cannot be used for SB2 schedules, but site refresh will pass this as workaround.
+    """
+    if not value:
+        return
+    # Value may include unit, remove unit to have content consistent
+    home_load = str(value).replace("W", "")
+    device["set_system_output_power"] = home_load
+    # Value for device set home load may be empty for single solarbank, use this setting also for device preset in this case
+    if not device.get("set_output_power"):
+        device["set_output_power"] = (
+            str(round(int(home_load) / devData.get("solarbank_count", 1)))
+            if home_load.isdigit()
+            else home_load
+        )
+
+
+def _dev_charging_status(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the charging status into a description."""
+    device[key] = str(value)
+    if device.get("type") == SolixDeviceType.SOLARBANK_PPS.value:
+        # handle Solarbank PPS charging status
+        # TODO: Use proper status definitions once all state descriptions are known
+        device["charging_status_desc"] = get_enum_name(
+            SolarbankPpsStatus, str(value), SolarbankPpsStatus.unknown.name
+        )
+        return
+    # decode the charging status into a description
+    description = get_enum_name(
+        SolarbankStatus, str(value), SolarbankStatus.unknown.name
+    )
+    # check if battery has bypass during charge (if output during charge)
+    # This key can be passed separately, make sure the other values are looked up in provided data first, then in device details
+    # NOTE: charging power may be updated after initial device details update
+    # NOTE: SB1: If status is 3=charging and larger than preset but nothing goes out, the charge priority is active (e.g. 0 Watt switch)
+    # NOTE: SB2: Preset must be replaced by house demand for SB2 when running auto usage mode
+    preset = devData.get("set_load_power") or device.get("set_output_power")
+    out = devData.get("output_power") or device.get("output_power")
+    solar = devData.get("photovoltaic_power") or device.get("input_power")
+    generation = int(device.get("generation", 0))
+    charge = devData.get("charging_power") or device.get("charging_power")
+    homeload = devData.get("to_home_load") or device.get("to_home_load")
+    demand = devData.get("home_load_power") or 0
+    ac_input = (
+        devData.get("grid_to_battery_power") or device.get("grid_to_battery_power") or 0
+    )
+    soc = devData.get("battery_power") or device.get("battery_soc") or 0
+    # use house demand for preset if in auto mode
+    if generation >= 2 and (
+        (
+            device.get("preset_usage_mode")
+            or devData.get("scene_mode")
+            or SolixDefaults.USAGE_MODE
+        )
+        in [
+            SolarbankUsageMode.smartmeter.value,
+            SolarbankUsageMode.smartplugs.value,
+            SolarbankUsageMode.use_time.value,
+            SolarbankUsageMode.time_slot.value,
+            SolarbankUsageMode.smart.value,
+        ]
+    ):
+        preset = demand
+    if (
+        description == SolarbankStatus.charge.name
+        and preset is not None
+        and out is not None
+        and solar is not None
+    ):
+        with contextlib.suppress(ValueError):
+            if (
+                int(out) == 0 and int(solar) > int(preset) and int(charge) > 0
+                # and generation < 2
+            ):
+                # Charge and 0 W output while solar larger than preset must be active charge priority
+                description = SolarbankStatus.charge_priority.name
+            elif int(out) > 0:
+                # Charge with output must be bypass charging
+                description = SolarbankStatus.charge_bypass.name
+    elif (
+        description == SolarbankStatus.detection.name
+        and generation >= 2
+        and charge is not None
+        and homeload is not None
+        and preset is not None
+    ):
+        # Solarbank models with hybrid inverter no longer use charge status, translate detection into proper description
+        with contextlib.suppress(ValueError):
+            if int(charge) > 0:
+                # charge modes
+                description = (
+                    SolarbankStatus.charge_bypass.name
+                    if int(out) > 0
+                    else SolarbankStatus.charge_ac.name
+                    if int(ac_input) > 0 or int(solar) == 0
+                    # Charge > 0 and home load < demand must be enforced charging (if home load value reliable)
+                    else SolarbankStatus.protection_charge.name
+                    if int(homeload) < int(preset)
+                    else SolarbankStatus.charge.name
+                )
+            elif int(charge) < 0:
+                # discharge modes
+                description = (
+                    SolarbankStatus.bypass_discharge.name
+                    if int(solar) > 0
+                    else SolarbankStatus.discharge.name
+                )
+            elif int(soc) == 100:
+                # other modes
+                description = SolarbankStatus.fully_charged.name
+            elif int(solar) > 0:
+                description = SolarbankStatus.bypass.name
+    elif (
+        description == SolarbankStatus.bypass.name
+        and generation >= 2
+        and charge is not None
+    ):
+        with contextlib.suppress(ValueError):
+            # New SB2 Mode for Bypass and discharge
+            if int(charge) < 0:
+                description = SolarbankStatus.bypass_discharge.name
+
+    device["charging_status_desc"] = description
+
+
+def _dev_solar_info(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Remove unnecessary keys from solar_info."""
+    if isinstance(value, dict):
+        for extra in ("brand_id", "model_img", "version", "ota_status"):
+            value.pop(extra, None)
+        device[key] = value
+
+
+def _dev_schedule(  # noqa: C901
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update schedule and active presets.
+
+    Schedule is currently a site wide setting. However, we save this with device details to retain info across site updates.
+    When individual device schedules are supported in future, this info is needed per device anyway.
+    """
+    if not isinstance(value, dict):
+        return
+    sn = device.get("device_sn")
+    device[key] = dict(value)
+    # set default presets for no active schedule slot
+    if device.get("type") == SolixDeviceType.COMBINER_BOX.value:
+        # assume generation and ac type for tracking schedule data in combiner box
+        generation = 3
+        ac_type = True
+    else:
+        generation = int(device.get("generation", 0))
+        ac_type = bool(device.get("grid_to_battery_power") or False)
+    # flag if rate plan charge type supported
+    charge_enabled = bool(
+        (device.get("feature_switch") or {}).get("custom_rate_charge_enable")
+    )
+    # Count solarbanks for device output presets (only used for SB1)
+    cnt = device.get("solarbank_count", 0)
+    mysite = self.sites.get(device.get("site_id") or "") or {}
+    if generation >= 2:
+        # Solarbank 2+ schedule
+        mode_type = value.get("mode_type") or SolixDefaults.USAGE_MODE
+        # define default presets, will be updated if active slot found for mode
+        device.update(
+            {
+                "preset_usage_mode": mode_type,
+                "preset_system_output_power": value.get("default_home_load")
+                or SolixDefaults.PRESET_NOSCHEDULE
+                if mode_type == SolarbankUsageMode.manual.value
+                else 0
+                if mode_type == SolarbankUsageMode.smartplugs.value
+                else None,
+            }
+        )
+        if charge_enabled:
+            # SB3+ unique settings
+            device["preset_load_type"] = SolixDefaults.PRESET_TYPE
+        if ac_type:
+            # update default with site currency if found
+            if not (
+                curr_def := (mysite.get("site_details") or {}).get("site_price_unit")
+                or ""
+            ):
+                curr_def = SolixDefaults.CURRENCY_DEF
+            device.update(
+                {
+                    "preset_manual_backup_start": 0,
+                    "preset_manual_backup_end": 0,
+                    "preset_backup_option": False,
+                    "preset_tariff": SolixTariffTypes.UNKNOWN.value,
+                    "preset_tariff_price": SolixDefaults.TARIFF_PRICE_DEF,
+                    "preset_tariff_currency": curr_def,
+                }
+            )
+    else:
+        # Solarbank 1 schedule
+        # define default presets, will be updated if active slot found
+        device.update(
+            {
+                "preset_system_output_power": SolixDefaults.PRESET_NOSCHEDULE,
+                "preset_allow_export": SolixDefaults.ALLOW_EXPORT,
+                "preset_discharge_priority": SolixDefaults.DISCHARGE_PRIORITY_DEF,
+                "preset_charge_priority": SolixDefaults.CHARGE_PRIORITY_DEF,
+            }
+        )
+        if cnt > 1:
+            device.update(
+                {
+                    "preset_power_mode": SolixDefaults.POWER_MODE,
+                    "preset_device_output_power": int(
+                        SolixDefaults.PRESET_NOSCHEDULE / cnt
+                    ),
+                }
+            )
+    # get actual presets from current slot
+    # Consider time zone shifts
+    tz_offset = (self.sites.get(device.get("site_id") or "") or {}).get(
+        "energy_offset_tz"
+    ) or 0
+    now = datetime.now() + timedelta(seconds=tz_offset)
+    now_time = now.time().replace(microsecond=0)
+    sys_power = None
+    dev_power = None
+    # set now to new daytime if close to end of day
+    if now_time >= datetime.strptime("23:59:58", "%H:%M:%S").time():
+        now_time = datetime.strptime("00:00", "%H:%M").time()
+    if generation >= 2:
+        # Solarbank 2+ schedule, weekday starts with 0=Sunday)
+        # datetime isoweekday starts with 1=Monday - 7 = Sunday, strftime('%w') starts also 0 = Sunday
+        weekday = int(now.strftime("%w"))
+        month = now.month
+        # get rate_plan_name depending on use usage mode_type
+        rate_plan_name = getattr(
+            SolarbankRatePlan,
+            get_enum_name(
+                SolarbankUsageMode,
+                mode_type,
+                default=SolarbankUsageMode.manual.name,
+            ),
+            SolarbankRatePlan.manual,
+        )
+        day_ranges = next(
+            iter(
+                [
+                    day.get("ranges") or []
+                    for day in (value.get(rate_plan_name) or [{}])
+                    if weekday in (day.get("week") or [])
+                ]
+            ),
+            [],
+        )
+        for slot in day_ranges:
+            with contextlib.suppress(ValueError):
+                start_time = datetime.strptime(
+                    slot.get("start_time") or "00:00", "%H:%M"
+                ).time()
+                end_time = slot.get("end_time") or "00:00"
+                # "24:00" format not supported in strptime
+                if end_time == "24:00":
+                    end_time = datetime.strptime("23:59:59", "%H:%M:%S").time()
+                else:
+                    end_time = datetime.strptime(end_time, "%H:%M").time()
+                if start_time <= now_time < end_time:
+                    sys_power = slot.get("power")
+                    device["preset_system_output_power"] = sys_power
+                    if charge_enabled:
+                        # SB3+ unique settings
+                        device["preset_load_type"] = (
+                            slot.get("charging_type") or SolixDefaults.PRESET_TYPE
+                        )
+                    break
+        if ac_type and (backup := value.get(SolarbankRatePlan.backup) or {}):
+            # check whether now in active backup interval to update usage mode info because active backup mode is not reflected in schedule object
+            start = (backup.get("ranges") or [{}])[0].get("start_time") or 0
+            end = (backup.get("ranges") or [{}])[0].get("end_time") or 0
+            switch = backup.get("switch") or False
+            # update valid backup list item data
+            device.update(
+                {
+                    "preset_usage_mode": SolarbankUsageMode.backup
+                    if switch and start < now.timestamp() < end
+                    else mode_type,
+                    "preset_manual_backup_start": start,
+                    "preset_manual_backup_end": end,
+                    "preset_backup_option": switch,
+                }
+            )
+        if ac_type and (use_time := value.get(SolarbankRatePlan.use_time) or {}):
+            for season in [
+                sea
+                for sea in use_time
+                if ((sea.get("sea") or {}).get("start_month") or 1)
+                <= month
+                <= ((sea.get("sea") or {}).get("end_month") or 12)
+            ]:
+                if weekday in range(1, 6) or season.get("is_same"):
+                    dayplan = season.get("weekday") or []
+                    prices = season.get("weekday_price") or []
+                else:
+                    dayplan = season.get("weekend") or []
+                    prices = season.get("weekend_price") or []
+                tariff = next(
+                    iter(
+                        [
+                            slot
+                            for slot in dayplan
+                            if (slot.get("start_time") or 0)
+                            <= now_time.hour
+                            < (slot.get("end_time") or 24)
+                        ]
+                    ),
+                    {},
+                ).get("type")
+                price = next(
+                    iter([slot for slot in prices if slot.get("type") == tariff]),
+                    {},
+                ).get("price")
+                device.update(
+                    {
+                        "preset_tariff": tariff or SolixTariffTypes.UNKNOWN.value,
+                        "preset_tariff_price": price or SolixDefaults.TARIFF_PRICE_DEF,
+                        "preset_tariff_currency": season.get("unit") or curr_def,
+                    }
+                )
+
+        # adjust schedule preset for eventual reuse as active presets
+        # Active Preset must only be considered if usage mode is manual
+        sys_power = (
+            str(device.get("preset_system_output_power") or "")
+            if (mode_type or 0) == SolarbankUsageMode.manual.value
+            else None
+        )
+        dev_power = sys_power
+    else:
+        # Solarbank 1 schedule
+        for slot in value.get("ranges") or []:
+            with contextlib.suppress(ValueError):
+                start_time = datetime.strptime(
+                    slot.get("start_time") or "00:00", "%H:%M"
+                ).time()
+                end_time = slot.get("end_time") or "00:00"
+                # "24:00" format not supported in strptime
+                if end_time == "24:00":
+                    end_time = datetime.strptime("23:59:59", "%H:%M:%S").time()
+                else:
+                    end_time = datetime.strptime(end_time, "%H:%M").time()
+                if start_time <= now_time < end_time:
+                    preset_power = (slot.get("appliance_loads") or [{}])[0].get("power")
+                    export = slot.get("turn_on")
+                    prio = slot.get("charge_priority")
+                    if bool(value.get("is_show_priority_discharge")):
+                        discharge_prio = slot.get("priority_discharge_switch")
+                    else:
+                        discharge_prio = None
+                    # For enforced SB1 schedule by SB2, the export switch setting is None and all other will be set to None either
+                    device.update(
+                        {
+                            "preset_system_output_power": None
+                            if export is None
+                            else preset_power,
+                            "preset_allow_export": None if export is None else export,
+                            "preset_discharge_priority": None
+                            if export is None
+                            else discharge_prio,
+                            "preset_charge_priority": None if export is None else prio,
+                        }
+                    )
+                    # add presets for dual solarbank setups, default to None if schedule does not support new keys yet
+                    power_mode = slot.get("power_setting_mode")
+                    dev_presets = slot.get("device_power_loads") or [{}]
+                    dev_power = next(
+                        iter(
+                            [
+                                d.get("power")
+                                for d in dev_presets
+                                if d.get("device_sn") == sn
+                            ]
+                        ),
+                        None,
+                    )
+                    if cnt > 1:
+                        # adjust device power value for default share which is always using 50%, also for single solarbank setups
+                        # For enforced SB1 schedule by SB2, the export switch setting is None and all other will be set to None either
+                        device.update(
+                            {
+                                "preset_power_mode": None
+                                if export is None
+                                else power_mode,
+                                "preset_device_output_power": None
+                                if export is None
+                                else dev_power,
+                            }
+                        )
+                    break
+        # adjust schedule presets for eventual reuse as active presets
+        # Charge priority and SOC must only be considered if MI80 inverter is configured for SB1
+        prio = (
+            (device.get("preset_charge_priority") or 0)
+            if ((device.get("solar_info") or {}).get("solar_model") or "") == "A5143"
+            else 0
+        )
+        if device.get("preset_allow_export") and int(prio) <= int(
+            device.get("battery_soc") or "0"
+        ):
+            sys_power = str(device.get("preset_system_output_power") or "")
+            # active device power depends on SB count
+            dev_power = device.get("preset_device_output_power") or None
+            dev_power = str(
+                dev_power if dev_power is not None and cnt > 1 else sys_power
+            )
+        else:
+            sys_power = "0"
+            dev_power = "0"
+    # update appliance load in site cache upon device details or schedule updates not triggered by sites update
+    if not devData.get("retain_load") and mysite and sys_power:
+        mysite["retain_load"] = sys_power
+        # update also device fields for output power if not provided along with schedule update
+        if not devData.get("current_home_load") and sys_power:
+            device["set_system_output_power"] = sys_power
+            if not devData.get("parallel_home_load") and dev_power:
+                device["set_output_power"] = dev_power
+
+
+# Power Panel specific keys
+
+
+def _dev_average_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update average power details."""
+    if isinstance(value, dict):
+        device[key] = value
+
+
+# Smartmeter specific keys
+
+
+def _dev_grid_status(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the grid status into a description."""
+    device.update(
+        {
+            key: str(value),
+            "grid_status_desc": get_enum_name(
+                SmartmeterStatus, str(value), SmartmeterStatus.unknown.name
+            ),
+        }
+    )
+
+
+# Power dock specific keys
+
+
+def _dev_dock_status(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the dock status into a description."""
+    device.update(
+        {
+            key: str(value),
+            "dock_status_desc": get_enum_name(
+                PowerdockStatus, str(value), PowerdockStatus.unknown.name
+            ),
+        }
+    )
+
+
+# Solarbank PPS specific keys, map them to solarbank keys where applicable
+
+
+def _dev_pv_high_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Map PPS high voltage PV power."""
+    device["solar_power_1"] = str(value)
+
+
+def _dev_pv_low_power(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Map PPS low voltage PV power."""
+    device["solar_power_2"] = str(value)
+
+
+def _dev_pv_high_name(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Map PPS high voltage PV name."""
+    device["pv_name"] = (device.get("pv_name") or {}) | {"pv1_name": str(value)}
+
+
+def _dev_pv_low_name(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Map PPS low voltage PV name."""
+    device["pv_name"] = (device.get("pv_name") or {}) | {"pv2_name": str(value)}
+
+
+# HES specific keys
+
+
+def _dev_hes_data(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the HES status codes into descriptions."""
+    if not isinstance(value, dict):
+        return
+    for field, desc, enum in (
+        # use same field name as for balcony power devices
+        ("online_status", "status_desc", SolixDeviceStatus),
+        ("master_slave_status", "role_status_desc", SolixRoleStatus),
+        ("grid_status", "grid_status_desc", SolixGridStatus),
+        ("network_status", "network_status_desc", SolixNetworkStatus),
+    ):
+        if field in value:
+            value[desc] = get_enum_name(enum, str(value.get(field)), enum.unknown.name)
+    device[key] = value
+
+
+# EV charger specific keys
+
+
+def _dev_ocpp_status(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Decode the OCPP status into a description, assuming same code translation as for device connection status."""
+    if device.get("type") == SolixDeviceType.EV_CHARGER.value:
+        device.update(
+            {
+                key: value,
+                "ocpp_status_desc": get_enum_name(
+                    SolixOcppConnectionStatus,
+                    str(value),
+                    SolixOcppConnectionStatus.unknown.name,
+                ),
+            }
+        )
+
+
+# Mini charger specific keys
+
+
+def _dev_screensaver(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update screensavers and selected theme if custom theme."""
+    device[key] = value
+    if (theme_id := device.get("mqtt_data", {}).get("theme_id")) and (
+        theme := (value or {}).get(str(theme_id), {})
+    ):
+        device["display_theme"] = theme
+
+
+def _dev_theme_id(
+    self: AnkerSolixApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update display theme only if cached value different."""
+    if value is not None and str(value) != str(
+        device.get("display_theme", {}).get("id", "")
+    ):
+        device["display_theme"] = self.get_charger_themes(
+            deviceSn=device.get("device_sn")
+        ).get(str(value), {})
+
+
+# Registered device key handlers, each returns True if battery capacity values need recalculation
+DEVICE_KEY_HANDLERS: dict[str, Callable[..., bool | None]] = {
+    "product_code": _dev_pn,
+    "device_pn": _dev_pn,
+    "device_name": _dev_name,
+    "alias_name": _dev_alias,
+    "device_sw_version": _dev_sw_version,
+    "preset_inverter_limit": _dev_inverter_limit,
+    # keys to be updated independent of value
+    **dict.fromkeys(
+        (
+            "relate_type",
+            "intgr_device",
+            "pv_name",
+            "pv_power",
+            "group_info",
+            "power_limit_option_real",
+            "all_power_limit_option",
+            "station_sn",
+            "total_stats",
+            "energy_details",
+        ),
+        _dev_any,
+    ),
+    "power_limit_option": _dev_power_limit_option,
+    "feature_switch": _dev_feature_switch,
+    # keys with boolean values that should only be updated if value returned
+    **dict.fromkeys(
+        (
+            "wifi_online",
+            "is_support_wired",
+            "wired_connected",
+            "data_valid",
+            "charge",
+            "auto_upgrade",
+            "is_ota_update",
+            "cascaded",
+            "is_passive",
+            "allow_grid_export",
+        ),
+        _dev_bool,
+    ),
+    # keys with string values
+    **dict.fromkeys(
+        (
+            "wireless_type",
+            "charging_power",
+            "output_power",
+            "power_unit",
+            "bws_surplus",
+            "current_power",
+            "tag",
+            "platform_tag",
+            "ota_version",
+            "bat_charge_power",
+            "bat_discharge_power",
+            "all_ac_input_limit",
+            "all_power_limit",
+            # inverter specific keys
+            "generate_power",
+        ),
+        _dev_str,
+    ),
+    # keys with string values that should only be updated if value returned
+    **dict.fromkeys(
+        (
+            "wifi_name",
+            "bt_ble_mac",
+            "wifi_mac",
+            "energy_today",
+            "energy_last_period",
+            "time_zone",
+            "grid_export_limit",
+            "owner_user_id",
+            "img_url",
+            # smartmeter specific keys
+            "photovoltaic_to_grid_power",
+            "grid_to_home_power",
+        ),
+        _dev_str_value,
+    ),
+    "mqtt_overlay": _dev_mqtt_overlay,
+    "bt_ble_id": _dev_bt_ble_id,
+    "wifi_signal": _dev_wifi_signal,
+    "rssi": _dev_rssi,
+    "status": _dev_status,
+    "battery_capacity": _dev_battery_capacity,
+    # items with int value
+    **dict.fromkeys(("power_cutoff", "output_cutoff_data"), _dev_int),
+    # list items with value
+    **dict.fromkeys(("power_cutoff_data", "ota_children"), _dev_list),
+    "fittings": _dev_fittings,
+    "solarbank_count": _dev_generic,
+    # Solarbank specific keys
+    "battery_power": _dev_battery_power,
+    "photovoltaic_power": _dev_photovoltaic_power,
+    **dict.fromkeys(
+        (
+            "solar_power_1",
+            "solar_power_2",
+            "solar_power_3",
+            "solar_power_4",
+            "ac_power",
+            "to_home_load",
+            "other_input_power",
+            "micro_inverter_power",
+            "micro_inverter_power_limit",
+            "micro_inverter_low_power_limit",
+            "grid_to_battery_power",
+            "pei_heating_power",
+        ),
+        _dev_metric_str,
+    ),
+    **dict.fromkeys(
+        ("power_limit", "pv_power_limit", "ac_input_limit"), _dev_metric_int
+    ),
+    **dict.fromkeys(
+        (
+            "charge_upper_limit",
+            "discharge_lower_limit",
+            "backup_reserve",
+            "backup_reserve_switch",
+        ),
+        _dev_metric_soc,
+    ),
+    "sub_package_num": _dev_sub_package_num,
+    "set_load_power": _dev_load_power,
+    "parallel_home_load": _dev_load_power,
+    "current_home_load": _dev_home_load,
+    "charging_status": _dev_charging_status,
+    "solar_info": _dev_solar_info,
+    "schedule": _dev_schedule,
+    # Power Panel specific keys
+    "average_power": _dev_average_power,
+    # Smartmeter specific keys
+    "grid_status": _dev_grid_status,
+    # Smartplug specific keys
+    **dict.fromkeys(("err_code", "priority", "auto_switch", "running_time"), _dev_any),
+    # Power dock specific keys
+    "dock_status": _dev_dock_status,
+    # Solarbank PPS specific keys
+    "pv_high_power": _dev_pv_high_power,
+    "pv_low_power": _dev_pv_low_power,
+    "pv_high_name": _dev_pv_high_name,
+    "pv_low_name": _dev_pv_low_name,
+    **dict.fromkeys(
+        (
+            "phase",
+            "main_ct_number",
+            "branch_ct_number",
+            "main_branch_check_status",
+            "sub_pack_temp_alarm",
+            "protection_status",
+            "charge_protect_threshold",
+            "discharge_protect_threshold",
+        ),
+        _dev_any,
+    ),
+    # HES specific keys
+    "hes_data": _dev_hes_data,
+    # EV charger specific keys
+    "ev_charger_status": _dev_any,
+    "ocpp_connect_status": _dev_ocpp_status,
+    # Mini charger specific keys
+    **dict.fromkeys(
+        ("protocol_status", "port_remarks", "device_setting", "custom_modes", "modes"),
+        _dev_any,
+    ),
+    "screensaver": _dev_screensaver,
+    "theme_id": _dev_theme_id,
+}
+
+
+# HES and Power Panel device keys
+
+
+def _sys_pn(
+    self: AnkerSolixHesApi | AnkerSolixPowerpanelApi,
+    device: dict,
+    key: str,
+    value: Any,
+    devData: dict,
+) -> bool:
+    """Update device PN with battery capacity and type from model facts."""
+    if not value:
+        return False
+    device["device_pn"] = str(value)
+    facts = get_model_facts(str(value))
+    calc_capacity = False
+    # try to get capacity from category definitions
+    if facts["capacity"] is not None and "battery_capacity" not in device:
+        # get battery capacity from known PNs
+        device["battery_capacity"] = str(facts["capacity"])
+        calc_capacity = True
+    # try to get type for standalone device from category definitions if not defined yet
+    if "type" in facts and "type" not in device:
+        device["type"] = facts["type"]
+        # update generation if specified in device type definitions
+        if facts["generation"]:
+            device["generation"] = facts["generation"]
+    return calc_capacity
+
+
+def _sys_alias(
+    self: AnkerSolixHesApi | AnkerSolixPowerpanelApi,
+    device: dict,
+    key: str,
+    value: Any,
+    devData: dict,
+) -> None:
+    """Update device alias."""
+    if value:
+        device["alias"] = str(value)
+
+
+def _sys_flag(
+    self: AnkerSolixHesApi | AnkerSolixPowerpanelApi,
+    device: dict,
+    key: str,
+    value: Any,
+    devData: dict,
+) -> None:
+    """Update keys with boolean values independent of value."""
+    device[key] = bool(value)
+
+
+def _sys_average_power(
+    self: AnkerSolixHesApi | AnkerSolixPowerpanelApi,
+    device: dict,
+    key: str,
+    value: Any,
+    devData: dict,
+) -> bool:
+    """Update average power details, remaining capacity must be calculated for new SOC."""
+    if not value:
+        return False
+    calc_capacity = (device.get(key) or {}).get("state_of_charge") != value.get(
+        "state_of_charge"
+    )
+    device[key] = value
+    return calc_capacity
+
+
+def _sys_bat_count(
+    self: AnkerSolixHesApi | AnkerSolixPowerpanelApi,
+    device: dict,
+    key: str,
+    value: Any,
+    devData: dict,
+) -> bool:
+    """Update battery count, capacity must be calculated for changed count."""
+    if not str(value).isdigit():
+        return False
+    calc_capacity = device.get(key) != int(value)
+    device[key] = int(value)
+    return calc_capacity
+
+
+def _hes_name(
+    self: AnkerSolixHesApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update device name or preset default device name if only alias provided."""
+    if value:
+        device["name"] = str(value)
+    elif (pn := device.get("device_pn") or devData.get("device_pn") or None) and (
+        not device.get("name") or devData.get("device_name")
+    ):
+        # fallback to alias if product name not listed
+        device["name"] = (
+            devData.get("device_name")
+            or ((self.account.get("products") or {}).get(pn) or {}).get("name")
+            or getattr(SolixDeviceNames, pn, "")
+            or str(value)
+        )
+
+
+def _hes_rssi(
+    self: AnkerSolixHesApi, device: dict, key: str, value: Any, devData: dict
+) -> None:
+    """Update wifi signal, for HES this is actually not a relative rssi value (0-255), but signal strength 0-100 %."""
+    if value:
+        device["wifi_signal"] = str(value)
+
+
+# Registered HES device key handlers, each returns True if battery capacity values need recalculation
+HES_KEY_HANDLERS: dict[str, Callable[..., bool | None]] = {
+    "product_code": _sys_pn,
+    "device_pn": _sys_pn,
+    "device_name": _hes_name,
+    "alias_name": _sys_alias,
+    **dict.fromkeys(("auto_upgrade", "is_subdevice", "is_primary"), _sys_flag),
+    "wireless_type": _dev_str,
+    # keys with string values that should only be updated if value returned
+    **dict.fromkeys(("wifi_name", "main_sn", "ssid", "encryption"), _dev_str_value),
+    "ev_charger_status": _dev_any,
+    "rssi": _hes_rssi,
+    "average_power": _sys_average_power,
+    "batCount": _sys_bat_count,
+    "battery_capacity": _dev_battery_capacity,
+}
+
+# Registered Power Panel device key handlers, each returns True if battery capacity values need recalculation
+POWERPANEL_KEY_HANDLERS: dict[str, Callable[..., bool | None]] = {
+    "product_code": _sys_pn,
+    "device_pn": _sys_pn,
+    "alias_name": _sys_alias,
+    "status": _dev_status,
+    "battery_capacity": _dev_battery_capacity,
+    "average_power": _sys_average_power,
+    "batCount": _sys_bat_count,
+    "auto_upgrade": _sys_flag,
+    "wireless_type": _dev_str,
+    # keys with string values that should only be updated if value returned
+    **dict.fromkeys(("wifi_name", "rssi"), _dev_str_value),
+    "utility_rate_plan": _dev_any,
+}
@@ -3,7 +3,9 @@
 
 from __future__ import annotations  # noqa: TID251
 
+from asyncio import Semaphore, create_task, gather
 from datetime import datetime, time, timedelta
+from functools import partial
 from pathlib import Path
 from statistics import mean
 from typing import TYPE_CHECKING
@@ -12,6 +14,7 @@ from .apitypes import (
     API_ENDPOINTS,
     API_FILEPREFIXES,
     SolarbankUsageMode,
+    SolixDefaults,
     SolixDeviceType,
 )
 from .helpers import convertToKwh
@@ -30,6 +33,7 @@ async def energy_daily(  # noqa: C901
     devTypes: set | None = None,
     fromFile: bool = False,
     showProgress: bool = False,
+    useStore: bool = True,
 ) -> dict:
     """Fetch daily Energy data for given interval and provide it in a table format dictionary.
 
@@ -39,7 +43,23 @@ async def energy_daily(  # noqa: C901
     Example:
     {"2023-09-29": {"date": "2023-09-29", "solar_production": "1.21", "battery_discharge": "0.47", "battery_charge": "0.56"},
      "2023-09-30": {"date": "2023-09-30", "solar_production": "3.07", "battery_discharge": "1.06", "battery_charge": "1.39"}}
+    Final days are served from the local energy store if used, only missing or mutable days are queried.
     """
+    if self.energyStore and useStore and not fromFile:
+        return await self.energyStore.energy_daily(
+            fetch=partial(self.energy_daily, useStore=False),
+            scope=self.energyStore.scope(
+                "energy_daily", dayTotals=dayTotals, devTypes=devTypes
+            ),
+            siteId=siteId,
+            deviceSn=deviceSn,
+            startDay=startDay,
+            numDays=numDays,
+            tzOffset=(self.sites.get(siteId) or {}).get("energy_offset_tz") or 0,
+            dayTotals=dayTotals,
+            devTypes=devTypes,
+            showProgress=showProgress,
+        )
     table = {}
     if not devTypes or not isinstance(devTypes, set):
         devTypes = set()
@@ -69,6 +89,68 @@ async def energy_daily(  # noqa: C901
         sb2 = sb2s[0]
     else:
         sb2 = {}
+    # query only channels if provided device SN has solar power values in cache
+    channels = [
+        ch
+        for ch in ["pv" + str(num) for num in range(1, 5)] + ["micro_inverter"]
+        if f"solar_power_{ch.replace('pv', '')}" in sb2 or f"{ch}_power" in sb2
+    ]
+    home_usage = bool(SolixDeviceType.SOLARBANK.value in devTypes and sb2s) or bool(
+        {
+            SolixDeviceType.SMARTMETER.value,
+            SolixDeviceType.SMARTPLUG.value,
+            SolixDeviceType.SOLARBANK_PPS.value,
+        }
+        & devTypes
+    )
+    grid = SolixDeviceType.SMARTMETER.value in devTypes and (
+        SolixDeviceType.SOLARBANK.value not in devTypes or other_pv
+    )
+    # plan the energy analysis queries of all device types and run them concurrently, the table is built from the responses afterwards
+    planned: dict[tuple[str, datetime, datetime], dict] = {}
+    if not fromFile:
+        queries: set[tuple[str, datetime, datetime]] = set()
+        if SolixDeviceType.SOLARBANK.value in devTypes:
+            queries |= _analysis_queries(
+                "solarbank", startDay, numDays, dayTotals=dayTotals and bool(sb2s)
+            )
+        if home_usage:
+            queries |= _analysis_queries(
+                "home_usage", startDay, numDays, dayTotals=dayTotals
+            )
+        if grid:
+            queries |= _analysis_queries(
+                "grid", startDay, numDays, dayTotals=dayTotals, fullRange=True
+            )
+        if SolixDeviceType.INVERTER.value in devTypes:
+            for ch in channels:
+                queries |= _analysis_queries(
+                    f"solar_production_{ch.replace('_', '')}", startDay, numDays
+                )
+        if SolixDeviceType.EV_CHARGER.value in devTypes:
+            queries |= _analysis_queries("ev_charger", startDay, numDays)
+        if SolixDeviceType.SOLARBANK_PPS.value in devTypes:
+            queries |= _analysis_queries("pps", startDay, numDays)
+        else:
+            queries |= _analysis_queries(
+                "solar_production", startDay, numDays, dayTotals=dayTotals
+            )
+        planned = await self.energy_analysis_plan(
+            siteId=siteId, deviceSn=deviceSn, queries=queries
+        )
+
+    async def analysis(devType: str, start: datetime, end: datetime) -> dict:
+        """Get the planned energy analysis response, or query it if it was not planned."""
+        if (key := (devType, start, end)) not in planned:
+            planned[key] = await self.energy_analysis(
+                siteId=siteId,
+                deviceSn=deviceSn,
+                rangeType="week",
+                startDay=start,
+                endDay=end,
+                devType=devType,
+            )
+        return planned[key]
 
     # first get solarbank export
     if SolixDeviceType.SOLARBANK.value in devTypes:
@@ -82,15 +164,12 @@ async def energy_daily(  # noqa: C901
                 )
             ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay
+            resp = await analysis(
+                "solarbank",
+                startDay,
+                startDay
                 if justify_daytotals
                 else startDay + timedelta(days=numDays - 1),
-                devType="solarbank",
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -121,22 +200,25 @@ async def energy_daily(  # noqa: C901
                 table.update({daystr: entry})
         # Solarbank 2 has AC socket output and battery to home related totals for given interval. If requested, make daily queries for given interval
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis("solarbank", day, day)
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="solarbank",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -181,14 +263,7 @@ async def energy_daily(  # noqa: C901
             )
 
     # Get home usage energy types if device is solarbank generation 2, smart meter, smart plugs, solarbank_pps
-    if (SolixDeviceType.SOLARBANK.value in devTypes and sb2s) or (
-        {
-            SolixDeviceType.SMARTMETER.value,
-            SolixDeviceType.SMARTPLUG.value,
-            SolixDeviceType.SOLARBANK_PPS.value,
-        }
-        & devTypes
-    ):
+    if home_usage:
         # get first data period from file or api
         justify_daytotals = bool(dayTotals)
         if fromFile:
@@ -208,15 +283,12 @@ async def energy_daily(  # noqa: C901
                     )
                 ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay
+            resp = await analysis(
+                "home_usage",
+                startDay,
+                startDay
                 if justify_daytotals
                 else startDay + timedelta(days=numDays - 1),
-                devType="home_usage",
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -247,22 +319,25 @@ async def energy_daily(  # noqa: C901
                 table.update({daystr: entry})
         # Home usage has Grid import and smart plug related totals for given interval. If requested, make daily queries for given interval
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis("home_usage", day, day)
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="home_usage",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -329,9 +404,8 @@ async def energy_daily(  # noqa: C901
 
     # Add grid stats from smart reader only if solarbank not requested, otherwise grid data available in solarbank and solar responses
     # 3rd party export to grid only available in grid stats, query only required if 3rd party PV supported by site
-    if SolixDeviceType.SMARTMETER.value in devTypes and (
-        SolixDeviceType.SOLARBANK.value not in devTypes or other_pv
-    ):
+    if grid:
+        justify_daytotals = bool(dayTotals)
         if fromFile:
             resp = (
                 await self.apisession.loadFromFile(
@@ -340,13 +414,10 @@ async def energy_daily(  # noqa: C901
                 )
             ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay + timedelta(days=numDays - 1),
-                devType="grid",
+            resp = await analysis(
+                "grid",
+                startDay,
+                startDay + timedelta(days=numDays - 1),
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -403,22 +474,25 @@ async def energy_daily(  # noqa: C901
                 table.update({daystr: entry})
         # Only Grid has 3rd party to grid value for given interval. If requested, make daily queries for given interval
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis("grid", day, day)
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="grid",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -468,58 +542,53 @@ async def energy_daily(  # noqa: C901
 
     # Add solar energy per channel if supported by device, e.g. Solarbank 2 embedded inverter
     if SolixDeviceType.INVERTER.value in devTypes:
-        for ch in ["pv" + str(num) for num in range(1, 5)] + ["micro_inverter"]:
-            # query only if provided device SN has solar power values in cache
-            if f"solar_power_{ch.replace('pv', '')}" in sb2 or f"{ch}_power" in sb2:
+        for ch in channels:
+            if fromFile:
+                resp = (
+                    await self.apisession.loadFromFile(
+                        Path(self.testDir())
+                        / f"{API_FILEPREFIXES['energy_solar_production']}_{ch.replace('_', '')}_{siteId}.json"
+                    )
+                ).get("data") or {}
+            else:
+                resp = await analysis(
+                    f"solar_production_{ch.replace('_', '')}",
+                    startDay,
+                    startDay + timedelta(days=numDays - 1),
+                )
+            items = resp.get("power") or []
+            # power unit is incorrectly wh, but values are kWh
+            # unit = resp.get("power_unit") or ""
+            unit = "kwh"
+            t_unit = resp.get("total_energy_unit") or ""
+            # for file usage ensure that last item is used if today is included
+            start = (
+                len(items) - 1
+                if fromFile and datetime.now().date() == startDay.date()
+                else 0
+            )
+            for idx, item in enumerate(items[start : start + numDays]):
                 if fromFile:
-                    resp = (
-                        await self.apisession.loadFromFile(
-                            Path(self.testDir())
-                            / f"{API_FILEPREFIXES['energy_solar_production']}_{ch.replace('_', '')}_{siteId}.json"
-                        )
-                    ).get("data") or {}
+                    daystr = (startDay + timedelta(days=idx)).strftime("%Y-%m-%d")
                 else:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=startDay,
-                        endDay=startDay + timedelta(days=numDays - 1),
-                        devType=f"solar_production_{ch.replace('_', '')}",
+                    daystr = item.get("time")
+                if daystr:
+                    entry = table.get(daystr, {"date": daystr})
+                    entry.update(
+                        {
+                            "date": daystr,
+                            f"solar_production_{ch.replace('_', '')}": convertToKwh(
+                                val=item.get("value") or None, unit=unit
+                            ),
+                        }
                     )
-                items = resp.get("power") or []
-                # power unit is incorrectly wh, but values are kWh
-                # unit = resp.get("power_unit") or ""
-                unit = "kwh"
-                t_unit = resp.get("total_energy_unit") or ""
-                # for file usage ensure that last item is used if today is included
-                start = (
-                    len(items) - 1
-                    if fromFile and datetime.now().date() == startDay.date()
-                    else 0
+                    table.update({daystr: entry})
+            if showProgress:
+                self._logger.info(
+                    "Received api %s solar_production_%s energy for period",
+                    self.apisession.nickname,
+                    ch.replace("_", ""),
                 )
-                for idx, item in enumerate(items[start : start + numDays]):
-                    if fromFile:
-                        daystr = (startDay + timedelta(days=idx)).strftime("%Y-%m-%d")
-                    else:
-                        daystr = item.get("time")
-                    if daystr:
-                        entry = table.get(daystr, {"date": daystr})
-                        entry.update(
-                            {
-                                "date": daystr,
-                                f"solar_production_{ch.replace('_', '')}": convertToKwh(
-                                    val=item.get("value") or None, unit=unit
-                                ),
-                            }
-                        )
-                        table.update({daystr: entry})
-                if showProgress:
-                    self._logger.info(
-                        "Received api %s solar_production_%s energy for period",
-                        self.apisession.nickname,
-                        ch.replace("_", ""),
-                    )
 
     # Add ev_charger stats for used energies
     if SolixDeviceType.EV_CHARGER.value in devTypes:
@@ -542,13 +611,10 @@ async def energy_daily(  # noqa: C901
                     )
                 ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay + timedelta(days=numDays - 1),
-                devType="ev_charger",
+            resp = await analysis(
+                "ev_charger",
+                startDay,
+                startDay + timedelta(days=numDays - 1),
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -579,22 +645,25 @@ async def energy_daily(  # noqa: C901
                 table.update({daystr: entry})
         # No additional useful data available in totals for now
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis("ev_charge", day, day)
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="ev_charge",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -644,13 +713,10 @@ async def energy_daily(  # noqa: C901
                     )
                 ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay + timedelta(days=numDays - 1),
-                devType="pps",
+            resp = await analysis(
+                "pps",
+                startDay,
+                startDay + timedelta(days=numDays - 1),
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -758,22 +824,25 @@ async def energy_daily(  # noqa: C901
             table["statistics"] = stats
         # No additional useful data available in totals for now
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis("pps", day, day)
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="pps",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -823,15 +892,12 @@ async def energy_daily(  # noqa: C901
                     )
                 ).get("data", {})
         else:
-            resp = await self.energy_analysis(
-                siteId=siteId,
-                deviceSn=deviceSn,
-                rangeType="week",
-                startDay=startDay,
-                endDay=startDay
+            resp = await analysis(
+                "solar_production",
+                startDay,
+                startDay
                 if justify_daytotals
                 else startDay + timedelta(days=numDays - 1),
-                devType="solar_production",
             )
         items = resp.get("power") or []
         # power unit is incorrectly wh, but values are kWh
@@ -862,22 +928,27 @@ async def energy_daily(  # noqa: C901
                 table.update({daystr: entry})
         # Solarbank charge and percentages are only received as total value for given interval. If requested, make daily queries for given interval
         if justify_daytotals and table:
-            for day in [
+            querydays = [
                 startDay + timedelta(days=x)
                 for x in range(min(len(items), numDays) if fromFile else numDays)
-            ]:
+            ]
+            # get the planned single day queries of the other days, since daily totals require single day queries
+            dayresp = (
+                {}
+                if fromFile
+                else {
+                    day.strftime("%Y-%m-%d"): await analysis(
+                        "solar_production", day, day
+                    )
+                    for day in querydays[1:]
+                }
+            )
+            for day in querydays:
                 daystr = day.strftime("%Y-%m-%d")
                 entry = table.get(daystr, {"date": daystr})
                 # update response only for real requests if not first day which was already queried
                 if not fromFile and day != startDay:
-                    resp = await self.energy_analysis(
-                        siteId=siteId,
-                        deviceSn=deviceSn,
-                        rangeType="week",
-                        startDay=day,
-                        endDay=day,
-                        devType="solar_production",
-                    )
+                    resp = dayresp.get(daystr) or {}
                     # get first item from breakdown list for single day queries
                     item = next(iter(resp.get("power") or []), {})
                     if daystr == item.get("time"):
@@ -1009,6 +1080,58 @@ async def energy_analysis(
     return resp.get("data") or {}
 
 
+def _analysis_queries(
+    devType: str,
+    startDay: datetime,
+    numDays: int,
+    dayTotals: bool = False,
+    fullRange: bool = False,
+) -> set[tuple[str, datetime, datetime]]:
+    """Get the energy analysis queries of a device type for the days, daily totals require single day queries, optionally after a full range query."""
+    days = [startDay + timedelta(days=x) for x in range(numDays)]
+    if not dayTotals:
+        return {(devType, days[0], days[-1])}
+    return {(devType, days[0], days[-1] if fullRange else days[0])} | {
+        (devType, day, day) for day in days[1:]
+    }
+
+
+async def energy_analysis_plan(
+    self: AnkerSolixApi,
+    siteId: str,
+    deviceSn: str,
+    queries: set[tuple[str, datetime, datetime]],
+) -> dict[tuple[str, datetime, datetime], dict]:
+    """Fetch Energy data for a set of device type and day range queries concurrently.
+
+    The number of concurrent queries is limited, the request scheduler of the session will further limit them within the request budget.
+    If a query fails, the pending queries are cancelled.
+    Example data:
+    {("solarbank", datetime(2023, 10, 1), datetime(2023, 10, 1)): {<energy_analysis data for day>}}
+    """
+    semaphore = Semaphore(SolixDefaults.ENERGY_QUERY_CONCURRENCY)
+
+    async def query(devType: str, start: datetime, end: datetime) -> dict:
+        async with semaphore:
+            return await self.energy_analysis(
+                siteId=siteId,
+                deviceSn=deviceSn,
+                rangeType="week",
+                startDay=start,
+                endDay=end,
+                devType=devType,
+            )
+
+    tasks = {q: create_task(query(*q)) for q in queries}
+    try:
+        await gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return {q: task.result() for q, task in tasks.items()}
+
+
 async def home_load_chart(
     self: AnkerSolixApi, siteId: str, deviceSn: str | None = None
 ) -> dict:
@@ -1180,28 +1303,70 @@ async def refresh_pv_forecast(
     endtime = (
         (now + timedelta(days=1)).replace(hour=0, minute=0).strftime("%Y-%m-%d %H:%M")
     )
-    remain_kwh = sum(
-        [
-            float(slot.get("power"))
-            for slot in trend
-            if fullhour <= str(slot.get("timestamp")) <= endtime
-            and str(slot.get("power")).replace(".", "", 1).isdigit()
-        ]
-    ) / (1 if "k" in str(unit).lower() else 1000)
-    # assume fraction of actual hour for remaing calculation
-    actual_kwh = (
-        sum(
-            [
-                float(slot.get("power"))
-                for slot in trend
-                if (now + timedelta(hours=1))
-                .replace(minute=0)
-                .strftime("%Y-%m-%d %H:%M")
-                == str(slot.get("timestamp"))
-                and str(slot.get("power")).replace(".", "", 1).isdigit()
-            ]
+    # trend sums change only with new trend data or the hour, reuse them until then
+    sumkey = (
+        now.strftime("%Y-%m-%d %H"),
+        fcdetails.get("poll_time"),
+        unit,
+        len(trend),
+    )
+    if not (sums := self.derived.get(siteId, "pv_forecast_sums", sumkey)):
+        thishour = (
+            (now + timedelta(hours=1)).replace(minute=0).strftime("%Y-%m-%d %H:%M")
+        )
+        today = now.replace(hour=0, minute=0).strftime("%Y-%m-%d %H:%M")
+        tomorrow = (
+            (now + timedelta(days=2))
+            .replace(hour=0, minute=0)
+            .strftime("%Y-%m-%d %H:%M")
         )
-    ) / (1 if "k" in str(unit).lower() else 1000)
+        factor = 1 if "k" in str(unit).lower() else 1000
+        sums = self.derived.set(
+            siteId,
+            "pv_forecast_sums",
+            {
+                "remain": sum(
+                    [
+                        float(slot.get("power"))
+                        for slot in trend
+                        if fullhour <= str(slot.get("timestamp")) <= endtime
+                        and str(slot.get("power")).replace(".", "", 1).isdigit()
+                    ]
+                )
+                / factor,
+                "actual": sum(
+                    [
+                        float(slot.get("power"))
+                        for slot in trend
+                        if thishour == str(slot.get("timestamp"))
+                        and str(slot.get("power")).replace(".", "", 1).isdigit()
+                    ]
+                )
+                / factor,
+                "today": sum(
+                    [
+                        float(slot.get("power"))
+                        for slot in trend
+                        if today < str(slot.get("timestamp")) <= endtime
+                        and str(slot.get("power")).replace(".", "", 1).isdigit()
+                    ]
+                )
+                / factor,
+                "tomorrow": sum(
+                    [
+                        float(slot.get("power"))
+                        for slot in trend
+                        if endtime < str(slot.get("timestamp")) <= tomorrow
+                        and str(slot.get("power")).replace(".", "", 1).isdigit()
+                    ]
+                )
+                / factor,
+            },
+            sumkey,
+        )
+    remain_kwh = sums["remain"]
+    # assume fraction of actual hour for remaing calculation
+    actual_kwh = sums["actual"]
     fcdetails["remaining_today"] = (
         (f"{remain_kwh + (actual_kwh * (60 - now.minute) / 60):.2f}") if trend else ""
     )
@@ -1275,38 +1440,14 @@ async def refresh_pv_forecast(
         else f"{sum([float(slot.get('power')) for slot in produced if str(slot.get('timestamp')) < ts and str(slot.get('power')).replace('.', '', 1).isdigit()]) / (1 if 'k' in unit.lower() else 1000):.2f}"
     )
     # calculate total forecast of today
-    daily_kwh = sum(
-        [
-            float(slot.get("power"))
-            for slot in trend
-            if now.replace(hour=0, minute=0).strftime("%Y-%m-%d %H:%M")
-            < str(slot.get("timestamp"))
-            <= (now + timedelta(days=1))
-            .replace(hour=0, minute=0)
-            .strftime("%Y-%m-%d %H:%M")
-            and str(slot.get("power")).replace(".", "", 1).isdigit()
-        ]
-    ) / (1 if "k" in unit.lower() else 1000)
+    daily_kwh = sums["today"]
     fcdetails["forecast_today"] = (
         (f"{daily_kwh + float(fcdetails.get('produced_initially')):.2f}")
         if trend
         else ""
     )
     # calculate available forecast of tomorrow (incomplete most of the time)
-    daily_kwh = sum(
-        [
-            float(slot.get("power"))
-            for slot in trend
-            if (now + timedelta(days=1))
-            .replace(hour=0, minute=0)
-            .strftime("%Y-%m-%d %H:%M")
-            < str(slot.get("timestamp"))
-            <= (now + timedelta(days=2))
-            .replace(hour=0, minute=0)
-            .strftime("%Y-%m-%d %H:%M")
-            and str(slot.get("power")).replace(".", "", 1).isdigit()
-        ]
-    ) / (1 if "k" in unit.lower() else 1000)
+    daily_kwh = sums["tomorrow"]
     fcdetails["forecast_tomorrow"] = f"{daily_kwh:.2f}" if trend else ""
     # update data in site energy details
     energy["pv_forecast_details"] = fcdetails
@@ -0,0 +1,209 @@
+"""Anker Power/Solix Cloud API class to store daily energy history of sites and devices locally."""
+
+from asyncio import Lock, to_thread
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import json
+import logging
+from pathlib import Path
+import sqlite3
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class AnkerSolixEnergyStore:
+    """Define the class to store daily energy table entries in a local SQLite database.
+
+    Days older than yesterday are final once stored with energy values and will be served locally.
+    Today, yesterday, future days and days without any energy values, e.g. from an incomplete cloud response, are mutable and always queried.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initialize."""
+        self._filename: Path = Path(filename)
+        self._connection: sqlite3.Connection | None = None
+        self._lock: Lock = Lock()
+        self._logger: logging.Logger = logger or _LOGGER
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __str__(self) -> str:
+        """Return the store file and statistics as string."""
+        return f"{self._filename.name}: {self.hits} stored days served, {self.misses} days queried"
+
+    @property
+    def filename(self) -> Path:
+        """Get the database file name."""
+        return self._filename
+
+    @staticmethod
+    def scope(query: str, **options: bool | set | None) -> str:
+        """Get a stable scope string for the query and its options that define the content of the table entries."""
+        return ";".join(
+            [
+                query,
+                *(
+                    f"{k}={','.join(sorted(v)) if isinstance(v, set) else v or ''}"
+                    for k, v in sorted(options.items())
+                ),
+            ]
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database connection and create the table if required."""
+        if not self._connection:
+            self._filename.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self._filename, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS energy_daily ("
+                "scope TEXT NOT NULL, site_id TEXT NOT NULL, device_sn TEXT NOT NULL, day TEXT NOT NULL, "
+                "final INTEGER NOT NULL, data TEXT NOT NULL, updated TEXT NOT NULL, "
+                "PRIMARY KEY (scope, site_id, device_sn, day))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _load(self, key: tuple[str, str, str], first: str, last: str) -> dict:
+        """Load final day entries of the key within the given day range."""
+        return {
+            day: json.loads(data)
+            for day, data in self._connect().execute(
+                "SELECT day, data FROM energy_daily WHERE scope = ? AND site_id = ? AND device_sn = ? "
+                "AND day BETWEEN ? AND ? AND final = 1",
+                (*key, first, last),
+            )
+        }
+
+    @staticmethod
+    def has_values(entry: dict) -> bool:
+        """Check whether a day entry contains at least one energy value."""
+        return any(
+            value not in [None, ""] for key, value in entry.items() if key != "date"
+        )
+
+    def _save(self, key: tuple[str, str, str], entries: dict, final: str) -> None:
+        """Save day entries of the key and mark days with values before the final limit as final."""
+        updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO energy_daily VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        *key,
+                        day,
+                        int(day < final and self.has_values(entry)),
+                        json.dumps(entry),
+                        updated,
+                    )
+                    for day, entry in entries.items()
+                ],
+            )
+
+    def _delete(self, siteId: str | None = None, mutable: bool = False) -> None:
+        """Delete all entries or only the entries of the given site, optionally only mutable entries."""
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM energy_daily WHERE (? IS NULL OR site_id = ?) AND (? = 0 OR final = 0)",
+                (siteId or None, siteId or None, int(mutable)),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    async def clear(self, siteId: str | None = None, mutable: bool = False) -> None:
+        """Clear the stored energy history for all or the given site, optionally only the mutable days while keeping the final days."""
+        async with self._lock:
+            await to_thread(self._delete, siteId, mutable)
+
+    async def energy_daily(
+        self,
+        fetch: Callable[..., Awaitable[dict]],
+        scope: str,
+        siteId: str,
+        deviceSn: str | None = None,
+        startDay: datetime | None = None,
+        numDays: int = 1,
+        tzOffset: float = 0,
+        **kwargs,
+    ) -> dict:
+        """Get the daily energy table from stored final days and fetch only missing or mutable day ranges.
+
+        The scope must identify the query type and options that define the content of the table entries.
+        The time zone offset in seconds of the site to the host defines the actual day of the site.
+        Table keys that are no days, like total statistics, are passed through from the last fetch.
+        """
+        startDay = startDay or datetime.today()
+        numDays = min(366, max(1, numDays))
+        days = [
+            (startDay + timedelta(days=x)).strftime("%Y-%m-%d") for x in range(numDays)
+        ]
+        key = (str(scope), str(siteId), str(deviceSn or ""))
+        # days before yesterday of the site are considered final in the cloud
+        final = (
+            datetime.now() + timedelta(seconds=tzOffset) - timedelta(days=1)
+        ).strftime("%Y-%m-%d")
+        async with self._lock:
+            try:
+                table = await to_thread(self._load, key, days[0], days[-1])
+            except sqlite3.Error as err:
+                self._logger.warning(
+                    "Energy store %s error loading entries: %s", self._filename, err
+                )
+                table = {}
+        # combine missing days to consecutive ranges for queries
+        ranges: list[list[str]] = []
+        for day in [d for d in days if d not in table]:
+            if ranges and (
+                datetime.strptime(day, "%Y-%m-%d")
+                - datetime.strptime(ranges[-1][-1], "%Y-%m-%d")
+            ) == timedelta(days=1):
+                ranges[-1].append(day)
+            else:
+                ranges.append([day])
+        self.hits += len(table)
+        self.misses += sum(len(r) for r in ranges)
+        if ranges:
+            self._logger.debug(
+                "Energy store %s serving %s stored days, querying %s day ranges for site %s%s",
+                self._filename.name,
+                len(table),
+                len(ranges),
+                siteId,
+                f" device {deviceSn}" if deviceSn else "",
+            )
+        extra: dict = {}
+        for r in ranges:
+            data = await fetch(
+                siteId=siteId,
+                startDay=datetime.strptime(r[0], "%Y-%m-%d"),
+                numDays=len(r),
+                **({"deviceSn": deviceSn} if deviceSn is not None else {}),
+                **kwargs,
+            )
+            entries = {day: entry for day, entry in data.items() if day in r}
+            extra.update(
+                {
+                    k: v
+                    for k, v in data.items()
+                    if not (isinstance(v, dict) and "date" in v)
+                }
+            )
+            table.update(entries)
+            if entries:
+                async with self._lock:
+                    try:
+                        await to_thread(self._save, key, entries, final)
+                    except sqlite3.Error as err:
+                        self._logger.warning(
+                            "Energy store %s error saving entries: %s",
+                            self._filename,
+                            err,
+                        )
+        return {day: table[day] for day in days if day in table} | extra
@@ -11,10 +11,11 @@ Furthermore the API class can use the json files for debugging and testing of va
 import asyncio
 from base64 import b64encode
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 from copy import deepcopy
 from datetime import datetime, timedelta
-from functools import partial
+from functools import cache, partial
 import json
 import logging
 import logging.handlers
@@ -22,10 +23,13 @@ import os
 from pathlib import Path
 import queue
 import random
+import re
 import shutil
 import string
 import tempfile
+import threading
 from typing import Any
+import zipfile
 
 import aiofiles
 from aiohttp.client_exceptions import ClientError
@@ -37,17 +41,53 @@ from .apitypes import (
     API_FILEPREFIXES,
     API_HES_SVC_ENDPOINTS,
     ApiEndpointServices,
+    SolixDefaults,
     SolixPriceProvider,
     SolixVehicle,
 )
-from .helpers import get_solix_product_code
+from .helpers import LoopStallMonitor, get_solix_product_code
 from .mqtt import AnkerSolixMqttSession
 from .mqttcmdmap import COMMAND_LIST, COMMAND_NAME, SolixMqttCommands
 from .mqttmap import SOLIXMQTTMAP
+from .mqttrecorder import AnkerSolixMqttRecorder
 from .mqtttypes import DeviceHexData
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 VERSION: str = "3.7.1.0"
+# key name fragments with values that must be randomized
+SENSITIVE_KEYS: re.Pattern = re.compile(
+    "|".join(
+        re.escape(x)
+        for x in [
+            "_sn",
+            "Sn",
+            "site_id",
+            "station_id",
+            "stationId",
+            "user_id",
+            "member_id",
+            "vehicle_id",
+            "trace_id",
+            "bt_ble_",
+            "wifi_name",
+            "ssid",
+            "home_load_data",
+            "param_data",
+            "device_name",
+            "token",
+            "email",
+            "_password",
+            "_mac",
+            "err_msg",
+        ]
+    )
+)
+
+
+@cache
+def is_sensitive_key(key: str) -> bool:
+    """Check if the value of the key name must be randomized."""
+    return key == "sn" or bool(SENSITIVE_KEYS.search(key))
 
 
 class AnkerSolixApiExport:
@@ -80,11 +120,35 @@ class AnkerSolixApiExport:
         self.mqttdata: bool = False
         self.zipped: bool = True
         self.zipfilename: str | None = None
+        self.keep_folder: bool = True
         self.request_delay: float | None = None
+        self.progress: Callable[[int, str], None] | None = None
+        # number of files saved during export
+        self.exported: int = 0
+        # pending background tasks that save prepared files
+        self._pending: set[asyncio.Task] = set()
+        # running submitted queries and the first error of a submitted query
+        self._queries: set[asyncio.Task] = set()
+        self._query_error: BaseException | None = None
+        # worker thread for randomization and serialization of export data
+        self._executor: ThreadPoolExecutor | None = None
+        # lock to protect the random mapping that is shared between event loop and worker thread
+        self._randomlock: threading.RLock = threading.RLock()
+        # event loop stall statistics of the last export run, logged to the export log
+        self.loop_stall: LoopStallMonitor = LoopStallMonitor()
+        self._zipfile: zipfile.ZipFile | None = None
+        self._ziplock: asyncio.Lock = asyncio.Lock()
+        # files streamed into the zipfile and files that changed after streaming
+        self._zipped: set[str] = set()
+        self._zipstale: set[str] = set()
         self._randomdata: dict = {}
         self._loop: asyncio.AbstractEventLoop
         self._mqtt_msg_types: set = set()
+        # received MQTT message types per device serial
+        self._mqtt_received: dict[str, set] = {}
+        self._recorder: AnkerSolixMqttRecorder | None = None
         self._hexserials: dict = {}
+        self._hexpattern: re.Pattern | None = None
         self._old_callback: Callable | None = None
 
         # initialize logger for object
@@ -104,8 +168,15 @@ class AnkerSolixApiExport:
         mqttdata: bool = False,
         zipped: bool = True,
         toggle_cache: Callable | None = None,
+        progress: Callable[[int, str], None] | None = None,
+        keep_folder: bool = True,
     ) -> bool:
-        """Run main function to export account data."""
+        """Run main function to export account data.
+
+        Queries whose response is not needed for further queries are submitted to run concurrently within the request delay of the client session.
+        Saved files are streamed into the optional zipfile while the export is running. The folder files are needed to re-import the randomized cache and are removed after zipping unless the folder should be kept.
+        The optional progress callable receives the number of saved files and the last saved file name.
+        """
 
         if not export_path:
             # default to exports self.export_path in parent path of api library
@@ -138,6 +209,14 @@ class AnkerSolixApiExport:
         self.mqttdata = mqttdata if isinstance(mqttdata, bool) else False
         self.zipped = zipped if isinstance(randomized, bool) else True
         toggle_cache = toggle_cache if callable(toggle_cache) else None
+        self.progress = progress if callable(progress) else None
+        self.keep_folder = keep_folder if isinstance(keep_folder, bool) else True
+        self.exported = 0
+        self._pending = set()
+        self._queries = set()
+        self._query_error = None
+        self._zipped = set()
+        self._zipstale = set()
         self._randomdata = {}
         self._loop = asyncio.get_running_loop()
 
@@ -155,10 +234,33 @@ class AnkerSolixApiExport:
             if self.export_path.exists():
                 await self._loop.run_in_executor(None, shutil.rmtree, self.export_path)
             Path(self.export_path).mkdir(parents=True, exist_ok=True)
+            # open the zipfile to stream saved files while exporting
+            if self.zipped:
+                self.zipfilename = (
+                    "_".join(
+                        [
+                            str(self.export_path),
+                            datetime.now().strftime("%Y-%m-%d_%H%M"),
+                        ]
+                    )
+                    + ".zip"
+                )
+                self._zipfile = await self._loop.run_in_executor(
+                    None,
+                    partial(
+                        zipfile.ZipFile,
+                        self.zipfilename,
+                        mode="w",
+                        compression=zipfile.ZIP_DEFLATED,
+                    ),
+                )
+            else:
+                self.zipfilename = None
         except OSError as err:
             self._logger.error(
                 "Unable to clear or create export folder %s: %s", self.export_path, err
             )
+            self.zipfilename = None
             return False
 
         self._logger.info(
@@ -192,6 +294,12 @@ class AnkerSolixApiExport:
             listener = logging.handlers.QueueListener(que, fh)
             # start the listener
             listener.start()
+            # log event loop stall statistics of the export run, monitoring is stopped in any case when leaving
+            self.loop_stall.start()
+            # create single worker to keep randomization order of exported files
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="anker_solix_export"
+            )
 
             self._logger.info(
                 "Using AnkerSolixApiExport Version: %s, Date: %s, Export Services: %s, MQTT Messages: %s",
@@ -234,6 +342,8 @@ class AnkerSolixApiExport:
                 # Wait until optional MQTT task is finished
                 if self.mqttdata and mqtttask:
                     await mqtttask
+                # ensure all exported files are saved before they are imported again
+                await self._flush()
                 # update api dictionaries from exported files to use randomized input data
                 # this is more efficient and allows validation of randomized data in export files
                 # save real api cache data first
@@ -304,12 +414,14 @@ class AnkerSolixApiExport:
                     self.api_power.account,
                     skip_randomize=True,
                 )
+                await self._flush()
                 # Print stats
                 self._logger.info(
                     "Api %s request stats: %s",
                     self.client.nickname,
                     self.client.request_count,
                 )
+                self._logger.info("Event loop stats: %s", self.loop_stall)
 
                 # restore real client cache data for re-use of sites and devices in other Api services
                 self.api_power.clearCaches()
@@ -352,33 +464,19 @@ class AnkerSolixApiExport:
                         self.export_path,
                     )
 
-                # Optionally zip the output
-                if self.zipped:
-                    zipname = "_".join(
-                        [
-                            str(self.export_path),
-                            datetime.now().strftime("%Y-%m-%d_%H%M"),
-                        ]
-                    )
-                    self.zipfilename = zipname + ".zip"
-                    self._logger.info("\nZipping output folder to %s", self.zipfilename)
+                # Optionally complete the zipfile with remaining files of the folder
+                if self._zipfile:
+                    self._logger.info("\nCompleting zipfile %s", self.zipfilename)
                     self._logger.info(
                         "Zipfile created: %s",
-                        await self._loop.run_in_executor(
-                            None,
-                            partial(
-                                shutil.make_archive,
-                                base_name=zipname,
-                                format="zip",
-                                root_dir=Path(self.export_path).parent,
-                                base_dir=Path(self.export_path).name,
-                            ),
-                        ),
+                        await self._loop.run_in_executor(None, self._complete_zip),
                     )
-                else:
-                    self.zipfilename = None
+                    if not self.keep_folder:
+                        await self._loop.run_in_executor(
+                            None, shutil.rmtree, self.export_path
+                        )
 
-        except errors.AnkerSolixError as err:
+        except (errors.AnkerSolixError, OSError) as err:
             self._logger.error("%s: %s", type(err), err)
             return False
         else:
@@ -386,6 +484,22 @@ class AnkerSolixApiExport:
         finally:
             # ensure the listener is closed
             listener.stop()
+            # ensure submitted queries and pending file saves are cancelled and an incomplete zipfile is removed
+            self._cancel_queries()
+            await asyncio.gather(*self._queries, return_exceptions=True)
+            for task in self._pending:
+                task.cancel()
+            await asyncio.gather(*self._pending, return_exceptions=True)
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            await self.loop_stall.stop()
+            if self._zipfile:
+                self._zipfile.close()
+                self._zipfile = None
+                with contextlib.suppress(OSError):
+                    Path(self.zipfilename).unlink()
+                self.zipfilename = None
             # ensure optional MQTT task is closed
             if mqtttask:
                 mqtttask.cancel()
@@ -454,38 +568,38 @@ class AnkerSolixApiExport:
                 catch=False,
             )
             self._logger.info("Exporting message unread status...")
-            await self.query(
+            await self.submit(
                 method="get",
                 endpoint=API_ENDPOINTS["get_message_unread"],
                 filename=f"{API_FILEPREFIXES['get_message_unread']}.json",
             )
             self._logger.info("Exporting currency list...")
-            await self.query(
+            await self.submit(
                 method="post",
                 endpoint=API_ENDPOINTS["get_currency_list"],
                 filename=f"{API_FILEPREFIXES['get_currency_list']}.json",
             )
             self._logger.info("Exporting supported sites, devices and accessories...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["site_rules"],
                 filename=f"{API_FILEPREFIXES['site_rules']}.json",
             )
-            await self.query(
+            await self.submit(
                 method="get",
                 endpoint=API_ENDPOINTS["get_product_categories"],
                 filename=f"{API_FILEPREFIXES['get_product_categories']}.json",
             )
-            await self.query(
+            await self.submit(
                 method="get",
                 endpoint=API_ENDPOINTS["get_product_accessories"],
                 filename=f"{API_FILEPREFIXES['get_product_accessories']}.json",
             )
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_third_platforms"],
                 filename=f"{API_FILEPREFIXES['get_third_platforms']}.json",
             )
             self._logger.info("Get dynamic price sites for user account...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_dynamic_price_sites"],
                 filename=f"{API_FILEPREFIXES['get_dynamic_price_sites']}.json",
             )
@@ -525,7 +639,7 @@ class AnkerSolixApiExport:
                     "Exporting dynamic price details for %s...",
                     provider,
                 )
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_dynamic_price_details"],
                     filename=f"{API_FILEPREFIXES['get_dynamic_price_details']}_{str(provider).replace('/', '_')}.json",
                     payload={
@@ -601,7 +715,7 @@ class AnkerSolixApiExport:
                             if vehicle.productive_year in items
                             else random.choice(items)
                         )
-                        await self.query(
+                        await self.submit(
                             endpoint=API_ENDPOINTS["get_vehicle_year_attributes"],
                             filename=f"{API_FILEPREFIXES['get_vehicle_year_attributes']}_{brand.replace(' ', '_')}_{model.replace(' ', '_')}_{year!s}.json",
                             payload={
@@ -612,7 +726,7 @@ class AnkerSolixApiExport:
                         )
             # get OCCP endpoint list
             self._logger.info("Exporting OCPP endpoints...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_ocpp_endpoint_list"],
                 filename=f"{API_FILEPREFIXES['get_ocpp_endpoint_list']}.json",
             )
@@ -620,21 +734,23 @@ class AnkerSolixApiExport:
             # loop through all found sites
             for siteId in self.api_power.sites:
                 self._logger.info("Exporting scene info...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["scene_info"],
                     filename=f"{API_FILEPREFIXES['scene_info']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
                     replace=[(siteId, "<siteId>")],
                 )
                 self._logger.info("Exporting CO2 ranking...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_co2_ranking"],
                     filename=f"{API_FILEPREFIXES['get_co2_ranking']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
                     replace=[(siteId, "<siteId>")],
                 )
+            await self._join()
 
         except (errors.AnkerSolixError, ClientError) as err:
+            self._cancel_queries()
             if isinstance(err, ClientError):
                 self._logger.warning(
                     "Connection problems or common endpoint data queries may not be supported on used server: %s",
@@ -662,24 +778,24 @@ class AnkerSolixApiExport:
             )
             self._logger.info("Exporting user devices...")
             # shows only owner devices
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["user_devices"],
                 filename=f"{API_FILEPREFIXES['user_devices']}.json",
             )
             self._logger.info("Exporting charging devices...")
             # shows only owner devices
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["charging_devices"],
                 filename=f"{API_FILEPREFIXES['charging_devices']}.json",
             )
             self._logger.info("Exporting auto upgrade settings...")
             # shows only owner devices
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_auto_upgrade"],
                 filename=f"{API_FILEPREFIXES['get_auto_upgrade']}.json",
             )
             self._logger.info("Exporting config...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_config"],
                 filename=f"{API_FILEPREFIXES['get_config']}.json",
             )
@@ -689,7 +805,7 @@ class AnkerSolixApiExport:
                 filename=f"{API_FILEPREFIXES['get_token_by_userid']}.json",
             )
             self._logger.info("Get Shelly status with token...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_shelly_status"],
                 filename=f"{API_FILEPREFIXES['get_shelly_status']}.json",
                 # use real token from previous response for query
@@ -698,12 +814,12 @@ class AnkerSolixApiExport:
                 },
             )
             self._logger.info("Exporting extender system OTA info...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_extender_system_pn_ota"],
                 filename=f"{API_FILEPREFIXES['get_extender_system_pn_ota']}.json",
             )
             self._logger.info("Exporting extender system list...")
-            await self.query(
+            await self.submit(
                 endpoint=API_ENDPOINTS["get_extender_system_list"],
                 filename=f"{API_FILEPREFIXES['get_extender_system_list']}.json",
             )
@@ -718,7 +834,7 @@ class AnkerSolixApiExport:
                 power_site_type = site.get("power_site_type")
                 self._logger.info("Exporting site detail...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["site_detail"],
                     filename=f"{API_FILEPREFIXES['site_detail']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
@@ -727,7 +843,7 @@ class AnkerSolixApiExport:
                 )
                 self._logger.info("Exporting wifi list...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["wifi_list"],
                     filename=f"{API_FILEPREFIXES['wifi_list']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
@@ -735,7 +851,7 @@ class AnkerSolixApiExport:
                     admin=admin,
                 )
                 self._logger.info("Exporting installation...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_installation"],
                     filename=f"{API_FILEPREFIXES['get_installation']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
@@ -743,7 +859,7 @@ class AnkerSolixApiExport:
                 )
                 self._logger.info("Exporting site power limit...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_site_power_limit"],
                     filename=f"{API_FILEPREFIXES['get_site_power_limit']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId},
@@ -752,7 +868,7 @@ class AnkerSolixApiExport:
                 )
                 self._logger.info("Exporting site price...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_site_price"],
                     filename=f"{API_FILEPREFIXES['get_site_price']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"site_id": siteId, "accuracy": 5},
@@ -762,14 +878,14 @@ class AnkerSolixApiExport:
                 # Additional exports for site types supporting AI mode
                 if power_site_type in [12, 14, 18]:
                     self._logger.info("Exporting site forecast schedule...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_forecast_schedule"],
                         filename=f"{API_FILEPREFIXES['get_forecast_schedule']}_{self._randomize(siteId, 'site_id')}.json",
                         payload={"site_id": siteId},
                         replace=[(siteId, "<siteId>")],
                     )
                     self._logger.info("Exporting AI EMS status...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_ai_ems_status"],
                         filename=f"{API_FILEPREFIXES['get_ai_ems_status']}_{self._randomize(siteId, 'site_id')}.json",
                         payload={"site_id": siteId},
@@ -812,7 +928,7 @@ class AnkerSolixApiExport:
                         "Exporting device parameter type %s settings...", parmtype
                     )
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_parm"],
                         filename=f"{API_FILEPREFIXES['get_device_parm']}_{parmtype}_{self._randomize(siteId, 'site_id')}.json",
                         payload={"site_id": siteId, "param_type": parmtype},
@@ -833,7 +949,7 @@ class AnkerSolixApiExport:
                         stat_type.upper(),
                     )
                     # Day Totals
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["energy_analysis"],
                         filename=f"{API_FILEPREFIXES['energy_' + stat_type]}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -849,7 +965,7 @@ class AnkerSolixApiExport:
                         replace=[(siteId, "<siteId>")],
                     )
                     # Intraday
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["energy_analysis"],
                         filename=f"{API_FILEPREFIXES['energy_' + stat_type]}_today_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -893,7 +1009,7 @@ class AnkerSolixApiExport:
                             stat_type.upper(),
                         )
                         for sn in devs:
-                            await self.query(
+                            await self.submit(
                                 endpoint=API_ENDPOINTS["energy_analysis"],
                                 filename=f"{API_FILEPREFIXES['energy_' + stat_type]}_{self._randomize(sn, 'device_sn')}_{self._randomize(siteId, 'site_id')}.json",
                                 payload={
@@ -952,7 +1068,7 @@ class AnkerSolixApiExport:
 
                 if device.get("type") == api.SolixDeviceType.SOLARBANK.value:
                     self._logger.info("Exporting solar info settings for solarbank...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["solar_info"],
                         filename=f"{API_FILEPREFIXES['solar_info']}_{self._randomize(sn, '_sn')}.json",
                         payload={"solarbank_sn": sn},
@@ -961,14 +1077,14 @@ class AnkerSolixApiExport:
                     self._logger.info(
                         "Exporting compatible process info for solarbank..."
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["compatible_process"],
                         filename=f"{API_FILEPREFIXES['compatible_process']}_{self._randomize(sn, '_sn')}.json",
                         payload={"solarbank_sn": sn},
                         replace=[(siteId, "<siteId>"), (sn, "<deviceSn>")],
                     )
                     self._logger.info("Exporting device income for solarbank...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_income"],
                         filename=f"{API_FILEPREFIXES['get_device_income']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn, "start_time": "00:00"},
@@ -977,7 +1093,7 @@ class AnkerSolixApiExport:
 
                 self._logger.info("Exporting power cutoff settings...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_cutoff"],
                     filename=f"{API_FILEPREFIXES['get_cutoff']}_{self._randomize(sn, '_sn')}.json",
                     payload={"site_id": siteId, "device_sn": sn},
@@ -986,7 +1102,7 @@ class AnkerSolixApiExport:
                 )
                 self._logger.info("Exporting fittings...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_device_fittings"],
                     filename=f"{API_FILEPREFIXES['get_device_fittings']}_{self._randomize(sn, '_sn')}.json",
                     payload={"site_id": siteId, "device_sn": sn},
@@ -995,7 +1111,7 @@ class AnkerSolixApiExport:
                 )
                 self._logger.info("Exporting load...")
                 # works only for site owners
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_device_load"],
                     filename=f"{API_FILEPREFIXES['get_device_load']}_{self._randomize(sn, '_sn')}.json",
                     payload={"site_id": siteId, "device_sn": sn},
@@ -1012,14 +1128,14 @@ class AnkerSolixApiExport:
                 #     admin=admin,
                 # )
                 self._logger.info("Exporting upgrade record for device...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_upgrade_record"],
                     filename=f"{API_FILEPREFIXES['get_upgrade_record']}_1_{self._randomize(sn, '_sn')}.json",
                     payload={"device_sn": sn, "type": 1},
                     replace=[(siteId, "<siteId>"), (sn, "<deviceSn>")],
                 )
                 self._logger.info("Exporting device attributes...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_device_attributes"],
                     filename=f"{API_FILEPREFIXES['get_device_attributes']}_{self._randomize(sn, '_sn')}.json",
                     # TODO: Empty attributes list will not list any attributes, possible attributes and devices are unknown yet
@@ -1045,7 +1161,7 @@ class AnkerSolixApiExport:
                     admin=admin,
                 )
                 self._logger.info("Exporting device tamper records...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_tamper_records"],
                     filename=f"{API_FILEPREFIXES['get_tamper_records']}_{self._randomize(sn, '_sn')}.json",
                     payload={
@@ -1057,7 +1173,7 @@ class AnkerSolixApiExport:
                     admin=admin,
                 )
                 self._logger.info("Exporting device group...")
-                await self.query(
+                await self.submit(
                     endpoint=API_ENDPOINTS["get_device_group"],
                     filename=f"{API_FILEPREFIXES['get_device_group']}_{self._randomize(sn, '_sn')}.json",
                     payload={"device_sn": sn},
@@ -1068,7 +1184,7 @@ class AnkerSolixApiExport:
                 # export EV charger status and statistics
                 if device.get("type") == api.SolixDeviceType.EV_CHARGER.value:
                     self._logger.info("Exporting EV charger RFID cards...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_rfid_cards"],
                         filename=f"{API_FILEPREFIXES['get_device_rfid_cards']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
@@ -1078,7 +1194,7 @@ class AnkerSolixApiExport:
                     self._logger.info("Exporting EV charger order statistics...")
                     # TODO: Update order status types once known, may have to be limited for time range
                     for stat_type in ["week", "all"]:
-                        await self.query(
+                        await self.submit(
                             endpoint=API_ENDPOINTS["get_device_charge_order_stats"],
                             filename=f"{API_FILEPREFIXES['get_device_charge_order_stats']}_{'today' if stat_type == 'week' else stat_type}_{self._randomize(sn, '_sn')}.json",
                             payload={
@@ -1096,7 +1212,7 @@ class AnkerSolixApiExport:
                     self._logger.info("Exporting EV charger order statistics list...")
                     for stat_type in [1]:
                         # TODO: Update order status types once known, may have to be limited for time range
-                        await self.query(
+                        await self.submit(
                             endpoint=API_ENDPOINTS[
                                 "get_device_charge_order_stats_list"
                             ],
@@ -1113,7 +1229,7 @@ class AnkerSolixApiExport:
                             replace=[(sn, "<deviceSn>")],
                         )
                     self._logger.info("Exporting EV charger OCPP info...")
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_ocpp_info"],
                         filename=f"{API_FILEPREFIXES['get_device_ocpp_info']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
@@ -1127,19 +1243,19 @@ class AnkerSolixApiExport:
                         device.get("name", ""),
                         self._randomize(sn, "_sn"),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_pv_status"],
                         filename=f"{API_FILEPREFIXES['get_device_pv_status']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sns": sn},
                         replace=[(sn, "<deviceSn>")],
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_pv_total_statistics"],
                         filename=f"{API_FILEPREFIXES['get_device_pv_total_statistics']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sn": sn},
                         replace=[(sn, "<deviceSn>")],
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_pv_price"],
                         filename=f"{API_FILEPREFIXES['get_device_pv_price']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sn": sn},
@@ -1151,7 +1267,7 @@ class AnkerSolixApiExport:
                         self._randomize(sn, "_sn"),
                     )
                     # inverter energy statistic
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_pv_statistics"],
                         filename=f"{API_FILEPREFIXES['get_device_pv_statistics']}_today_{self._randomize(sn, '_sn')}.json",
                         payload={
@@ -1163,7 +1279,7 @@ class AnkerSolixApiExport:
                         },
                         replace=[(sn, "<deviceSn>")],
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["get_device_pv_statistics"],
                         filename=f"{API_FILEPREFIXES['get_device_pv_statistics']}_{self._randomize(sn, '_sn')}.json",
                         payload={
@@ -1185,7 +1301,7 @@ class AnkerSolixApiExport:
                         screensavers = True
                         for model in ["A2345"]:
                             self._logger.info("Exporting screensavers for model '%s'...", model)
-                            await self.query(
+                            await self.submit(
                                 endpoint=API_ENDPOINTS["charger_get_screensavers"],
                                 filename=f"{API_FILEPREFIXES['charger_get_screensavers']}_{model}.json",
                                 payload={"product_code": model},
@@ -1196,50 +1312,52 @@ class AnkerSolixApiExport:
                         device.get("name", ""),
                         self._randomize(sn, "_sn"),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_manual_screensavers"],
                         filename=f"{API_FILEPREFIXES['charger_get_manual_screensavers']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_charging_modes"],
                         filename=f"{API_FILEPREFIXES['charger_get_charging_modes']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_triggers"],
                         filename=f"{API_FILEPREFIXES['charger_get_triggers']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_device_setting"],
                         filename=f"{API_FILEPREFIXES['charger_get_device_setting']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_port_remarks"],
                         filename=f"{API_FILEPREFIXES['charger_get_port_remarks']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_ENDPOINTS["charger_get_protocol_status"],
                         filename=f"{API_FILEPREFIXES['charger_get_protocol_status']}_{self._randomize(sn, '_sn')}.json",
                         payload={"device_sn": sn},
                         replace=[(sn, "<deviceSn>")],
                         admin=admin,
                     )
+            await self._join()
 
         except (errors.AnkerSolixError, ClientError) as err:
+            self._cancel_queries()
             if isinstance(err, ClientError):
                 self._logger.warning(
                     "%s endpoint data queries may not be supported on used server: %s",
@@ -1281,7 +1399,7 @@ class AnkerSolixApiExport:
                 )
 
                 self._logger.info("Exporting Charging system running info...")
-                await self.query(
+                await self.submit(
                     endpoint=API_CHARGING_ENDPOINTS["get_system_running_info"],
                     filename=f"{API_FILEPREFIXES['charging_get_system_running_info']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
@@ -1311,7 +1429,7 @@ class AnkerSolixApiExport:
                         "Exporting Charging site energy data for %s...",
                         stat_type.upper(),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["energy_statistics"],
                         filename=f"{API_FILEPREFIXES['charging_energy_' + stat_type]}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -1334,7 +1452,7 @@ class AnkerSolixApiExport:
                         "Exporting Charging site energy data of today for %s...",
                         stat_type.upper(),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["energy_statistics"],
                         filename=f"{API_FILEPREFIXES['charging_energy_' + stat_type + '_today']}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -1352,7 +1470,7 @@ class AnkerSolixApiExport:
                 self._logger.info("Exporting Charging site device data report...")
                 # check all control options
                 for ctrol in [0, 1]:
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["report_device_data"],
                         filename=f"{API_FILEPREFIXES['charging_report_device_data']}_{ctrol}_{self._randomize(siteId, 'site_id')}.json",
                         payload={"siteIds": [siteId], "ctrol": ctrol, "duration": 300},
@@ -1361,7 +1479,7 @@ class AnkerSolixApiExport:
 
                 # Get site device disaster information
                 self._logger.info("Exporting Charging site device disaster data...")
-                await self.query(
+                await self.submit(
                     endpoint=API_CHARGING_ENDPOINTS["get_disaster_support_func"],
                     filename=f"{API_FILEPREFIXES['charging_get_disaster_support_func']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={
@@ -1371,7 +1489,7 @@ class AnkerSolixApiExport:
                     replace=[(siteId, "<siteId>")],
                     admin=admin,
                 )
-                await self.query(
+                await self.submit(
                     endpoint=API_CHARGING_ENDPOINTS["get_site_device_disaster"],
                     filename=f"{API_FILEPREFIXES['charging_get_site_device_disaster']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={
@@ -1381,7 +1499,7 @@ class AnkerSolixApiExport:
                     replace=[(siteId, "<siteId>")],
                     admin=admin,
                 )
-                await self.query(
+                await self.submit(
                     endpoint=API_CHARGING_ENDPOINTS["get_site_device_disaster_status"],
                     filename=f"{API_FILEPREFIXES['charging_get_site_device_disaster_status']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={
@@ -1400,6 +1518,7 @@ class AnkerSolixApiExport:
                     "No system for %s endpoint data found, skipping device queries...",
                     ApiEndpointServices.charging,
                 )
+                await self._join()
                 return True
 
             # loop through all devices
@@ -1421,7 +1540,7 @@ class AnkerSolixApiExport:
                 ]:
                     self._logger.info("Exporting %s monetary units...", dev_type)
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["get_monetary_units"],
                         filename=f"{API_FILEPREFIXES['charging_get_monetary_units']}_{self._randomize(sn, '_sn')}.json",
                         payload={"siteId": siteId, "sn": sn},
@@ -1430,7 +1549,7 @@ class AnkerSolixApiExport:
                     )
                     self._logger.info("Exporting %s configs...", dev_type)
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["get_configs"],
                         filename=f"{API_FILEPREFIXES['charging_get_configs']}_{self._randomize(sn, '_sn')}.json",
                         payload={
@@ -1443,7 +1562,7 @@ class AnkerSolixApiExport:
                     )
                     self._logger.info("Exporting %s utility rate plan...", dev_type)
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["get_utility_rate_plan"],
                         filename=f"{API_FILEPREFIXES['charging_get_utility_rate_plan']}_{self._randomize(sn, '_sn')}.json",
                         payload={
@@ -1474,7 +1593,7 @@ class AnkerSolixApiExport:
                             "Exporting %s attached device serials...", dev_type
                         )
                         # works only for site owners
-                        await self.query(
+                        await self.submit(
                             endpoint=API_CHARGING_ENDPOINTS["get_sns"],
                             filename=f"{API_FILEPREFIXES['charging_get_sns']}_{self._randomize(sn, '_sn')}.json",
                             payload={"main_sn": sn, "macs": macs},
@@ -1493,7 +1612,7 @@ class AnkerSolixApiExport:
                 ]:
                     self._logger.info("Exporting %s wifi info...", dev_type)
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["get_wifi_info"],
                         filename=f"{API_FILEPREFIXES['charging_get_wifi_info']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sn": sn},
@@ -1504,7 +1623,7 @@ class AnkerSolixApiExport:
                         "Exporting %s installation inspection...", dev_type
                     )
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_CHARGING_ENDPOINTS["get_installation_inspection"],
                         filename=f"{API_FILEPREFIXES['charging_get_installation_inspection']}_{self._randomize(sn, '_sn')}.json",
                         # siteId + sn payload verified on A17B1 owner account
@@ -1512,8 +1631,10 @@ class AnkerSolixApiExport:
                         replace=[(siteId, "<siteId>"), (sn, "<deviceSn>")],
                         admin=admin,
                     )
+            await self._join()
 
         except (errors.AnkerSolixError, ClientError) as err:
+            self._cancel_queries()
             if isinstance(err, ClientError):
                 self._logger.warning(
                     "%s endpoint data queries may not be supported on used server: %s",
@@ -1573,7 +1694,7 @@ class AnkerSolixApiExport:
                 if is_hes:
                     has_hes = True
                 self._logger.info("Exporting HES monetary units...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_monetary_units"],
                     filename=f"{API_FILEPREFIXES['hes_get_monetary_units']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
@@ -1601,7 +1722,7 @@ class AnkerSolixApiExport:
                         "Exporting HES site energy data for %s...",
                         stat_type.upper(),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_HES_SVC_ENDPOINTS["energy_statistics"],
                         filename=f"{API_FILEPREFIXES['hes_energy_' + stat_type]}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -1629,7 +1750,7 @@ class AnkerSolixApiExport:
                         "Exporting HES site energy data of today for %s...",
                         stat_type.upper(),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_HES_SVC_ENDPOINTS["energy_statistics"],
                         filename=f"{API_FILEPREFIXES['hes_energy_' + stat_type + '_today']}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -1647,7 +1768,7 @@ class AnkerSolixApiExport:
                         "Exporting HES site profit data for %s...",
                         stat_type.upper(),
                     )
-                    await self.query(
+                    await self.submit(
                         endpoint=API_HES_SVC_ENDPOINTS["get_system_profit"],
                         filename=f"{API_FILEPREFIXES['hes_get_system_profit']}_{stat_type}_{self._randomize(siteId, 'site_id')}.json",
                         payload={
@@ -1660,14 +1781,14 @@ class AnkerSolixApiExport:
                         replace=[(siteId, "<siteId>")],
                     )
                 self._logger.info("Exporting HES device info...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_hes_dev_info"],
                     filename=f"{API_FILEPREFIXES['hes_get_hes_dev_info']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
                     replace=[(siteId, "<siteId>")],
                 )
                 self._logger.info("Exporting HES standalone EV chargers...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_evcharger_standalone"],
                     filename=f"{API_FILEPREFIXES['hes_get_evcharger_standalone']}.json",
                     payload={},
@@ -1675,7 +1796,7 @@ class AnkerSolixApiExport:
 
                 # Export site infos requiring owner accounts
                 self._logger.info("Exporting HES system running time...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_system_running_time"],
                     filename=f"{API_FILEPREFIXES['hes_get_system_running_time']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
@@ -1692,7 +1813,7 @@ class AnkerSolixApiExport:
                 #     admin=admin,
                 # )
                 self._logger.info("Exporting HES MI layout...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_mi_layout"],
                     filename=f"{API_FILEPREFIXES['hes_get_mi_layout']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
@@ -1700,7 +1821,7 @@ class AnkerSolixApiExport:
                     admin=admin,
                 )
                 self._logger.info("Exporting HES connection net tips...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["get_conn_net_tips"],
                     filename=f"{API_FILEPREFIXES['hes_get_conn_net_tips']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteId": siteId},
@@ -1708,7 +1829,7 @@ class AnkerSolixApiExport:
                     admin=admin,
                 )
                 self._logger.info("Exporting HES device data...")
-                await self.query(
+                await self.submit(
                     endpoint=API_HES_SVC_ENDPOINTS["report_device_data"],
                     filename=f"{API_FILEPREFIXES['hes_report_device_data']}_{self._randomize(siteId, 'site_id')}.json",
                     payload={"siteIds": [siteId]},
@@ -1722,10 +1843,11 @@ class AnkerSolixApiExport:
                     "No system for %s endpoint data found, skipping remaining queries...",
                     ApiEndpointServices.hes_svc,
                 )
+                await self._join()
                 return True
 
             self._logger.info("Exporting HES heat pump plan...")
-            await self.query(
+            await self.submit(
                 endpoint=API_HES_SVC_ENDPOINTS["get_heat_pump_plan"],
                 filename=f"{API_FILEPREFIXES['hes_get_heat_pump_plan']}.json",
             )
@@ -1737,7 +1859,7 @@ class AnkerSolixApiExport:
                 country,
                 state_code,
             )
-            await self.query(
+            await self.submit(
                 endpoint=API_HES_SVC_ENDPOINTS["get_electric_plan_list"],
                 filename=f"{API_FILEPREFIXES['hes_get_electric_plan_list']}_{country}_{state_code}.json",
                 payload={"country": country, "state_code": state_code},
@@ -1761,7 +1883,7 @@ class AnkerSolixApiExport:
                 ]:
                     self._logger.info("Exporting HES device wifi info...")
                     # works only for site owners
-                    await self.query(
+                    await self.submit(
                         endpoint=API_HES_SVC_ENDPOINTS["get_wifi_info"],
                         filename=f"{API_FILEPREFIXES['hes_get_wifi_info']}_{self._randomize(sn, '_sn')}.json",
                         payload={"sn": sn},
@@ -1773,7 +1895,7 @@ class AnkerSolixApiExport:
                     self._logger.info("Exporting HES EV charger station info...")
                     # get various feature types
                     for stat_type in [1, 2]:
-                        await self.query(
+                        await self.submit(
                             endpoint=API_HES_SVC_ENDPOINTS[
                                 "get_evcharger_station_info"
                             ],
@@ -1782,8 +1904,10 @@ class AnkerSolixApiExport:
                             replace=[(sn, "<deviceSn>")],
                             admin=admin,
                         )
+            await self._join()
 
         except (errors.AnkerSolixError, ClientError) as err:
+            self._cancel_queries()
             if isinstance(err, ClientError):
                 self._logger.warning(
                     "%s endpoint data queries may not be supported on used server: %s",
@@ -1806,6 +1930,12 @@ class AnkerSolixApiExport:
         Reuse same randomization if value was already randomized
         """
 
+        with self._randomlock:
+            return self._randomize_value(val, key)
+
+    def _randomize_value(self, val: str, key: str = "") -> str:
+        """Randomize a given string or reuse the existing randomization, requires the random mapping lock."""
+
         if not self.randomized or not val:
             return val
         val = str(val)
@@ -1895,56 +2025,48 @@ class AnkerSolixApiExport:
             self._randomdata.update({val: randomstr})
         return randomstr or str(val)
 
-    def _check_keys(self, data: Any) -> Any:
-        """Recursive traversal of complex nested objects to randomize value for certain keys."""
+    def _check_keys(self, data: Any, randomkeys: bool = False) -> Any:
+        """Randomize values of sensitive keys in a single traversal of complex nested objects.
+
+        A new object is returned, so the provided data is not modified.
+        Optionally also the root keys and the keys of nested dictionaries on the third level are replaced by their randomized values.
+        """
+
+        rekeyed: list[dict] = []
+        data = self._anonymize(data, rekeyed if randomkeys else None)
+        # replace keys once all values are randomized, nested dictionaries before root
+        for container in rekeyed:
+            for key in [k for k in container if k in self._randomdata]:
+                container[self._randomdata[key]] = container.pop(key)
+        return data
+
+    def _anonymize(
+        self, data: Any, rekeyed: list[dict] | None = None, level: int = 0
+    ) -> Any:
+        """Return a copy of the object with randomized values of sensitive keys and collect dictionaries for key replacement."""
 
-        if isinstance(data, int | float | str | bool):
+        if isinstance(data, list):
+            return [self._anonymize(i) for i in data]
+        if not isinstance(data, dict):
             return data
-        for k, v in data.copy().items():
-            if isinstance(v, dict):
-                v = self._check_keys(v)
-            if isinstance(v, list):
-                v = [self._check_keys(i) for i in v]
+        result = {}
+        for k, v in data.items():
+            if isinstance(v, dict | list):
+                v = self._anonymize(v, rekeyed if level < 2 else None, level + 1)
             # Randomize value for certain keys
-            if (
-                any(
-                    x in k
-                    for x in [
-                        "_sn",
-                        "Sn",
-                        "site_id",
-                        "station_id",
-                        "stationId",
-                        "user_id",
-                        "member_id",
-                        "vehicle_id",
-                        "trace_id",
-                        "bt_ble_",
-                        "wifi_name",
-                        "ssid",
-                        "home_load_data",
-                        "param_data",
-                        "device_name",
-                        "token",
-                        "email",
-                        "_password",
-                        "_mac",
-                        "err_msg",
-                    ]
-                )
-                or k == "sn"
-            ):
+            if isinstance(k, str) and is_sensitive_key(k):
                 if isinstance(v, list):
                     # randomize individual string elements in list
-                    data[k] = [
+                    v = [
                         self._randomize(value, k) if isinstance(value, str) else value
                         for value in v
                     ]
                 elif isinstance(v, str):
-                    data[k] = self._randomize(v, k)
-                else:
-                    data[k] = v
-        return data
+                    v = self._randomize(v, k)
+            result[k] = v
+        if rekeyed is not None and level in [0, 2]:
+            rekeyed.append(result)
+        return result
 
     async def _export(
         self,
@@ -1964,43 +2086,91 @@ class AnkerSolixApiExport:
                 filename.replace(str(self.export_path), str(self.export_folder)),
             )
             return
-        if self.randomized and not skip_randomize:
-            d = self._check_keys(d)
+        # randomize and serialize the data in the worker thread and save the file in the background while the export continues
+        text = await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            partial(
+                self._serialize,
+                d,
+                randomize=self.randomized and not skip_randomize,
+                randomkeys=randomkeys,
+            ),
+        )
+        while len(self._pending) >= 5:
+            await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+        task = asyncio.get_running_loop().create_task(self._save(filename, text))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _serialize(
+        self, d: dict, randomize: bool = False, randomkeys: bool = False
+    ) -> bytes:
+        """Return the optionally randomized data as encoded JSON text."""
+
+        if randomize:
             # Randomize also the (nested) keys for dictionary export if required
-            if randomkeys:
-                d_copy = deepcopy(d)
-                for key, val in d.items():
-                    # check first nested keys in dict values
-                    if isinstance(val, dict):
-                        for nested_key, nested_val in dict(val).items():
-                            if isinstance(nested_val, dict):
-                                for k in [
-                                    text for text in nested_val if isinstance(text, str)
-                                ]:
-                                    # check nested dict keys
-                                    if k in self._randomdata:
-                                        d_copy[key][nested_key][self._randomdata[k]] = (
-                                            d_copy[key][nested_key].pop(k)
-                                        )
-                    # check root keys
-                    if key in self._randomdata:
-                        d_copy[self._randomdata[key]] = d_copy.pop(key)
-                d = d_copy
+            d = self._check_keys(d, randomkeys=randomkeys)
+        return json.dumps(d, indent=2).encode()
+
+    async def _save(self, filename: str, text: bytes) -> None:
+        """Save the encoded JSON text to the given file and stream it into the optional zipfile."""
 
+        shortname = filename.replace(str(self.export_path), str(self.export_folder))
         try:
-            async with aiofiles.open(filename, "w", encoding="utf-8") as file:
-                await file.write(json.dumps(d, indent=2))
-                self._logger.info(
-                    "Saved JSON to file %s",
-                    filename.replace(str(self.export_path), str(self.export_folder)),
-                )
+            async with aiofiles.open(filename, "wb") as file:
+                await file.write(text)
+                self._logger.info("Saved JSON to file %s", shortname)
         except OSError as err:
             self._logger.error(
-                "ERROR: Failed to save JSON to file %s: %s",
-                filename.replace(str(self.export_path), str(self.export_folder)),
-                err,
+                "ERROR: Failed to save JSON to file %s: %s", shortname, err
+            )
+            return
+        if self._zipfile:
+            arcname = str(Path(filename).relative_to(Path(self.export_path).parent))
+            async with self._ziplock:
+                if arcname in self._zipped:
+                    # rewritten files are taken from the folder when the zipfile is completed
+                    self._zipstale.add(arcname)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, self._zipfile.writestr, arcname, text
+                    )
+                    self._zipped.add(arcname)
+        self.exported += 1
+        if self.progress:
+            self.progress(self.exported, Path(filename).name)
+
+    async def _flush(self) -> None:
+        """Wait until all pending files are saved."""
+
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    def _complete_zip(self) -> str:
+        """Add remaining folder files to the streamed zipfile and close it."""
+
+        root = Path(self.export_path).parent
+        if self._zipstale:
+            # rebuild the zipfile from the folder if streamed files were rewritten
+            self._zipfile.close()
+            self._zipfile = None
+            Path(self.zipfilename).unlink()
+            return shutil.make_archive(
+                base_name=self.zipfilename.removesuffix(".zip"),
+                format="zip",
+                root_dir=root,
+                base_dir=Path(self.export_path).name,
             )
-        return
+        for file in sorted(Path(self.export_path).rglob("*")):
+            if (
+                file.is_file()
+                and (arcname := str(file.relative_to(root))) not in self._zipped
+            ):
+                self._zipfile.write(file, arcname)
+                self._zipped.add(arcname)
+        self._zipfile.close()
+        self._zipfile = None
+        return self.zipfilename
 
     def get_random_mapping(
         self,
@@ -2038,9 +2208,10 @@ class AnkerSolixApiExport:
             else:
                 # return real response data without randomization if needed
                 response = await self.client.request(method, endpoint, json=payload)
+                # randomization creates new objects, the response is not modified
                 await self._export(
                     Path(self.export_path) / filename,
-                    deepcopy(response),
+                    response,
                     randomkeys=randomkeys,
                 )
         except (errors.AnkerSolixError, ClientError) as err:
@@ -2065,6 +2236,44 @@ class AnkerSolixApiExport:
                 raise
         return response
 
+    async def submit(self, **kwargs: Any) -> None:
+        """Run the query with given arguments concurrently to other submitted queries if the response is not needed.
+
+        The number of running queries is limited and the client session keeps the request delay between the requests.
+        The first error of a submitted query is raised by subsequent submits or when joining the queries.
+        """
+
+        while len(self._queries) >= SolixDefaults.EXPORT_QUERY_CONCURRENCY:
+            await asyncio.wait(self._queries, return_when=asyncio.FIRST_COMPLETED)
+        if self._query_error:
+            raise self._query_error
+        task = self._loop.create_task(self.query(**kwargs))
+        self._queries.add(task)
+        task.add_done_callback(self._query_done)
+
+    def _query_done(self, task: asyncio.Task) -> None:
+        """Remove the completed query and keep its error."""
+
+        self._queries.discard(task)
+        if not task.cancelled() and (err := task.exception()) and not self._query_error:
+            self._query_error = err
+
+    async def _join(self) -> None:
+        """Wait until all submitted queries are completed and raise the first error of a submitted query."""
+
+        if self._queries:
+            await asyncio.wait(self._queries)
+        if err := self._query_error:
+            self._query_error = None
+            raise err
+
+    def _cancel_queries(self) -> None:
+        """Cancel the running submitted queries and clear a submitted query error."""
+
+        for task in self._queries:
+            task.cancel()
+        self._query_error = None
+
     async def export_mqtt_data(self) -> None:
         """Start MQTT session and dump received messages."""
 
@@ -2090,9 +2299,13 @@ class AnkerSolixApiExport:
                     )
                 if mqttsession and mqttsession.is_connected():
                     self._logger.info(
-                        "MQTT session connected, subscribing eligible devices and waiting 70 seconds for messages..."
+                        "MQTT session connected, subscribing eligible devices and waiting for expected messages..."
                     )
+                    self._recorder = AnkerSolixMqttRecorder(logger=self._logger)
                     request_devices = set()
+                    # expected message types per device and deadline to receive them
+                    expected: dict[str, set] = {}
+                    self._mqtt_received = {}
                     # initialize randomized hex serrials
                     if self.randomized:
                         self._hexserials = {
@@ -2101,6 +2314,16 @@ class AnkerSolixApiExport:
                             .hex()
                             for sn in self.api_power.devices
                         }
+                        # compile all hex serials for bulk replacement in message data, longest first
+                        self._hexpattern = (
+                            re.compile(
+                                "|".join(
+                                    sorted(self._hexserials, key=len, reverse=True)
+                                )
+                            )
+                            if self._hexserials
+                            else None
+                        )
                     for dev in mqttdevices:
                         sn = dev.get("device_sn", "")
                         pn = dev.get("device_pn", "") or dev.get("product_code", "")
@@ -2127,90 +2350,72 @@ class AnkerSolixApiExport:
                                 ]
                             ]:
                                 request_devices.add(sn)
-                    # wait at least first minute for messages without trigger
-                    await asyncio.sleep(70)
-                    # Ensure MQTT client is still connected
-                    if not mqttsession.is_connected():
-                        self._logger.info(
-                            "MQTT session not connected, trying reconnection..."
-                        )
-                        mqttsession = await self.api_power.startMqttSession(
-                            message_callback=self.dump_device_mqtt
-                        )
-                    # Cycle through devices and publish trigger for each applicable device
-                    if mqttsession.is_connected():
-                        self._logger.info(
-                            "Triggering MQTT Real Time data or Status Requests for 60 seconds and waiting for messages..."
+                            # expect all described message types that are no commands
+                            expected[sn] = {
+                                msgtype
+                                for msgtype, msg in SOLIXMQTTMAP.get(pn, {}).items()
+                                if not (msg.get(COMMAND_NAME) or msg.get(COMMAND_LIST))
+                            }
+                    deadline = self._loop.time() + SolixDefaults.MQTT_EXPORT_TIMEOUT
+                    # Publish trigger and status request concurrently to all devices
+                    self._logger.info(
+                        "Triggering MQTT Real Time data and Status Requests for all devices and waiting for messages..."
+                    )
+                    await asyncio.gather(
+                        *(
+                            self._mqtt_request(mqttsession, dev, trigger=True)
+                            for dev in mqttdevices
                         )
-                        for dev in mqttdevices:
-                            sn = dev.get("device_sn")
-                            # if sn not in request_devices: # RT trigger only for devices without Status Request description
-                            resp = mqttsession.realtime_trigger(
-                                deviceDict=dev,
-                                timeout=60,
-                                wait_for_publish=2,
-                            )
-                            if resp.is_published():
-                                self._logger.info(
-                                    "Published MQTT Real Time trigger message for device %s",
-                                    self._randomize(sn, "device_sn"),
-                                )
-                                mqttsession.triggered_devices.add(sn)
-                            else:
-                                self._logger.warning(
-                                    "Failed to publish Real Time trigger message for device %s",
-                                    self._randomize(sn, "device_sn"),
-                                )
-                                mqttsession.triggered_devices.discard(sn)
-                    # wait for the RT trigger to timeout and publish status requests for described devices
-                    for _ in range(6):
-                        for sn in request_devices:
-                            resp = mqttsession.status_request(
-                                deviceDict=self.api_power.devices.get(sn, {}),
-                                wait_for_publish=2,
-                            )
-                            if resp.is_published():
+                    )
+                    next_request = (
+                        self._loop.time() + SolixDefaults.MQTT_EXPORT_REQUEST_INTERVAL
+                    )
+                    # repeat status requests for described devices until all expected message types were received or deadline passed
+                    while missing := self._mqtt_missing(expected):
+                        if self._loop.time() >= deadline:
+                            for sn, types in missing.items():
                                 self._logger.info(
-                                    "Published MQTT Status Request message for device %s",
-                                    self._randomize(sn, "device_sn"),
-                                )
-                            else:
-                                self._logger.warning(
-                                    "Failed to publish MQTT Status Request message for device %s",
+                                    "Deadline passed without MQTT message types %s of device %s",
+                                    ", ".join(sorted(types)),
                                     self._randomize(sn, "device_sn"),
                                 )
-                        await asyncio.sleep(10)
-                    # Cycle through ALL devices and publish a status request to verify response
-                    if mqttsession.is_connected():
-                        self._logger.info(
-                            "Publish last Status Request and waiting for messages..."
+                            break
+                        await asyncio.sleep(1)
+                        if self._loop.time() < next_request:
+                            continue
+                        next_request = (
+                            self._loop.time()
+                            + SolixDefaults.MQTT_EXPORT_REQUEST_INTERVAL
                         )
-                        for dev in mqttdevices:
-                            sn = dev.get("device_sn")
-                            resp = mqttsession.status_request(
-                                deviceDict=self.api_power.devices.get(sn, {}),
-                                wait_for_publish=2,
+                        # Ensure MQTT client is still connected
+                        if not mqttsession.is_connected():
+                            self._logger.info(
+                                "MQTT session not connected, trying reconnection..."
                             )
-                            if resp.is_published():
-                                self._logger.info(
-                                    "Published Status Request message for device %s",
-                                    self._randomize(sn, "device_sn"),
-                                )
-                                mqttsession.triggered_devices.add(sn)
-                            else:
+                            mqttsession = await self.api_power.startMqttSession(
+                                message_callback=self.dump_device_mqtt
+                            )
+                            if not mqttsession:
                                 self._logger.warning(
-                                    "Failed to publish Status Request message for device %s",
-                                    self._randomize(sn, "device_sn"),
+                                    "MQTT session reconnection failed, stopping wait for missing MQTT message types"
+                                )
+                                break
+                        if mqttsession.is_connected():
+                            await asyncio.gather(
+                                *(
+                                    self._mqtt_request(
+                                        mqttsession, self.api_power.devices.get(sn, {})
+                                    )
+                                    for sn in request_devices & set(missing)
                                 )
-                                mqttsession.triggered_devices.discard(sn)
-                    mqttsession.triggered_devices.clear()
-                    # wait another 3 minutes to get all standard messages in 5 minute interval
-                    for i in range(3, 0, -1):
+                            )
+                    else:
                         self._logger.info(
-                            "Waiting %s more seconds for additional standard MQTT messages...",
-                            i * 60,
+                            "Received all expected MQTT message types of %s devices",
+                            len(expected),
                         )
-                        await asyncio.sleep(60)
+                    if mqttsession:
+                        mqttsession.triggered_devices.clear()
                 else:
                     self._logger.warning(
                         "MQTT session start or connection failed, skipping MQTT data export"
@@ -2233,6 +2438,11 @@ class AnkerSolixApiExport:
             else:
                 self._logger.warning("MQTT session was cancelled.")
         finally:
+            if self._recorder:
+                # write all recorded messages before files are zipped
+                await self._loop.run_in_executor(None, self._recorder.close)
+                self._logger.info("MQTT message recorder stats: %s", self._recorder)
+                self._recorder = None
             if mqttsession and self._old_callback:
                 self._logger.info("MQTT message export fininished.")
                 mqttsession.message_callback(func=self._old_callback)
@@ -2244,6 +2454,59 @@ class AnkerSolixApiExport:
                 self.api_power.stopMqttSession()
                 self._logger.info("MQTT message export fininished.")
 
+    def _mqtt_missing(self, expected: dict[str, set]) -> dict[str, set]:
+        """Get the missing message types per device, devices without described message types expect any message."""
+
+        missing = {}
+        for sn, types in expected.items():
+            received = self._mqtt_received.get(sn, set())
+            if types - received if types else not received:
+                missing[sn] = types - received if types else {"any"}
+        return missing
+
+    async def _mqtt_request(
+        self, mqttsession: AnkerSolixMqttSession, dev: dict, trigger: bool = False
+    ) -> None:
+        """Publish the optional real time trigger and a status request for the device without blocking the event loop."""
+
+        sn = dev.get("device_sn")
+        if trigger:
+            resp = await self._loop.run_in_executor(
+                None,
+                partial(
+                    mqttsession.realtime_trigger,
+                    deviceDict=dev,
+                    timeout=60,
+                    wait_for_publish=2,
+                ),
+            )
+            if resp.is_published():
+                self._logger.info(
+                    "Published MQTT Real Time trigger message for device %s",
+                    self._randomize(sn, "device_sn"),
+                )
+                mqttsession.triggered_devices.add(sn)
+            else:
+                self._logger.warning(
+                    "Failed to publish Real Time trigger message for device %s",
+                    self._randomize(sn, "device_sn"),
+                )
+                mqttsession.triggered_devices.discard(sn)
+        resp = await self._loop.run_in_executor(
+            None,
+            partial(mqttsession.status_request, deviceDict=dev, wait_for_publish=2),
+        )
+        if resp.is_published():
+            self._logger.info(
+                "Published MQTT Status Request message for device %s",
+                self._randomize(sn, "device_sn"),
+            )
+        else:
+            self._logger.warning(
+                "Failed to publish MQTT Status Request message for device %s",
+                self._randomize(sn, "device_sn"),
+            )
+
     def dump_device_mqtt(
         self,
         session: AnkerSolixMqttSession,
@@ -2278,8 +2541,10 @@ class AnkerSolixApiExport:
                 # randomize potential hex serials of system device serials in hex data
                 if self.randomized:
                     datastr = bytes(data).hex()
-                    for snhex, randsnhex in self._hexserials.items():
-                        datastr = datastr.replace(snhex, randsnhex)
+                    if self._hexpattern:
+                        datastr = self._hexpattern.sub(
+                            lambda m: self._hexserials[m.group()], datastr
+                        )
             if isinstance(payload, dict):
                 if datastr:
                     # replace based64 encoded string in data field of message payload
@@ -2297,6 +2562,7 @@ class AnkerSolixApiExport:
             message["topic"] = topic
             msgstr = json.dumps(message).replace(device_sn, randsn)
             # save the message
+            self._mqtt_received.setdefault(device_sn, set()).add(msgtype)
             filename = f"{API_FILEPREFIXES['mqtt_message']}_{randsn}_{msgtype}.ndjson"
             # print info for first message type per device
             if filename not in self._mqtt_msg_types:
@@ -2306,14 +2572,11 @@ class AnkerSolixApiExport:
                     msgtype,
                     self._randomize(device_sn, "device_sn"),
                 )
-            # wait for the save and protect from task cancelation
-            savetask = asyncio.run_coroutine_threadsafe(
-                coro=self.api_power.mqttsession.saveToFile(
-                    filename=Path(self.export_path) / filename, data=json.loads(msgstr)
-                ),
-                loop=self._loop,
-            )
-            if savetask.result():
+            # queue the message to the recorder without waiting for the file write
+            # keep a local reference since the recorder may be closed and removed by the export task meanwhile
+            if (recorder := self._recorder) and recorder.record(
+                filename=Path(self.export_path) / filename, data=json.loads(msgstr)
+            ):
                 self._logger.debug(
                     "Saved MQTT message type '%s' from device %s --> %s",
                     msgtype,
@@ -1,5 +1,7 @@
 """Helper modules and classes for the Anker Power/Solix Cloud API."""
 
+import asyncio
+from bisect import bisect_left
 import contextlib
 from datetime import datetime, time, timedelta
 from enum import Enum
@@ -69,6 +71,547 @@ class RequestCounter:
         )
 
 
+class ConsumerRegistry:
+    """Registry of consumers and the cache keys they need per context, used to skip endpoints without consumers."""
+
+    def __init__(
+        self,
+        endpoint_keys: dict[str, set] | None = None,
+    ) -> None:
+        """Initialize."""
+        self.endpoint_keys: dict[str, set] = endpoint_keys or {}
+        # consumer id with tuple of normalized contexts and set of needed cache keys
+        self.consumers: dict[str, tuple[set, set]] = {}
+        # All endpoints are needed until the registry was activated, e.g. to allow initial creation of consumers
+        self.active: bool = False
+
+    def __str__(self) -> str:
+        """Print the registry state."""
+        return f"{len(self.consumers)} consumers, {'active' if self.active else 'inactive'}, skipped endpoints: {', '.join(self.skipped()) or 'None'}"
+
+    def register(
+        self, consumer: str, keys: set, context: str = "", parents: set | None = None
+    ) -> None:
+        """Register or update the cache keys needed by a consumer for an optional context like a site ID or device SN.
+
+        The consumer is also found for the parent contexts, e.g. the base device SN of a nested context or the site ID of a device SN.
+        """
+        if consumer and isinstance(consumer, str) and isinstance(keys, set):
+            self.consumers[consumer] = (
+                {str(c) for c in {context, *(parents or set())} if c},
+                {k for k in keys if k and isinstance(k, str)},
+            )
+
+    def unregister(self, consumer: str) -> None:
+        """Remove a consumer from the registry."""
+        self.consumers.pop(consumer, None)
+
+    def activate(self, enable: bool = True) -> None:
+        """Activate or deactivate the registry for endpoint checks."""
+        self.active = bool(enable)
+
+    def contexts(self) -> set:
+        """Get all contexts with registered consumers."""
+        return set().union(*[c for c, _ in self.consumers.values()])
+
+    def keys(self, context: str | None = None) -> set:
+        """Get all cache keys needed by registered consumers, optionally only for given context."""
+        return set().union(
+            *[k for c, k in self.consumers.values() if context is None or context in c]
+        )
+
+    def is_needed(self, endpoint: str, context: str | None = None) -> bool:
+        """Check whether any registered consumer needs the cache keys filled by the endpoint.
+
+        Unknown endpoints and contexts without registered consumers are always needed, so new sites or devices get all data for initial consumer creation.
+        """
+        if (
+            not self.active
+            or endpoint not in self.endpoint_keys
+            or (context is not None and context not in self.contexts())
+        ):
+            return True
+        return bool(self.endpoint_keys[endpoint] & self.keys(context=context))
+
+    def skipped(self) -> list:
+        """Get list of endpoints that are currently skipped for all contexts since no consumer needs them."""
+        return [ep for ep in self.endpoint_keys if not self.is_needed(ep)]
+
+
+class DerivedDataCache:
+    """Cache of data derived from other cache data per cache id, valid for the generation of the inputs and a key like the current hour slot."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        # input generation per cache id, the empty id is used for inputs shared by all ids
+        self.generations: dict[str, int] = {}
+        # derived data per cache id and name with tuple of generation key and data
+        self.data: dict[str, dict[str, tuple[tuple, Any]]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __str__(self) -> str:
+        """Print the cache state."""
+        return f"{sum(len(d) for d in self.data.values())} derived entries, {self.hits} hits, {self.misses} misses"
+
+    def _key(self, id: str, key: tuple) -> tuple:
+        """Get the full key of derived data including the generation of shared and id specific inputs."""
+        return (self.generations.get("", 0), self.generations.get(id, 0), *key)
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Invalidate derived data of a cache id or of all ids if no id is provided."""
+        id = str(id or "")
+        self.generations[id] = self.generations.get(id, 0) + 1
+        if id:
+            self.data.pop(id, None)
+        else:
+            self.data = {}
+
+    def get(self, id: str, name: str, key: tuple = ()) -> Any:
+        """Get derived data of the cache id if still valid for the given key, otherwise None."""
+        if (entry := (self.data.get(id) or {}).get(name)) and entry[0] == self._key(
+            id, key
+        ):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def set(self, id: str, name: str, value: Any, key: tuple = ()) -> Any:
+        """Set derived data of the cache id for the given key and return the value."""
+        self.data.setdefault(id, {})[name] = (self._key(id, key), value)
+        return value
+
+
+class PollScheduler:
+    """Scheduler for poll groups with individual cadence and priority, evaluated once per poll tick.
+
+    Groups with a tick cadence are due on ticks matching their phase modulo the cadence, so groups with same cadence and different phase never share a tick.
+    Groups with an interval cadence are due once the interval elapsed since their last run. Groups without cadence run only on demand.
+    Groups with a parent are carried by the parent group run, their categories are excluded from the parent run while the group is not due.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        """Initialize."""
+        self.groups: dict[str, dict] = {}
+        self.tick: int = 0
+
+    def __str__(self) -> str:
+        """Print the due state of the groups."""
+        return ", ".join(
+            f"{name}: {'due' if self.is_due(name) else self.ticks_until(name) if g.get('ticks') else g.get('last_run') or 'on demand'}"
+            for name, g in self.groups.items()
+        )
+
+    def add_group(
+        self,
+        name: str,
+        ticks: int | None = None,
+        interval: timedelta | None = None,
+        priority: int = 0,
+        phase: int = 0,
+        parent: str | None = None,
+        categories: set | None = None,
+    ) -> None:
+        """Add or replace a poll group with its cadence and priority."""
+        if name and isinstance(name, str):
+            self.groups[name] = {
+                "ticks": max(1, int(ticks)) if isinstance(ticks, int | float) else None,
+                "interval": interval if isinstance(interval, timedelta) else None,
+                "priority": int(priority),
+                "phase": max(0, int(phase)),
+                "parent": parent,
+                "categories": set(categories or set()),
+                "next_tick": self.tick,
+                "last_run": None,
+                "runs": 0,
+                "forced": False,
+            }
+
+    def set_cadence(
+        self, name: str, ticks: int | None = None, phase: int | None = None
+    ) -> None:
+        """Change the tick cadence and phase of a group and move a pending next run to the next tick of the new phase."""
+        if (group := self.groups.get(name)) and isinstance(ticks, int | float):
+            group["ticks"] = max(1, int(ticks))
+            if phase is not None:
+                group["phase"] = max(0, int(phase))
+            if group["next_tick"] > self.tick:
+                group["next_tick"] = self._next_tick(group, after=self.tick)
+
+    def _next_tick(self, group: dict, after: int) -> int:
+        """Get the first tick after the given tick that matches the phase of a group with tick cadence."""
+        return after - (after - group["phase"]) % group["ticks"] + group["ticks"]
+
+    def advance(self) -> list[str]:
+        """Advance to next tick and return the due groups ordered by priority."""
+        self.tick += 1
+        return self.due()
+
+    def is_due(self, name: str, now: datetime | None = None) -> bool:
+        """Check whether the group is due for the actual tick."""
+        if not (group := self.groups.get(name)):
+            return False
+        if group["forced"] or group["last_run"] is None:
+            return True
+        if group["ticks"]:
+            return self.tick >= group["next_tick"]
+        if group["interval"]:
+            return (now or datetime.now()) - group["last_run"] >= group["interval"]
+        return False
+
+    def due(self, now: datetime | None = None) -> list[str]:
+        """Get the due groups for the actual tick ordered by priority."""
+        return sorted(
+            [name for name in self.groups if self.is_due(name, now=now)],
+            key=lambda name: self.groups[name]["priority"],
+        )
+
+    def skipped_categories(self, parent: str, now: datetime | None = None) -> set:
+        """Get the categories of groups carried by the parent that are not due for the actual tick."""
+        return set().union(
+            *[
+                g["categories"]
+                for name, g in self.groups.items()
+                if g["parent"] == parent and not self.is_due(name, now=now)
+            ]
+        )
+
+    def mark(
+        self, name: str, children: bool = True, now: datetime | None = None
+    ) -> None:
+        """Mark a group and optionally its due child groups as run for the actual tick."""
+        now = now or datetime.now()
+        if children:
+            for child in [
+                n
+                for n, g in self.groups.items()
+                if g["parent"] == name and self.is_due(n, now=now)
+            ]:
+                self.mark(child, children=False, now=now)
+        if group := self.groups.get(name):
+            if group["ticks"]:
+                group["next_tick"] = self._next_tick(group, after=self.tick)
+            group["last_run"] = now
+            group["runs"] += 1
+            group["forced"] = False
+
+    def force(self, *names: str) -> None:
+        """Force the given groups or all groups if none given to be due on the actual tick."""
+        for name in names or self.groups.keys():
+            if group := self.groups.get(name):
+                group["forced"] = True
+
+    def reset(self) -> None:
+        """Reset all groups to the initial state so they will be due on next tick."""
+        for group in self.groups.values():
+            group.update(
+                {"next_tick": self.tick, "last_run": None, "runs": 0, "forced": False}
+            )
+
+    def runs(self, name: str) -> int:
+        """Get number of runs for a group."""
+        return (self.groups.get(name) or {}).get("runs") or 0
+
+    def ticks_until(self, name: str, ticks: int | None = None) -> int:
+        """Get or set the remaining ticks until a group with tick cadence is due, setting shifts the phase of the group accordingly."""
+        if not (group := self.groups.get(name)) or not group["ticks"]:
+            return 0
+        if isinstance(ticks, int | float):
+            group["next_tick"] = self.tick + int(ticks)
+            group["phase"] = group["next_tick"] % group["ticks"]
+        return max(0, group["next_tick"] - self.tick)
+
+
+class LoopStallMonitor:
+    """Monitor for stalls of the running event loop, measured by the delay of a periodic wakeup beyond its interval."""
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1) -> None:
+        """Initialize."""
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self.max_stall: float = 0.0
+        self.total_stall: float = 0.0
+        self.stalls: int = 0
+        self._task: asyncio.Task | None = None
+
+    def __str__(self) -> str:
+        """Print the stall statistics."""
+        return f"{self.stalls} stalls above {self.threshold * 1000:.0f} ms, total {self.total_stall:.3f} s, max {self.max_stall:.3f} s"
+
+    def start(self) -> None:
+        """Reset the statistics and start monitoring the running event loop."""
+        if not self._task:
+            self.max_stall = 0.0
+            self.total_stall = 0.0
+            self.stalls = 0
+            self._task = asyncio.get_running_loop().create_task(self._monitor())
+
+    async def stop(self) -> None:
+        """Stop monitoring the event loop."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _monitor(self) -> None:
+        """Measure the wakeup delay of each interval."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            stall = max(0.0, loop.time() - start - self.interval)
+            self.max_stall = max(self.max_stall, stall)
+            if stall >= self.threshold:
+                self.stalls += 1
+                self.total_stall += stall
+
+
+class RequestStats:
+    """Statistics of Api requests per endpoint with latency histogram, response sizes, errors and timings of poller phases.
+
+    The statistics are collected in rolling windows, reported statistics cover the current and the previous window.
+    """
+
+    def __init__(
+        self, buckets: list[float] | None = None, window: float = 3600
+    ) -> None:
+        """Initialize."""
+        # upper bounds of latency histogram buckets in seconds, last bucket counts all above
+        self.buckets: list[float] = sorted(buckets or [0.1, 0.25, 0.5, 1, 2, 5, 10])
+        # seconds per statistics window
+        self.window: float = max(60, window)
+        # endpoint and phase statistics of the current window
+        self.endpoints: dict[str, dict] = {}
+        self.phases: dict[str, dict] = {}
+        # endpoint and phase statistics of the previous window
+        self._previous: tuple[dict[str, dict], dict[str, dict]] = ({}, {})
+        self._window_start: datetime = datetime.now()
+        # duration and end time of the last complete poll cycle
+        self.cycle: dict = {}
+
+    def __str__(self) -> str:
+        """Print the request statistics."""
+        summary = self.summary()
+        return f"{summary['requests']} requests, avg {summary['avg_ms']} ms, max {summary['max_ms']} ms, {summary['errors']} errors, {summary['throttled']} throttled"
+
+    def _rotate(self) -> None:
+        """Start a new window if the current window has expired, the current window becomes the previous window."""
+        if (
+            elapsed := (datetime.now() - self._window_start).total_seconds()
+        ) >= self.window:
+            # drop the current window as well if it expired longer than a window ago
+            self._previous = (
+                (self.endpoints, self.phases) if elapsed < 2 * self.window else ({}, {})
+            )
+            self.endpoints = {}
+            self.phases = {}
+            self._window_start = datetime.now()
+
+    def _merged(self) -> tuple[dict[str, dict], dict[str, dict]]:
+        """Get the endpoint and phase statistics merged over the previous and the current window."""
+        self._rotate()
+        endpoints = {
+            endpoint: dict(stats) for endpoint, stats in self._previous[0].items()
+        }
+        for endpoint, stats in self.endpoints.items():
+            if (merged := endpoints.get(endpoint)) is None:
+                endpoints[endpoint] = dict(stats)
+                continue
+            for key in ["requests", "latency_sum", "bytes_sum", "throttled", "busy"]:
+                merged[key] += stats[key]
+            for key in ["latency_max", "bytes_max"]:
+                merged[key] = max(merged[key], stats[key])
+            merged["histogram"] = [
+                a + b
+                for a, b in zip(merged["histogram"], stats["histogram"], strict=True)
+            ]
+            merged["errors"] = {
+                code: merged["errors"].get(code, 0) + stats["errors"].get(code, 0)
+                for code in merged["errors"] | stats["errors"]
+            }
+        phases = {name: dict(phase) for name, phase in self._previous[1].items()}
+        for name, phase in self.phases.items():
+            if (merged := phases.get(name)) is None:
+                phases[name] = dict(phase)
+                continue
+            merged["count"] += phase["count"]
+            merged["sum"] += phase["sum"]
+            merged["max"] = max(merged["max"], phase["max"])
+            merged["last"] = phase["last"]
+        return endpoints, phases
+
+    def _endpoint(self, endpoint: str) -> dict:
+        """Get or create the statistics entry of an endpoint in the current window."""
+        self._rotate()
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = {
+                "requests": 0,
+                "latency_sum": 0.0,
+                "latency_max": 0.0,
+                "histogram": [0] * (len(self.buckets) + 1),
+                "bytes_sum": 0,
+                "bytes_max": 0,
+                "errors": {},
+                "throttled": 0,
+                "busy": 0,
+            }
+        return stats
+
+    def add(
+        self, endpoint: str, seconds: float, size: int = 0, status: int = 200
+    ) -> None:
+        """Add a completed request with its latency, response size and http status to the endpoint statistics."""
+        stats = self._endpoint(str(endpoint))
+        stats["requests"] += 1
+        stats["latency_sum"] += seconds
+        stats["latency_max"] = max(stats["latency_max"], seconds)
+        stats["histogram"][bisect_left(self.buckets, seconds)] += 1
+        stats["bytes_sum"] += size
+        stats["bytes_max"] = max(stats["bytes_max"], size)
+        if status == 429:
+            stats["throttled"] += 1
+        elif not 200 <= status < 300:
+            self.add_error(endpoint, status)
+
+    def add_error(self, endpoint: str, code: int | str) -> None:
+        """Add an error with http status or Api error code to the endpoint statistics."""
+        errors = self._endpoint(str(endpoint))["errors"]
+        errors[str(code)] = errors.get(str(code), 0) + 1
+
+    def add_busy(self, endpoint: str) -> None:
+        """Add a busy response of the cloud server to the endpoint statistics."""
+        self._endpoint(str(endpoint))["busy"] += 1
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """Add the duration of a poller phase."""
+        self._rotate()
+        if (phase := self.phases.get(name)) is None:
+            phase = self.phases[name] = {"count": 0, "sum": 0.0, "max": 0.0}
+        phase["count"] += 1
+        phase["sum"] += seconds
+        phase["max"] = max(phase["max"], seconds)
+        phase["last"] = seconds
+
+    def add_cycle(self, seconds: float) -> None:
+        """Add the duration of a complete poll cycle with all phases that were due in the cycle."""
+        self.cycle = {
+            "seconds": round(seconds, 3),
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def percentile(self, stats: dict, quantile: float) -> float | None:
+        """Get the bucket upper bound in seconds for the latency quantile of the statistics entry, None if above the last bucket."""
+        if not (requests := sum(stats["histogram"])):
+            return 0.0
+        count = 0
+        for idx, value in enumerate(stats["histogram"]):
+            count += value
+            if count >= quantile * requests:
+                return self.buckets[idx] if idx < len(self.buckets) else None
+        return None
+
+    def asdict(self) -> dict:
+        """Get the complete statistics of all endpoints and poller phases of the previous and the current window."""
+        endpoints, phases = self._merged()
+        return {
+            "window_s": self.window,
+            "buckets_s": self.buckets,
+            "endpoints": {
+                endpoint: {
+                    "requests": stats["requests"],
+                    "avg_ms": round(stats["latency_sum"] / stats["requests"] * 1000)
+                    if stats["requests"]
+                    else 0,
+                    "max_ms": round(stats["latency_max"] * 1000),
+                    "histogram": stats["histogram"],
+                    "avg_bytes": round(stats["bytes_sum"] / stats["requests"])
+                    if stats["requests"]
+                    else 0,
+                    "max_bytes": stats["bytes_max"],
+                    "errors": stats["errors"],
+                    "throttled": stats["throttled"],
+                    "busy": stats["busy"],
+                }
+                for endpoint, stats in sorted(endpoints.items())
+            },
+            "phases": self.phase_summary(phases),
+            "cycle": self.cycle,
+        }
+
+    def phase_summary(self, phases: dict[str, dict] | None = None) -> dict:
+        """Get the last, average and maximum duration in seconds per poller phase of the previous and the current window or of the given phases."""
+        if phases is None:
+            phases = self._merged()[1]
+        return {
+            name: {
+                "last": round(phase["last"], 3),
+                "avg": round(phase["sum"] / phase["count"], 3),
+                "max": round(phase["max"], 3),
+                "count": phase["count"],
+            }
+            for name, phase in phases.items()
+        }
+
+    def summary(self) -> dict:
+        """Get compact statistics over all endpoints of the previous and the current window."""
+        endpoints, phases = self._merged()
+        requests = sum(s["requests"] for s in endpoints.values())
+        total = {
+            "histogram": [
+                sum(column)
+                for column in zip(
+                    *(s["histogram"] for s in endpoints.values()),
+                    strict=True,
+                )
+            ]
+            or [0] * (len(self.buckets) + 1)
+        }
+        p90 = self.percentile(total, 0.9)
+        errors: dict[str, int] = {}
+        for stats in endpoints.values():
+            for code, count in stats["errors"].items():
+                errors[code] = errors.get(code, 0) + count
+        return {
+            "requests": requests,
+            "avg_ms": round(
+                sum(s["latency_sum"] for s in endpoints.values()) / requests * 1000
+            )
+            if requests
+            else 0,
+            "p90_ms": round(p90 * 1000) if p90 is not None else None,
+            "max_ms": round(
+                max((s["latency_max"] for s in endpoints.values()), default=0) * 1000
+            ),
+            "avg_bytes": round(
+                sum(s["bytes_sum"] for s in endpoints.values()) / requests
+            )
+            if requests
+            else 0,
+            "errors": sum(errors.values()),
+            "error_codes": errors,
+            "throttled": sum(s["throttled"] for s in endpoints.values()),
+            "busy": sum(s["busy"] for s in endpoints.values()),
+            # slowest endpoints by average latency
+            "slowest": {
+                endpoint: round(s["latency_sum"] / s["requests"] * 1000)
+                for endpoint, s in sorted(
+                    endpoints.items(),
+                    key=lambda item: (
+                        item[1]["latency_sum"] / max(1, item[1]["requests"])
+                    ),
+                    reverse=True,
+                )[:5]
+                if s["requests"]
+            },
+            "phases": self.phase_summary(phases),
+            "cycle": self.cycle,
+        }
+
+
 def md5(data: str | bytes) -> str:
     """Return MD5 hash in hex for given string or bytes."""
     return hashlib.md5(data.encode() if isinstance(data, str) else data).hexdigest()
@@ -3,6 +3,7 @@
 
 import contextlib
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 from pathlib import Path
 
@@ -14,15 +15,14 @@ from .apitypes import (
     API_HES_SVC_ENDPOINTS,
     PRODUCT_CODES,
     ApiCategories,
-    SolixDeviceCapacity,
-    SolixDeviceCategory,
-    SolixDeviceNames,
     SolixDeviceType,
     SolixPriceProvider,
     SolixSiteType,
 )
 from .errors import AnkerSolixError
+from .device import HES_KEY_HANDLERS
 from .helpers import convertToKwh, get_solix_product_code
+from .intraday import IntradaySeries
 from .session import AnkerSolixClientSession
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
@@ -81,7 +81,8 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
         """Update the internal device details dictionary with the given data. The device_sn key must be set in the data dict for the update to be applied.
 
         This method should be implemented to consolidate various device related key values from various requests under a common set of device keys.
-        The device SN should be returned if found in devData and an update was done
+        The device SN should be returned if found in devData and an update was done.
+        The key specific consolidation is dispatched to the handlers registered in HES_KEY_HANDLERS.
         """
 
         if sn := devData.pop("device_sn", None):
@@ -106,176 +107,12 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
                     device["owner_user_id"] = value
             calc_capacity = False  # Flag whether capacity may need recalculation
             for key, value in devData.items():
+                # dispatch only keys with registered handler
+                if not (handler := HES_KEY_HANDLERS.get(key)):
+                    continue
                 try:
-                    # Implement device update code with key filtering, conversion, consolidation, calculation or dependency updates
-                    if key in ["product_code", "device_pn"] and value:
-                        device.update({"device_pn": str(value)})
-                        # try to get capacity from category definitions
-                        if (
-                            hasattr(SolixDeviceCapacity, str(value))
-                            and "battery_capacity" not in device
-                        ):
-                            # get battery capacity from known PNs
-                            device["battery_capacity"] = str(
-                                getattr(SolixDeviceCapacity, str(value))
-                            )
-                            calc_capacity = True
-                        # try to get type for standalone device from category definitions if not defined yet
-                        if (
-                            hasattr(SolixDeviceCategory, str(value))
-                            and "type" not in device
-                        ):
-                            dev_type = str(
-                                getattr(SolixDeviceCategory, str(value))
-                            ).split("_")
-                            if dev_type[-1].isdigit():
-                                gen = int(dev_type.pop(-1))
-                            else:
-                                gen = None
-                            device["type"] = "_".join(dev_type)
-                            # update generation if specified in device type definitions
-                            if gen:
-                                device["generation"] = gen
-                    elif key == "device_name":
-                        if value:
-                            device["name"] = str(value)
-                        elif (
-                            pn := device.get("device_pn")
-                            or devData.get("device_pn")
-                            or None
-                        ) and (not device.get("name") or devData.get("device_name")):
-                            # preset default device name if only alias provided, fallback to alias if product name not listed
-                            device.update(
-                                {
-                                    "name": devData.get("device_name")
-                                    or (
-                                        (self.account.get("products") or {}).get(pn)
-                                        or {}
-                                    ).get("name")
-                                    or getattr(SolixDeviceNames, pn, "")
-                                    or str(value)
-                                }
-                            )
-                    elif key == "alias_name" and value:
-                        device["alias"] = str(value)
-                    elif key in [
-                        # Examples for boolean key values
-                        "auto_upgrade",
-                        "is_subdevice",
-                        "is_primary",
-                    ]:
-                        device[key] = bool(value)
-                    # key with string values
-                    elif key == "wireless_type" or (
-                        key
-                        in [
-                            # Example for key with string values that should only be updated if value returned
-                            "wifi_name",
-                            "main_sn",
-                            "ssid",
-                            "encryption",
-                        ]
-                        and value
-                    ):
-                        device[key] = str(value)
-                    # key with any value
-                    elif key == "ev_charger_status":
-                        device[key] = value
-                    elif key == "rssi" and value:
-                        # For HES this is actually not a relative rssi value (0-255), but signal strength 0-100 %
-                        device["wifi_signal"] = str(value)
-                    elif key == "average_power" and value:
-                        calc_capacity |= (device.get("average_power") or {}).get(
-                            "state_of_charge"
-                        ) != value.get("state_of_charge")
-                        device[key] = value
-                    elif key == "batCount" and str(value).isdigit():
-                        calc_capacity |= device.get(key) != int(value)
-                        device[key] = int(value)
-                    elif key == "battery_capacity" and str(value).isdigit():
-                        # This key is used to trigger recalculation from customization
+                    if handler(self, device, key, value, devData):
                         calc_capacity = True
-                        device[key] = value
-                    # generate extra values when certain conditions are met
-                    if calc_capacity:
-                        # generate battery values for main device only when soc updated or battery modules count change
-                        # init calculated fields with 0 if not existing
-                        if "battery_capacity" not in device:
-                            device["battery_capacity"] = "0"
-                        is_primary = device.get("is_primary") or devData.get(
-                            "is_primary"
-                        )
-                        if (
-                            not (cap := device.get("battery_capacity")) or calc_capacity
-                        ) and is_primary:
-                            cap = 0
-                            for dev in [
-                                d
-                                for d in self.devices.values()
-                                if d.get("main_sn") == sn
-                                and d.get("is_subdevice")
-                                and str(d.get("battery_capacity")).isdigit()
-                            ]:
-                                # consider customized capacity for calculation
-                                cap += (
-                                    int(c)
-                                    if (
-                                        c := (dev.get("customized") or {}).get(
-                                            "battery_capacity"
-                                        )
-                                    )
-                                    and str(c).isdigit()
-                                    else int(dev.get("battery_capacity"))
-                                )
-                        device["battery_capacity"] = str(cap)
-                        # Calculate remaining energy in Wh and add values
-                        # Calculate energy only for primary device
-                        site_id = device.get("site_id", "")
-                        if is_primary:
-                            prim_dev = device
-                        else:
-                            prim_dev = next(
-                                iter(
-                                    [
-                                        d
-                                        for d in self.devices.values()
-                                        if site_id == d.get("site_id")
-                                        and d.get("is_primary")
-                                    ]
-                                ),
-                                {},
-                            )
-                        soc = (devData.get("average_power") or {}).get(
-                            "state_of_charge"
-                        ) or (prim_dev.get("average_power") or {}).get(
-                            "state_of_charge"
-                        )
-                        if prim_dev and soc and str(soc).isdigit():
-                            # Get optional customized capacity for correct energy calculation if adjusted externally
-                            custom_cap = 0
-                            # consider customized capacity for calculation from main devices only
-                            for dev in [
-                                d
-                                for d in self.devices.values()
-                                if site_id == d.get("site_id")
-                                and (d.get("batCount") or 0) > 0
-                                and str(d.get("battery_capacity")).isdigit()
-                            ]:
-                                custom_cap += (
-                                    int(c)
-                                    if (
-                                        c := (dev.get("customized") or {}).get(
-                                            "battery_capacity"
-                                        )
-                                    )
-                                    and str(c).isdigit()
-                                    else int(dev.get("battery_capacity"))
-                                )
-                            prim_dev["battery_energy"] = str(
-                                int(int(custom_cap) * int(soc) / 100)
-                            )
-                        calc_capacity = False
-
                 except Exception as err:  # pylint: disable=broad-exception-caught  # noqa: BLE001
                     self._logger.error(
                         "Api %s error %s occurred when updating device details for key %s with value %s: %s",
@@ -286,6 +123,79 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
                         err,
                     )
 
+            # generate extra values when certain conditions are met
+            if calc_capacity:
+                # generate battery values for main device only when soc updated or battery modules count change
+                # init calculated fields with 0 if not existing
+                if "battery_capacity" not in device:
+                    device["battery_capacity"] = "0"
+                is_primary = device.get("is_primary") or devData.get("is_primary")
+                cap = device.get("battery_capacity")
+                if is_primary:
+                    cap = 0
+                    for dev in [
+                        d
+                        for d in self.devices.values()
+                        if d.get("main_sn") == sn
+                        and d.get("is_subdevice")
+                        and str(d.get("battery_capacity")).isdigit()
+                    ]:
+                        # consider customized capacity for calculation
+                        cap += (
+                            int(c)
+                            if (
+                                c := (dev.get("customized") or {}).get(
+                                    "battery_capacity"
+                                )
+                            )
+                            and str(c).isdigit()
+                            else int(dev.get("battery_capacity"))
+                        )
+                device["battery_capacity"] = str(cap)
+                # Calculate remaining energy in Wh and add values
+                # Calculate energy only for primary device
+                site_id = device.get("site_id", "")
+                if is_primary:
+                    prim_dev = device
+                else:
+                    prim_dev = next(
+                        iter(
+                            [
+                                d
+                                for d in self.devices.values()
+                                if site_id == d.get("site_id") and d.get("is_primary")
+                            ]
+                        ),
+                        {},
+                    )
+                soc = (devData.get("average_power") or {}).get("state_of_charge") or (
+                    prim_dev.get("average_power") or {}
+                ).get("state_of_charge")
+                if prim_dev and soc and str(soc).isdigit():
+                    # Get optional customized capacity for correct energy calculation if adjusted externally
+                    custom_cap = 0
+                    # consider customized capacity for calculation from main devices only
+                    for dev in [
+                        d
+                        for d in self.devices.values()
+                        if site_id == d.get("site_id")
+                        and (d.get("batCount") or 0) > 0
+                        and str(d.get("battery_capacity")).isdigit()
+                    ]:
+                        custom_cap += (
+                            int(c)
+                            if (
+                                c := (dev.get("customized") or {}).get(
+                                    "battery_capacity"
+                                )
+                            )
+                            and str(c).isdigit()
+                            else int(dev.get("battery_capacity"))
+                        )
+                    prim_dev["battery_energy"] = str(
+                        int(int(custom_cap) * int(soc) / 100)
+                    )
+
             self.devices.update({str(sn): device})
         return sn
 
@@ -913,28 +823,40 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
                                 )
                             ).get("data") or {}
                         else:
-                            data = await self.energy_statistics(
+                            # use cached series for complete days
+                            data = await self.intradayCache.series(
+                                partial(
+                                    self.energy_statistics,
+                                    siteId=siteId,
+                                    rangeType="day",
+                                    sourceType=source,
+                                    startDay=checkdate,
+                                    endDay=checkdate,
+                                ),
                                 siteId=siteId,
-                                rangeType="day",
-                                sourceType=source,
-                                startDay=checkdate,
-                                endDay=checkdate,
+                                source=source,
+                                day=checkdate,
                             )
-                        # generate list of SOC timestamps different from 0 and pick last one
-                        if soclist := [
-                            item
-                            for item in (data.get("chargeLevel") or [])
-                            if (item.get("value") or "0") != "0"
-                        ]:
-                            if soclist[-1].get("time"):
-                                last = datetime.strptime(
-                                    checkdate.strftime("%Y-%m-%d")
-                                    + soclist[-1].get("time"),
-                                    "%Y-%m-%d%H:%M",
-                                )
-                                future: datetime = last + timedelta(minutes=5)
-                                validdata = data
-                                break
+                        # find last SOC slot different from 0
+                        if (
+                            idx := self.intradayCache.columns(
+                                data.get("chargeLevel")
+                            ).last(nonzero=True)
+                        ) >= 0:
+                            last = datetime.strptime(
+                                checkdate.strftime("%Y-%m-%d")
+                                + IntradaySeries.time(idx),
+                                "%Y-%m-%d%H:%M",
+                            )
+                            future: datetime = last + timedelta(minutes=5)
+                            validdata = data
+                            self.intradayCache.finalize(
+                                siteId=siteId,
+                                source=source,
+                                day=checkdate,
+                                slot=IntradaySeries.time(idx),
+                            )
+                            break
                     # get min offset to first invalid timestamp to find best check time (smallest delay after new value from cloud)
                     if future:
                         offset = min(
@@ -970,18 +892,28 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
                         )
                     ).get("data") or {}
                 else:
+                    # query only if the cached series is not finalized until the valid time slot
                     self._logger.debug(
-                        "Querying api %s %s data of %s",
+                        "Getting api %s %s data of %s",
                         self.apisession.nickname,
                         source,
                         validtime.strftime("%Y-%m-%d"),
                     )
-                    data = await self.energy_statistics(
+                    data = await self.intradayCache.series(
+                        partial(
+                            self.energy_statistics,
+                            siteId=siteId,
+                            rangeType="day",
+                            sourceType=source,
+                            startDay=validtime,
+                            endDay=validtime,
+                        ),
                         siteId=siteId,
-                        rangeType="day",
-                        sourceType=source,
-                        startDay=validtime,
-                        endDay=validtime,
+                        source=source,
+                        day=validtime,
+                        until=self.intradayCache.slot(validtime)
+                        if offset.total_seconds() != 0
+                        else None,
                     )
                 # set last check time more into past to ensure each data refresh verifies until offset no longer increases
                 if (
@@ -1007,83 +939,54 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
                 if unit := data.get("powerUnit"):
                     avg_data["power_unit"] = str(unit).lower().replace("w", "W")
                 # extract power values only if offset to last valid SOC entry was found
-                if offset.total_seconds() != 0 and (
-                    powerlist := [
-                        item
-                        for item in (data.get("power") or [])
-                        if (item.get("time") or "24:00") <= validtime.strftime("%H:%M")
-                    ]
+                power = self.intradayCache.columns(data.get("power"))
+                if (
+                    offset.total_seconds() != 0
+                    and (idx := power.latest(until=IntradaySeries.index(validtime)))
+                    >= 0
                 ):
                     entry["date"] = validtime.strftime("%Y-%m-%d")
                     if source == "hes":
-                        for idx, power in enumerate(
-                            powerlist[-1].get("powerInfos") or [], start=1
-                        ):
-                            if idx == 1:
-                                # Currently the intraday data contain only one element with positive discharge power and negative charge power
-                                pwr = str(power.get("value") or "")
-                                if pwr and pwr[0] == "-":
-                                    # use positive values also for charge
-                                    avg_data["charge_power_avg"] = pwr.replace("-", "")
-                                    avg_data["discharge_power_avg"] = "0.00"
-                                else:
-                                    avg_data["discharge_power_avg"] = pwr
-                                    avg_data["charge_power_avg"] = "0.00"
-                        if soclist := [
-                            item
-                            for item in (data.get("chargeLevel") or [])
-                            if (item.get("time") or "24:00")
-                            <= validtime.strftime("%H:%M")
-                        ]:
-                            avg_data["state_of_charge"] = soclist[-1].get("value") or ""
+                        # Currently the intraday data contain only one element with positive discharge power and negative charge power
+                        if (power.value(idx) or 0) < 0:
+                            # use positive values also for charge
+                            avg_data["charge_power_avg"] = power.text(
+                                idx, absolute=True
+                            )
+                            avg_data["discharge_power_avg"] = "0.00"
+                        else:
+                            avg_data["discharge_power_avg"] = power.text(
+                                idx, absolute=True
+                            )
+                            avg_data["charge_power_avg"] = "0.00"
+                        soc = self.intradayCache.columns(data.get("chargeLevel"))
+                        if (
+                            socidx := soc.latest(until=IntradaySeries.index(validtime))
+                        ) >= 0:
+                            avg_data["state_of_charge"] = soc.text(socidx)
                         # get todays totals from data to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "solar":
-                        avg_data["solar_power_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["solar_power_avg"] = power.text(idx)
                         # get interval totals from aggregate to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "home":
-                        avg_data["home_usage_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["home_usage_avg"] = power.text(idx)
                         # get interval totals from aggregate to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "grid":
-                        pwr = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
                         # Currently the intraday data contain only one element with positive import power and negative export power
-                        if pwr and pwr[0] == "-":
+                        if (power.value(idx) or 0) < 0:
                             # use positive values also for export
-                            avg_data["grid_export_avg"] = pwr.replace("-", "")
+                            avg_data["grid_export_avg"] = power.text(idx, absolute=True)
                             avg_data["grid_import_avg"] = "0.00"
                         else:
-                            avg_data["grid_import_avg"] = pwr
+                            avg_data["grid_import_avg"] = power.text(idx, absolute=True)
                             avg_data["grid_export_avg"] = "0.00"
                         # get interval totals from aggregate to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "evCharger":
-                        avg_data["ev_charge_power_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["ev_charge_power_avg"] = power.text(idx)
                         # get interval totals from aggregate to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
             # Add average power to main device details as work around if no other hes device usage data will be found in cloud
@@ -1156,6 +1059,7 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
         devTypes: set | None = None,
         fromFile: bool = False,
         showProgress: bool = False,
+        useStore: bool = True,
     ) -> dict:
         """Fetch daily Energy data for given interval and provide it in a table format dictionary.
 
@@ -1164,7 +1068,22 @@ class AnkerSolixHesApi(AnkerSolixBaseApi):
         Example:
         {"2023-09-29": {"date": "2023-09-29", "solar_production": "1.21", "battery_discharge": "0.47", "battery_charge": "0.56"},
         "2023-09-30": {"date": "2023-09-30", "solar_production": "3.07", "battery_discharge": "1.06", "battery_charge": "1.39"}}
+        Final days are served from the local energy store if used, only missing or mutable days are queried.
         """
+        if self.energyStore and useStore and not fromFile:
+            return await self.energyStore.energy_daily(
+                fetch=partial(self.energy_daily, useStore=False),
+                scope=self.energyStore.scope(
+                    "hes_energy_daily", dayTotals=dayTotals, devTypes=devTypes
+                ),
+                siteId=siteId,
+                startDay=startDay,
+                numDays=numDays,
+                tzOffset=(self.sites.get(siteId) or {}).get("energy_offset_tz") or 0,
+                dayTotals=dayTotals,
+                devTypes=devTypes,
+                showProgress=showProgress,
+            )
         table = {}
         if not devTypes or not isinstance(devTypes, set):
             devTypes = set()
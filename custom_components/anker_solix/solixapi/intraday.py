@@ -0,0 +1,226 @@
+"""Anker Power/Solix Cloud API class to cache intraday energy statistics series of sites."""
+
+from array import array
+from collections.abc import Awaitable, Callable
+import contextlib
+from datetime import datetime
+import logging
+from math import isnan, nan
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# time of the last 5 minute slot in intraday series
+LAST_SLOT = "23:55"
+# number of 5 minute slots per day
+SLOTS = 288
+
+
+class IntradaySeries:
+    """Define a columnar intraday series with one float array per value column, indexed by the 5 minute slot of the day.
+
+    Slots without item or numeric value are NaN. Power items provide one column per powerInfos entry, other items a single value column.
+    The item position per slot is kept to provide the original value strings of the cloud.
+    """
+
+    def __init__(self, items: list | None = None) -> None:
+        """Initialize."""
+        self.items: list = items if isinstance(items, list) else []
+        self.columns: list[array] = [array("d", [nan]) * SLOTS]
+        self.rows: array = array("i", [-1]) * SLOTS
+        for row, item in enumerate(self.items):
+            if (
+                not isinstance(item, dict)
+                or (slot := self.index(item.get("time"))) is None
+            ):
+                continue
+            self.rows[slot] = row
+            for col, value in enumerate(self._values(item)):
+                if col >= len(self.columns):
+                    self.columns.append(array("d", [nan]) * SLOTS)
+                with contextlib.suppress(TypeError, ValueError):
+                    self.columns[col][slot] = float(value)
+
+    @staticmethod
+    def _values(item: dict) -> list:
+        """Get the value columns of an item."""
+        return (
+            [info.get("value") for info in item.get("powerInfos") or []]
+            if "powerInfos" in item
+            else [item.get("value")]
+        )
+
+    @staticmethod
+    def index(time: str | datetime | None) -> int | None:
+        """Get the slot index of the given time string HH:MM or datetime."""
+        if isinstance(time, datetime):
+            return (time.hour * 60 + time.minute) // 5
+        with contextlib.suppress(TypeError, ValueError):
+            hour, minute = str(time).split(":")
+            if 0 <= (slot := (int(hour) * 60 + int(minute)) // 5) < SLOTS:
+                return slot
+        return None
+
+    @staticmethod
+    def time(index: int) -> str:
+        """Get the time string HH:MM of the given slot index."""
+        return f"{index // 12:02d}:{index % 12 * 5:02d}"
+
+    def last(
+        self, until: int = SLOTS - 1, column: int = 0, nonzero: bool = False
+    ) -> int:
+        """Get the index of the last slot with valid value until the given slot index, or -1 if none found."""
+        if column >= len(self.columns):
+            return -1
+        values = self.columns[column]
+        for idx in range(min(until, SLOTS - 1), -1, -1):
+            if not isnan(value := values[idx]) and not (nonzero and value == 0):
+                return idx
+        return -1
+
+    def latest(self, until: int = SLOTS - 1) -> int:
+        """Get the index of the last slot with an item until the given slot index regardless of its value, or -1 if none found."""
+        for idx in range(min(until, SLOTS - 1), -1, -1):
+            if self.rows[idx] >= 0:
+                return idx
+        return -1
+
+    def value(self, index: int, column: int = 0) -> float | None:
+        """Get the value of the slot index in the given column or None if not valid."""
+        if 0 <= index < SLOTS and column < len(self.columns):
+            return None if isnan(value := self.columns[column][index]) else value
+        return None
+
+    def text(self, index: int, column: int = 0, absolute: bool = False) -> str:
+        """Get the original value string of the slot index in the given column, without sign if absolute, or empty string if not valid."""
+        if self.value(index=index, column=column) is None:
+            return ""
+        text = str(self._values(self.items[self.rows[index]])[column])
+        return text.replace("-", "") if absolute else text
+
+
+class AnkerSolixIntradayCache:
+    """Define the class to cache the intraday 5 minute series of energy statistics per site, source and day.
+
+    Slots until the finalized slot of a series are kept, so a series is only queried again if new slots can be expected.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None) -> None:
+        """Initialize."""
+        self._series: dict[str, dict[tuple[str, str], dict]] = {}
+        # parsed columnar series by item list identity
+        self._columns: dict[int, tuple[list, IntradaySeries]] = {}
+        self._logger: logging.Logger = logger or _LOGGER
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __str__(self) -> str:
+        """Return the cache statistics as string."""
+        return f"{sum(len(s) for s in self._series.values())} intraday series cached, {self.hits} served, {self.misses} queried"
+
+    @staticmethod
+    def slot(time: datetime) -> str:
+        """Get the time of the 5 minute slot that contains the given time."""
+        return IntradaySeries.time(IntradaySeries.index(time))
+
+    def finalize(self, siteId: str, source: str, day: datetime, slot: str) -> None:
+        """Mark the cached series as finalized until the given slot time."""
+        if (
+            entry := (self._series.get(siteId) or {}).get(
+                (source, day.strftime("%Y-%m-%d"))
+            )
+        ) and slot > (entry.get("final") or ""):
+            entry["final"] = slot
+
+    def clear(self, siteId: str | None = None) -> None:
+        """Clear the cached series for all or the given site."""
+        if siteId:
+            self._series.pop(siteId, None)
+        else:
+            self._series = {}
+        self._columns = {}
+
+    def columns(self, items: list | None) -> IntradaySeries:
+        """Get the columnar series of the given item list and reuse the series if the list was parsed already."""
+        if (cached := self._columns.get(id(items))) and cached[0] is items:
+            return cached[1]
+        series = IntradaySeries(items)
+        if isinstance(items, list):
+            # keep only recent parsed series
+            if len(self._columns) >= 64:
+                self._columns.pop(next(iter(self._columns)))
+            self._columns[id(items)] = (items, series)
+        return series
+
+    async def series(
+        self,
+        fetch: Callable[[], Awaitable[dict]],
+        siteId: str,
+        source: str,
+        day: datetime,
+        until: str | None = None,
+    ) -> dict:
+        """Get the intraday statistics of the source and day from the cache if finalized until the given slot, otherwise fetch and merge them.
+
+        Without slot time, only complete days are served from the cache. A fetched series is finalized until the given slot time.
+        """
+        key = (source, day.strftime("%Y-%m-%d"))
+        entry = (self._series.get(siteId) or {}).get(key) or {}
+        if entry.get("final") and entry["final"] >= (until or LAST_SLOT):
+            self.hits += 1
+            self._logger.debug(
+                "Intraday cache serving %s series of site %s for %s finalized until %s",
+                source,
+                siteId,
+                key[1],
+                entry["final"],
+            )
+            return entry["data"]
+        self.misses += 1
+        data = await fetch()
+        if not isinstance(data, dict) or not data:
+            return entry.get("data") or {}
+        if cached := entry.get("data"):
+            final = entry.get("final") or ""
+            data = data | {
+                name: self._merge(cached.get(name), data.get(name), final)
+                for name in ["power", "chargeLevel"]
+                if isinstance(data.get(name), list)
+            }
+        self._series.setdefault(siteId, {})[key] = {
+            "data": data,
+            "final": max(until or "", entry.get("final") or ""),
+        }
+        # remove series of previous days that are no longer needed
+        if len(self._series[siteId]) > 16:
+            for old in sorted(self._series[siteId], key=lambda k: k[1])[:-16]:
+                self._series[siteId].pop(old, None)
+        return data
+
+    @staticmethod
+    def _merge(cached: list | None, new: list, final: str) -> list:
+        """Merge the new slots into the cached slots and keep finalized cached slots that are no longer valid in the new slots."""
+        if not final or not isinstance(cached, list):
+            return new
+        slots = {
+            item.get("time"): item
+            for item in cached
+            if isinstance(item, dict) and (item.get("time") or "24:00") <= final
+        }
+        return [
+            slots.get(item.get("time"), item)
+            if isinstance(item, dict)
+            and item.get("time") in slots
+            and not AnkerSolixIntradayCache._valid(item)
+            else item
+            for item in new
+        ]
+
+    @staticmethod
+    def _valid(item: dict) -> bool:
+        """Check if the slot item contains a valid value."""
+        if "powerInfos" in item:
+            return any(
+                info.get("valuePtr") is not None
+                for info in item.get("powerInfos") or []
+            )
+        return item.get("valuePtr") is not None
@@ -33,6 +33,8 @@ from .mqttcmdmap import (
     SolixMqttCommands,
 )
 from .mqttmap import SOLIXMQTTMAP
+from .mqttrecorder import AnkerSolixMqttRecorder
+from .mqttreplay import AnkerSolixMqttReplay
 from .mqtttypes import (
     DeviceHexData,
     DeviceHexDataField,
@@ -75,6 +77,10 @@ class AnkerSolixMqttSession:
         # Variable to exchange MID for connections
         self.mids: dict = {}
         self.testdir: str = self.apisession.testDir()
+        # Recorder for appending MQTT messages to files
+        self.recorder: AnkerSolixMqttRecorder = AnkerSolixMqttRecorder(
+            logger=self._logger
+        )
 
     def on_connect(
         self,
@@ -123,10 +129,17 @@ class AnkerSolixMqttSession:
         self, client: mqtt.Client, userdata: mqtt.Any, msg: mqtt.MQTTMessage
     ):
         """Define callback when a PUBLISH message is received from the server."""
-        # update mqtt stats
-        self.mqtt_stats.add_bytes(count=len(msg.payload))
         # default MQTT payload decode is UTF-8
-        message = json.loads(msg.payload.decode())
+        self.process_message(
+            topic=msg.topic,
+            message=json.loads(msg.payload.decode()),
+            size=len(msg.payload),
+        )
+
+    def process_message(self, topic: str, message: Any, size: int = 0) -> None:
+        """Process a decoded MQTT message object received on the given topic."""
+        # update mqtt stats
+        self.mqtt_stats.add_bytes(count=size)
         # Extract timestamp field from expected dictionary in message
         timestamp = datetime.fromtimestamp(
             (message.get("head") or {}).get("timestamp")
@@ -138,10 +151,10 @@ class AnkerSolixMqttSession:
         # Third party models not included in payload
         if not (model := payload.get("pn") if isinstance(payload, dict) else None):
             # extract model from received topic
-            model = (str(msg.topic).split("/")[2:3] or [None])[0]
+            model = (str(topic).split("/")[2:3] or [None])[0]
         if not (device_sn := payload.get("sn") if isinstance(payload, dict) else None):
             # extract sn from received topic
-            device_sn = (str(msg.topic).split("/")[3:4] or [None])[0]
+            device_sn = (str(topic).split("/")[3:4] or [None])[0]
         # hex data from devices use data fields, json strings from X1 use trans fields
         data = (
             (payload.get("data") or payload.get("trans"))
@@ -155,7 +168,7 @@ class AnkerSolixMqttSession:
             self.apisession.nickname,
             timestamp,
             message,
-            msg.topic,
+            topic,
         )
         extracted_values = {}
         # Update data stats
@@ -196,7 +209,7 @@ class AnkerSolixMqttSession:
                     # get existing mqtt data for device
                     device = self.mqtt_data.get(device_sn) or {}
                     topics = set(device.get("topics") or [])
-                    topics.add(msg.topic)
+                    topics.add(topic)
                     self.mqtt_data[device_sn] = (
                         device
                         | extracted_values
@@ -214,7 +227,7 @@ class AnkerSolixMqttSession:
         # call message callback if defined
         if callable(self._message_callback):
             self._message_callback(
-                self, msg.topic, message, data, model, device_sn, extracted_values
+                self, topic, message, data, model, device_sn, extracted_values
             )
 
     def on_disconnect(
@@ -596,6 +609,9 @@ class AnkerSolixMqttSession:
         self.subscriptions = set()
         self.triggered_devices = set()
         self._message_callback = None
+        # close the recorder and provide a new one if the session is reused
+        self.recorder.close()
+        self.recorder = AnkerSolixMqttRecorder(logger=self._logger)
         for filename in self._temp_cert_files:
             # remove file if existing
             if Path(filename).is_file():
@@ -620,7 +636,7 @@ class AnkerSolixMqttSession:
             deviceDict=deviceDict,
             hexbytes=self.get_command_data(
                 command=SolixMqttCommands.realtime_trigger,
-                parameters={"timeout": timeout},
+                parameters={"trigger_timeout_sec": timeout},
                 model=deviceDict.get("device_pn"),
             ),
         )[1]
@@ -750,7 +766,7 @@ class AnkerSolixMqttSession:
                                 },
                                 hexbytes=self.get_command_data(
                                     command=SolixMqttCommands.realtime_trigger,
-                                    parameters={"timeout": timeout},
+                                    parameters={"trigger_timeout_sec": timeout},
                                     model=pn,
                                 ),
                             )
@@ -805,6 +821,7 @@ class AnkerSolixMqttSession:
         """
         if not isinstance(folderdict, dict):
             return None
+        replay = AnkerSolixMqttReplay(logger=self._logger)
         try:
             # register message callback function
             if msg_callback and not self.message_callback(func=msg_callback):
@@ -817,7 +834,7 @@ class AnkerSolixMqttSession:
             # initialize MQTT statistics for file poller
             self.mqtt_stats = MqttDataStats()
             active_folder: str | None = None
-            timestamps = []
+            timestamps = replay.timestamps
             steps = None
             # merge initial speed options
             if (newspeed := folderdict.get("speed")) and isinstance(
@@ -830,7 +847,6 @@ class AnkerSolixMqttSession:
                 # Update active folder and reset msg cycle
                 if active_folder != folderdict.get("folder"):
                     active_folder = None
-                    active_msgs = {}
                     timestamps = []
                     time_idx = 0
                     duration = 0
@@ -838,24 +854,17 @@ class AnkerSolixMqttSession:
                     speedstart = 0
                     if folderdict:
                         active_folder = folderdict.get("folder")
-                        # create new cache for saved messages
+                        # build new index for saved messages
                         files = await self.get_mqtt_files(folder=active_folder or None)
-                        for file in files:
-                            for timestr, message in (
-                                await self.loadFromFile(filename=file)
-                            ).items():
-                                if (
-                                    timestamp := int(
-                                        datetime.fromisoformat(timestr).timestamp()
-                                    )
-                                    if timestr
-                                    else 0
-                                ):
-                                    active_msgs[timestamp] = (
-                                        active_msgs.get(timestamp) or []
-                                    ) + [message]
-                        # sort messages
-                        if timestamps := sorted(active_msgs.keys()):
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, replay.build, files
+                        )
+                        self._logger.debug(
+                            "Api %s MQTT session file poller indexed %s",
+                            self.apisession.nickname,
+                            replay,
+                        )
+                        if timestamps := replay.timestamps:
                             # get messages duration, 60 seconds at least for a cycle
                             duration = max(
                                 60, timestamps[len(timestamps) - 1] - timestamps[0]
@@ -891,7 +900,10 @@ class AnkerSolixMqttSession:
                         folderdict["ts_index"] = time_idx
                         folderdict["timestamp"] = timestamps[time_idx]
                         # simulate mqtt messages for timestamp
-                        for message in active_msgs.get(timestamps[time_idx]) or []:
+                        messages = await asyncio.get_running_loop().run_in_executor(
+                            None, replay.messages, time_idx
+                        )
+                        for message, size in messages:
                             self._logger.debug(
                                 "Api %s MQTT session loaded message from %s:\n%s",
                                 self.apisession.nickname,
@@ -900,20 +912,19 @@ class AnkerSolixMqttSession:
                                 ),
                                 message,
                             )
-                            # mock timestamp in message for subsequent cycles
-                            message = message.copy()
+                            # mock timestamp in message for subsequent cycles, messages are read freshly from file
                             if addtime > 0 and (
                                 timestamp := (message.get("head") or {}).get(
                                     "timestamp"
                                 )
                             ):
                                 message["head"]["timestamp"] = int(timestamp + addtime)
-                            # simulate MQTT message
-                            mqtt_msg = mqtt.MQTTMessage(
-                                topic=message.pop("topic", "").encode()
+                            # simulate MQTT message with decoded message object
+                            self.process_message(
+                                topic=str(message.pop("topic", "")),
+                                message=message,
+                                size=size,
                             )
-                            mqtt_msg.payload = json.dumps(message).encode()
-                            self.on_message(client=None, userdata=None, msg=mqtt_msg)
                         if steps:
                             time_idx += steps
                             steps = 0
@@ -953,9 +964,11 @@ class AnkerSolixMqttSession:
                 "Api %s MQTT session file poller was cancelled",
                 self.apisession.nickname,
             )
+        finally:
+            replay.close()
 
     async def get_mqtt_files(self, folder: str | Path) -> list:
-        """Get actual list of mqtt message files from provided folder."""
+        """Get actual list of mqtt message files from provided folder, compressed rotated files are skipped since they cannot be indexed for replay."""
         if isinstance(folder, str):
             folder = Path(folder)
         if isinstance(folder, Path) and folder.is_dir():
@@ -964,7 +977,9 @@ class AnkerSolixMqttSession:
             return [
                 (folder / f.name).absolute()
                 for f in contentlist
-                if f.is_file() and f.name.startswith("mqtt_msg_")
+                if f.is_file()
+                and f.name.startswith("mqtt_msg_")
+                and not f.name.endswith(".gz")
             ]
         return []
 
@@ -1002,14 +1017,23 @@ class AnkerSolixMqttSession:
     async def saveToFile(
         self, filename: str | Path, data: dict | None = None, append: bool = True
     ) -> bool:
-        """Save MQTT message to given file for testing."""
+        """Save MQTT message to given file for testing.
+
+        Appended messages are queued to the buffered recorder and True is returned once the message is queued, the recorder thread writes it to the file later.
+        """
         filename = str(filename)
         if not isinstance(data, dict):
             data = {}
+        if append:
+            if self.recorder.record(filename=filename, data=data):
+                self._logger.debug("Recorded MQTT message to file %s:", filename)
+                return True
+            self._logger.warning(
+                "Dropped MQTT message for file %s, recorder queue is full", filename
+            )
+            return False
         try:
-            async with aiofiles.open(
-                filename, "a" if append else "w", encoding="utf-8"
-            ) as file:
+            async with aiofiles.open(filename, "w", encoding="utf-8") as file:
                 # add message timestamp to data
                 await file.write(
                     json.dumps(
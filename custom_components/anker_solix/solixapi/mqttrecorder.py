@@ -0,0 +1,187 @@
+"""Anker Solix MQTT class to record MQTT messages with buffered writers into newline delimited JSON files."""
+
+from datetime import datetime
+import gzip
+import json
+import logging
+from pathlib import Path
+import queue
+import shutil
+import threading
+import time
+from typing import IO
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class AnkerSolixMqttRecorder:
+    """Define the class to record MQTT messages through one long lived buffered writer per file.
+
+    Messages are queued without blocking the caller and written by a background thread, which flushes the writers periodically.
+    Files are rotated by size or age if limits are given, rotated files can be compressed with gzip.
+    Messages are dropped and counted if the queue is full.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        flush_interval: float = 5.0,
+        max_bytes: int = 0,
+        max_age: float = 0,
+        compress: bool = False,
+        queue_size: int = 10000,
+    ) -> None:
+        """Initialize."""
+        self._logger: logging.Logger = logger or _LOGGER
+        self.flush_interval: float = max(0.1, flush_interval)
+        self.max_bytes: int = max(0, int(max_bytes))
+        self.max_age: float = max(0, max_age)
+        self.compress: bool = compress
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._writers: dict[str, dict] = {}
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._closed: bool = False
+        # cached message timestamp per second
+        self._second: int = 0
+        self._timestamp: str = ""
+        self.recorded: int = 0
+        self.dropped: int = 0
+        self.rotated: int = 0
+
+    def __str__(self) -> str:
+        """Return the recorder statistics as string."""
+        return f"{len(self._writers)} open files, {self.recorded} messages recorded, {self.dropped} dropped, {self.rotated} files rotated"
+
+    def record(self, filename: str | Path, data: dict | None = None) -> bool:
+        """Queue the message with timestamp for the given file and return whether it was accepted, messages are refused once the recorder is closed."""
+        if not isinstance(data, dict):
+            data = {}
+        if (second := int(time.time())) != self._second:
+            self._second = second
+            self._timestamp = datetime.fromtimestamp(second).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+        line = json.dumps({"msg_time": self._timestamp} | data)
+        with self._lock:
+            if self._closed:
+                return False
+            try:
+                self._queue.put_nowait((str(filename), line))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(
+                    target=self._run, name="anker_solix_mqtt_recorder", daemon=True
+                )
+                self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """Write all queued messages, close all files and stop the writer thread, further messages are refused."""
+        with self._lock:
+            self._closed = True
+            if self._thread and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join()
+            self._thread = None
+        # write messages that remained queued when the thread was stopped
+        self._drain()
+        for filename in list(self._writers):
+            self._close_writer(filename)
+
+    def _run(self) -> None:
+        """Write queued messages and flush the writers periodically until stopped."""
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                item = False
+            if item is None:
+                self._drain()
+                self._flush()
+                return
+            if item:
+                self._write(*item)
+            if time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _drain(self) -> None:
+        """Write all messages currently in the queue."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item:
+                self._write(*item)
+
+    def _write(self, filename: str, line: str) -> None:
+        """Write the line to the file writer and rotate the file if required."""
+        try:
+            if not (writer := self._writers.get(filename)):
+                Path(filename).parent.mkdir(parents=True, exist_ok=True)
+                writer = self._writers[filename] = {
+                    "file": open(filename, "a", encoding="utf-8"),
+                    "opened": time.monotonic(),
+                    "size": Path(filename).stat().st_size,
+                }
+            file: IO = writer["file"]
+            file.write(line + "\n")
+            writer["size"] += len(line) + 1
+            self.recorded += 1
+            if (self.max_bytes and writer["size"] >= self.max_bytes) or (
+                self.max_age and time.monotonic() - writer["opened"] >= self.max_age
+            ):
+                self._rotate(filename)
+        except OSError as err:
+            self._logger.error(
+                "ERROR: Failed to record MQTT message to file %s\n%s", filename, err
+            )
+            self._close_writer(filename)
+
+    def _flush(self) -> None:
+        """Flush all open writers."""
+        for filename, writer in list(self._writers.items()):
+            try:
+                writer["file"].flush()
+            except OSError as err:
+                self._logger.error(
+                    "ERROR: Failed to flush MQTT messages to file %s\n%s", filename, err
+                )
+                self._close_writer(filename)
+
+    def _close_writer(self, filename: str) -> None:
+        """Close and remove the writer of the file."""
+        if writer := self._writers.pop(filename, None):
+            try:
+                writer["file"].close()
+            except OSError as err:
+                self._logger.error(
+                    "ERROR: Failed to close MQTT message file %s\n%s", filename, err
+                )
+
+    def _rotate(self, filename: str) -> None:
+        """Close the file and rename it with timestamp, optionally compressed."""
+        self._close_writer(filename)
+        path = Path(filename)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = path.with_name(f"{path.stem}_{stamp}{path.suffix}")
+        # avoid overwriting files rotated within the same second
+        index = 0
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            index += 1
+            target = path.with_name(f"{path.stem}_{stamp}_{index}{path.suffix}")
+        path.rename(target)
+        if self.compress:
+            with (
+                open(target, "rb") as src,
+                gzip.open(target.with_name(target.name + ".gz"), "wb") as dst,
+            ):
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+        self.rotated += 1
+        self._logger.debug("Rotated MQTT message file %s to %s", filename, target)
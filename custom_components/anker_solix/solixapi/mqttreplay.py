@@ -0,0 +1,118 @@
+"""Anker Solix MQTT class to replay recorded MQTT message files through a timestamp index."""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+import heapq
+import json
+import logging
+from pathlib import Path
+import re
+from typing import IO
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# message time field as written first into each recorded message line
+MSG_TIME: re.Pattern = re.compile(rb'"msg_time":\s*"([^"]*)"')
+
+
+class AnkerSolixMqttReplay:
+    """Define the class to replay recorded MQTT message files without loading all messages into memory.
+
+    An index with the file offset of each message timestamp is built once per file, the timestamps of all files are merged lazily.
+    Only the messages of a replayed timestamp are read from the files, so any timestamp index can be replayed instantly.
+    The last message of a file per timestamp second is used, like for messages loaded from file.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None) -> None:
+        """Initialize."""
+        self._logger: logging.Logger = logger or _LOGGER
+        # index entries per file with sorted timestamps and the line offsets
+        self._files: list[tuple[Path, array, array]] = []
+        self._handles: dict[Path, IO] = {}
+        self.timestamps: array = array("q")
+
+    def __str__(self) -> str:
+        """Return the index statistics as string."""
+        return f"{len(self._files)} files, {len(self.timestamps)} timestamps, {sum(len(f[1]) for f in self._files)} messages indexed"
+
+    def __len__(self) -> int:
+        """Return the number of indexed timestamps."""
+        return len(self.timestamps)
+
+    def build(self, files: list[str | Path]) -> int:
+        """Build the index for the given files and return the number of indexed timestamps."""
+        self.close()
+        self._files = []
+        for file in files:
+            offsets: dict[int, int] = {}
+            try:
+                with Path(file).open("rb") as handle:
+                    offset = 0
+                    for line in handle:
+                        if (match := MSG_TIME.search(line)) and (
+                            timestamp := self._timestamp(match.group(1))
+                        ):
+                            # keep last message per timestamp of the file
+                            offsets[timestamp] = offset
+                        offset += len(line)
+            except OSError as err:
+                self._logger.error(
+                    "ERROR: Failed to index MQTT messages of file %s\n%s", file, err
+                )
+                continue
+            if offsets:
+                keys = sorted(offsets)
+                self._files.append(
+                    (
+                        Path(file),
+                        array("q", keys),
+                        array("q", [offsets[k] for k in keys]),
+                    )
+                )
+        # merge the sorted file timestamps without duplicates
+        self.timestamps = array("q")
+        for timestamp in heapq.merge(*(f[1] for f in self._files)):
+            if not self.timestamps or self.timestamps[-1] != timestamp:
+                self.timestamps.append(timestamp)
+        return len(self.timestamps)
+
+    def messages(self, index: int) -> list[tuple[dict, int]]:
+        """Read the messages and their sizes of the given timestamp index in file order."""
+        messages = []
+        if not 0 <= index < len(self.timestamps):
+            return messages
+        timestamp = self.timestamps[index]
+        for file, keys, offsets in self._files:
+            if (pos := bisect_left(keys, timestamp)) < len(keys) and keys[
+                pos
+            ] == timestamp:
+                try:
+                    if not (handle := self._handles.get(file)):
+                        handle = self._handles[file] = file.open("rb")
+                    handle.seek(offsets[pos])
+                    line = handle.readline()
+                    message = json.loads(line)
+                except (OSError, ValueError) as err:
+                    self._logger.error(
+                        "ERROR: Failed to load MQTT message from file %s\n%s", file, err
+                    )
+                    continue
+                if isinstance(message, dict):
+                    message.pop("msg_time", None)
+                    messages.append((message, len(line)))
+        return messages
+
+    def close(self) -> None:
+        """Close all open files."""
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+
+    @staticmethod
+    def _timestamp(value: bytes) -> int:
+        """Convert the message time to a timestamp or 0 if invalid."""
+        try:
+            return int(datetime.fromisoformat(value.decode()).timestamp())
+        except (UnicodeDecodeError, ValueError):
+            return 0
@@ -397,6 +397,9 @@ class DeviceHexDataField:
             fieldtype != DeviceHexDataTypes.strb.value
             and isinstance(fieldmap, dict)
             and (typ := fieldmap.get(TYPE))
+            and not (
+                fieldtype == DeviceHexDataTypes.bin.value and fieldmap.get(BYTES)
+            )
         ):
             fieldtype = (
                 typ
@@ -10,10 +10,12 @@ from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 from .apitypes import (
+    API_ENDPOINTS,
     PRODUCT_CODES,
     ApiCategories,
     SolarbankStatus,
     SolarbankUsageMode,
+    SolixDefaults,
     SolixDeviceType,
     SolixParmType,
     SolixPriceProvider,
@@ -159,10 +161,11 @@ async def poll_sites(  # noqa: C901
                 api._site_devices.add(sn)
             # Routines for hes site type to get site statistic object (no values in scene info response)
             if (site_type := mysite.get("site_type")) == SolixDeviceType.HES.value:
-                # initialize the HES Api if not done yet and link the account cache
+                # initialize the HES Api if not done yet and link the account cache and energy store
                 if not api.hesApi:
                     api.hesApi = AnkerSolixHesApi(apisession=api.apisession)
                     api.hesApi.account = api.account
+                    api.hesApi.energyStore = api.energyStore
                 # pass the site ID and site info to avoid another site list query and merge site data
                 await api.hesApi.update_sites(
                     siteId=myid,
@@ -188,11 +191,33 @@ async def poll_sites(  # noqa: C901
                     new_sites.update({myid: mysite})
             # Update scene info for other site types and extract values for device updates
             else:
+                # Stretch the scene info interval while realtime data of all site devices is covered by fresh MQTT data
+                mysite["mqtt_covered"] = _mqtt_covers_site(api=api, siteId=myid)
+                if (
+                    mysite["mqtt_covered"]
+                    and not siteId
+                    and (
+                        datetime.now()
+                        - datetime.strptime(
+                            mysite.get("scene_poll_time") or "1970-01-01 00:00:00",
+                            "%Y-%m-%d %H:%M:%S",
+                        )
+                    ).total_seconds()
+                    < SolixDefaults.MQTT_SCENE_INTERVAL
+                ):
+                    api._logger.debug(
+                        "Skipping api %s scene info for site since realtime data is covered by MQTT",
+                        api.apisession.nickname,
+                    )
+                    new_sites.update({myid: mysite})
+                    _retain_site_cache(api=api, siteId=myid, exclude=exclude)
+                    continue
                 api._logger.debug(
                     "Getting api %s scene info for site",
                     api.apisession.nickname,
                 )
                 scene = await api.get_scene_info(myid, fromFile=fromFile)
+                mysite["scene_poll_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 # Check if Solarbank 2 data is valid, default to true if field not found or no Solarbank in system
                 sb_info = scene.get("solarbank_info") or {}
                 data_valid = (
@@ -263,14 +288,37 @@ async def poll_sites(  # noqa: C901
                                 * round(round(offset.total_seconds()) / 1800),
                             }
                         )
+                # Skip consolidation of unchanged scene info that was already processed into the cache
+                if (
+                    not siteId
+                    and site_type != SolixDeviceType.POWERPANEL.value
+                    and api._payload_unchanged(
+                        "scene_info",
+                        myid,
+                        API_ENDPOINTS["scene_info"],
+                        {"site_id": myid},
+                    )
+                ):
+                    api._logger.debug(
+                        "Skipping api %s scene info consolidation for site since response is unchanged",
+                        api.apisession.nickname,
+                    )
+                    if sb_info.get("solarbank_list") and mysite.get("solarbank_info"):
+                        mysite["solarbank_info"]["updated_time"] = sb_info.get(
+                            "updated_time"
+                        )
+                    new_sites.update({myid: mysite})
+                    _retain_site_cache(api=api, siteId=myid, exclude=exclude)
+                    continue
                 # check if power panel site type to maintain statistic object which will be updated and replaced only during site details refresh
                 if site_type == SolixDeviceType.POWERPANEL.value:
-                    # initialize the powerpanel Api if not done yet and link account cache
+                    # initialize the powerpanel Api if not done yet and link account cache and energy store
                     if not api.powerpanelApi:
                         api.powerpanelApi = AnkerSolixPowerpanelApi(
                             apisession=api.apisession
                         )
                         api.powerpanelApi.account = api.account
+                        api.powerpanelApi.energyStore = api.energyStore
                     # keep previous statistics since it should not overwrite stats updated by power panel site details update
                     if "statistics" in mysite:
                         scene["statistics"] = mysite.get("statistics")
@@ -847,13 +895,13 @@ async def poll_sites(  # noqa: C901
     ]:
         await api.get_device_pv_status(devices=inverters, fromFile=fromFile)
     # update account dictionary with Api metrics
+    seconds = round((datetime.now() - start_time).total_seconds(), 3)
+    api.apisession.request_stats.add_phase("sites", seconds)
     api._update_account(
         {
             "use_files": fromFile,
             "sites_poll_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "sites_poll_seconds": round(
-                (datetime.now() - start_time).total_seconds(), 3
-            ),
+            "sites_poll_seconds": seconds,
         }
     )
     return api.sites
@@ -868,6 +916,7 @@ async def poll_site_details(
     To limit API requests, this update site details method should be called less frequently than update site method,
     and it updates just the nested site_details dictionary in the sites dictionary as well as the account dictionary
     """
+    start_time = datetime.now()
     # define excluded categories to skip for queries
     if not exclude or not isinstance(exclude, set):
         exclude = set()
@@ -876,7 +925,9 @@ async def poll_site_details(
         api.apisession.nickname,
     )
     # Fetch unread account messages and put into account dictionary
-    if {ApiCategories.account_info} - exclude:
+    if {ApiCategories.account_info} - exclude and api.consumers.is_needed(
+        "get_message_unread", api.apisession.email
+    ):
         api._logger.debug(
             "Getting api %s unread messages indicator",
             api.apisession.nickname,
@@ -916,13 +967,19 @@ async def poll_site_details(
                 "type"
             ) == SolixDeviceType.INVERTER.value:
                 # Fetch overall statistic totals that should not be excluded since merged to overall site cache
-                api._logger.debug(
-                    "Getting api %s PV total statistics for site",
-                    api.apisession.nickname,
-                )
-                await api.get_device_pv_total_statistics(
-                    deviceSn=deviceSn, fromFile=fromFile
-                )
+                # Skip only if no consumer needs any of the totals or limits
+                if api.consumers.is_needed(
+                    "get_device_pv_total_statistics", site_id
+                ) or api.consumers.is_needed(
+                    "get_device_pv_total_statistics", deviceSn
+                ):
+                    api._logger.debug(
+                        "Getting api %s PV total statistics for site",
+                        api.apisession.nickname,
+                    )
+                    await api.get_device_pv_total_statistics(
+                        deviceSn=deviceSn, fromFile=fromFile
+                    )
                 if {ApiCategories.site_price} - exclude:
                     api._logger.debug(
                         "Getting api %s PV price for site",
@@ -950,15 +1007,20 @@ async def poll_site_details(
                         api.apisession.nickname,
                     )
                     await api.get_power_limit(siteId=site_id, fromFile=fromFile)
-            # Fetch CO2 Ranking if not excluded
-            if not ({f"{site_type}_energy"} & exclude):
+            # Fetch CO2 Ranking if not excluded and needed
+            if not ({f"{site_type}_energy"} & exclude) and api.consumers.is_needed(
+                "get_co2_ranking", site_id
+            ):
                 api._logger.debug(
                     "Getting api %s CO2 ranking",
                     api.apisession.nickname,
                 )
                 await api.get_co2_ranking(siteId=site_id, fromFile=fromFile)
             # Fetch AI EMS runtime stats for sites supporting it
-            if site.get("power_site_type") in [12, 18]:
+            if site.get("power_site_type") in [
+                12,
+                18,
+            ] and api.consumers.is_needed("get_ai_ems_status", site_id):
                 api._logger.debug(
                     "Getting api %s AI EMS runtime",
                     api.apisession.nickname,
@@ -1008,8 +1070,18 @@ async def poll_site_details(
                             )
                         },
                     )
+    # site details may change consolidation results, ensure next scene info is consolidated again
+    api._processed.pop("scene_info", None)
     # update account dictionary with number of requests
-    api._update_account({"use_files": fromFile})
+    seconds = round((datetime.now() - start_time).total_seconds(), 3)
+    api.apisession.request_stats.add_phase("site_details", seconds)
+    api._update_account(
+        {
+            "use_files": fromFile,
+            "site_details_poll_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "site_details_poll_seconds": seconds,
+        }
+    )
     return api.sites
 
 
@@ -1136,7 +1208,7 @@ async def poll_device_details(  # noqa: C901
             and not site_id.startswith(SolixDeviceType.VIRTUAL.value)
         ):
             # Fetch site wifi list if not queried yet with wifi networks and signal strengths
-            if site_id not in site_wifi:
+            if site_id not in site_wifi and api.consumers.is_needed("wifi_list", sn):
                 api._logger.debug(
                     "Getting api %s wifi list of site for mapping to device",
                     api.apisession.nickname,
@@ -1281,11 +1353,14 @@ async def poll_device_details(  # noqa: C901
                 screensavers = api.account.get("screensaver") or {}
                 pn_themes = screensavers.get(pn, {})
                 active_id = device.get("mqtt_data", {}).get("theme_id")
-                # Fetch stock screensavers for model only once a day or theme_id not found previously
-                if pn_themes.get("poll_time", "").split(" ")[
-                    0
-                ] != datetime.now().strftime("%Y-%m-%d") or (
-                    active_id and active_id != device.get("display_theme", {}).get("id")
+                # Fetch stock screensavers for model only once a day or theme_id not found previously, if needed
+                if api.consumers.is_needed("charger_get_screensavers", sn) and (
+                    pn_themes.get("poll_time", "").split(" ")[0]
+                    != datetime.now().strftime("%Y-%m-%d")
+                    or (
+                        active_id
+                        and active_id != device.get("display_theme", {}).get("id")
+                    )
                 ):
                     ids = {}
                     # Flatten the categories into a theme id dictionary per model for id lookups:
@@ -1329,8 +1404,11 @@ async def poll_device_details(  # noqa: C901
                 await api.get_charger_custom_mode_list(deviceSn=sn, fromFile=fromFile)
                 # Fetch USB details if not excluded
                 if {ApiCategories.charger_usb_settings} - exclude:
-                    # Fetch port remarks
-                    await api.get_charger_port_remarks(deviceSn=sn, fromFile=fromFile)
+                    # Fetch port remarks if needed
+                    if api.consumers.is_needed("charger_get_port_remarks", sn):
+                        await api.get_charger_port_remarks(
+                            deviceSn=sn, fromFile=fromFile
+                        )
                     # Get protocol status
                     await api.get_charger_protocol_status(
                         deviceSn=sn, fromFile=fromFile
@@ -1348,14 +1426,16 @@ async def poll_device_details(  # noqa: C901
         api.devices.update({sn: device})
         api.notify_device(deviceSn=sn)
 
+    # device details may change consolidation results, ensure next scene info is consolidated again
+    api._processed.pop("scene_info", None)
     # update account dictionary with number of requests
+    seconds = round((datetime.now() - start_time).total_seconds(), 3)
+    api.apisession.request_stats.add_phase("device_details", seconds)
     api._update_account(
         {
             "use_files": fromFile,
             "details_poll_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "details_poll_seconds": round(
-                (datetime.now() - start_time).total_seconds(), 3
-            ),
+            "details_poll_seconds": seconds,
         }
     )
     return api.devices
@@ -1728,13 +1808,59 @@ async def poll_device_energy(  # noqa: C901
                 await api.refresh_pv_forecast(siteId=site_id, fromFile=fromFile)
 
     # update account dictionary with number of requests
+    seconds = round((datetime.now() - start_time).total_seconds(), 3)
+    api.apisession.request_stats.add_phase("energy", seconds)
     api._update_account(
         {
             "use_files": fromFile,
             "energy_poll_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "energy_poll_seconds": round(
-                (datetime.now() - start_time).total_seconds(), 3
-            ),
+            "energy_poll_seconds": seconds,
         }
     )
     return api.sites
+
+
+def _mqtt_covers_site(api: AnkerSolixApi, siteId: str) -> bool:
+    """Check whether realtime data of all site devices is overlaid by fresh MQTT data."""
+    if not (api.mqttsession and api.mqttsession.is_connected()):
+        return False
+    if not (
+        devices := [
+            (sn, dev) for sn, dev in api.devices.items() if dev.get("site_id") == siteId
+        ]
+    ):
+        return False
+    fresh = (
+        datetime.now() - timedelta(seconds=SolixDefaults.MQTT_FRESH_SECONDS)
+    ).strftime("%Y-%m-%d %H:%M:%S")
+    for sn, dev in devices:
+        mqtt = (
+            api.mqttsession.mqtt_data.get(sn)
+            or api.mqttsession.mqtt_data.get(dev.get("embedded_sn"))
+            or {}
+        )
+        if not dev.get("mqtt_overlay") or (mqtt.get("last_message") or "") < fresh:
+            return False
+    return True
+
+
+def _retain_site_cache(api: AnkerSolixApi, siteId: str, exclude: set) -> None:
+    """Maintain cached site and device data that change over time while the scene info consolidation is skipped."""
+    for sn, dev in [
+        (sn, dev) for sn, dev in api.devices.items() if dev.get("site_id") == siteId
+    ]:
+        api._site_devices.add(sn)
+        # as time progressed, update actual schedule slot presets from a cached schedule if available
+        if schedule := dev.get("schedule"):
+            api._update_dev(
+                {
+                    "device_sn": sn,
+                    "schedule": schedule,
+                    "retain_load": True,  # only a flag to indicate the actual schedule preset updates don't need to update site appliance load
+                }
+            )
+    # Extract actual dynamic price and forecast from cache since they change over time
+    if {ApiCategories.site_price} - exclude:
+        if dp := api.extractPriceData(siteId=siteId):
+            api._update_site(siteId=siteId, details={"dynamic_price_details": dp})
+    api.extractSolarForecast(siteId=siteId)
@@ -3,6 +3,7 @@
 
 import contextlib
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 from pathlib import Path
 
@@ -15,12 +16,12 @@ from .apitypes import (
     PRODUCT_CODES,
     ApiCategories,
     SolixDeviceCapacity,
-    SolixDeviceCategory,
-    SolixDeviceStatus,
     SolixDeviceType,
     SolixSiteType,
 )
+from .device import POWERPANEL_KEY_HANDLERS
 from .helpers import convertToKwh, get_solix_product_code
+from .intraday import IntradaySeries
 from .session import AnkerSolixClientSession
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
@@ -79,7 +80,8 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
         """Update the internal device details dictionary with the given data. The device_sn key must be set in the data dict for the update to be applied.
 
         This method should be implemented to consolidate various device related key values from various requests under a common set of device keys.
-        The device SN should be returned if found in devData and an update was done
+        The device SN should be returned if found in devData and an update was done.
+        The key specific consolidation is dispatched to the handlers registered in POWERPANEL_KEY_HANDLERS.
         """
 
         if sn := devData.pop("device_sn", None):
@@ -103,186 +105,115 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
                 if value := devData.get("owner_user_id"):
                     device["owner_user_id"] = value
             calc_capacity = False  # Flag whether capacity may need recalculation
-            update_main = False  # Flag whether main_sn must be updated for sub devices
             site_id = device.get("site_id", "")
+            old_main_sn = device.get("main_sn")
             for key, value in devData.items():
+                # dispatch only keys with registered handler
+                if not (handler := POWERPANEL_KEY_HANDLERS.get(key)):
+                    continue
                 try:
-                    # Implement device update code with key filtering, conversion, consolidation, calculation or dependency updates
-                    if key in ["product_code", "device_pn"] and value:
-                        device.update({"device_pn": str(value)})
-                        # try to get capacity from category definitions
-                        if (
-                            hasattr(SolixDeviceCapacity, str(value))
-                            and "battery_capacity" not in device
-                        ):
-                            # get battery capacity from known PNs
-                            device["battery_capacity"] = str(
-                                getattr(SolixDeviceCapacity, str(value))
-                            )
-                            calc_capacity = True
-                        # try to get type for standalone device from category definitions if not defined yet
-                        if (
-                            hasattr(SolixDeviceCategory, str(value))
-                            and "type" not in device
-                        ):
-                            dev_type = str(
-                                getattr(SolixDeviceCategory, str(value))
-                            ).split("_")
-                            if dev_type[-1].isdigit():
-                                gen = int(dev_type.pop(-1))
-                            else:
-                                gen = None
-                            device["type"] = "_".join(dev_type)
-                            # update generation if specified in device type definitions
-                            if gen:
-                                device["generation"] = gen
-                        # Update main and sub device structure
-                        if site_id and (t := device.get("type")):
-                            if t == SolixDeviceType.PPS.value:
-                                device["is_subdevice"] = True
-                            elif (t == SolixDeviceType.POWERPANEL.value) and device.get(
-                                "main_sn"
-                            ) != sn:
-                                device["main_sn"] = sn
-                                device["is_primary"] = True
-                                update_main = True
-                    elif key == "alias_name" and value:
-                        device.update({"alias": str(value)})
-                    elif key == "status":
-                        device.update({"status": str(value)})
-                        # decode the status into a description
-                        description = SolixDeviceStatus.unknown.name
-                        for status in SolixDeviceStatus:
-                            if str(value) == status.value:
-                                description = status.name
-                                break
-                        device.update({"status_desc": description})
-                    elif key == "battery_capacity" and str(value).isdigit():
-                        # This is used as trigger for customization to recalculate modified capacity dependent values
-                        device[key] = value
+                    if handler(self, device, key, value, devData):
                         calc_capacity = True
-                    elif key == "average_power" and value:
-                        # calculate remaining capacity for new SOC
-                        calc_capacity |= (device.get("average_power") or {}).get(
-                            "state_of_charge"
-                        ) != value.get("state_of_charge")
-                        device[key] = value
-                    elif key == "batCount" and str(value).isdigit():
-                        calc_capacity |= device.get(key) != int(value)
-                        device[key] = int(value)
-                    # Examples for boolean key values
-                    elif key == "auto_upgrade":
-                        device[key] = bool(value)
-                    # key with string values
-                    elif key == "wireless_type" or (
-                        # Example for keys with string values that should only be updated if value returned
-                        key in ["wifi_name", "rssi"] and value
-                    ):
-                        device.update({key: str(value)})
-                    elif key == "utility_rate_plan":
-                        device[key] = value
-                        # TODO: Add code to extract active slot parameters from plan
-
-                    # check that main device is defined for all sub devices
-                    if update_main or (
-                        device.get("is_subdevice") and not device.get("main_sn")
-                    ):
-                        site_devs = [
-                            d
-                            for d in self.devices.values()
-                            if site_id == d.get("site_id")
-                        ]
-                        if main_sn := (
-                            [d for d in site_devs if d.get("is_primary")] or [{}]
-                        )[0].get("main_sn"):
-                            for dev in [d for d in site_devs if d.get("is_subdevice")]:
-                                dev["main_sn"] = main_sn
-                    # generate extra values when certain conditions are met
-                    if calc_capacity:
-                        # init calculated fields with 0 if not existing
-                        if "battery_capacity" not in device:
-                            device["battery_capacity"] = "0"
-                        # generate battery values for main device only when soc updated or PPS capacity triggered
-                        is_primary = bool(device.get("is_primary"))
-                        if (
-                            not (cap := device.get("battery_capacity")) or calc_capacity
-                        ) and is_primary:
-                            # refresh (customized) capacity of sub devices in system
-                            cap = 0
-                            for dev in [
-                                d
-                                for d in self.devices.values()
-                                if d.get("main_sn") == sn
-                                and d.get("is_subdevice")
-                                and str(d.get("battery_capacity")).isdigit()
-                            ]:
-                                # consider customized capacity for calculation
-                                cap += (
-                                    int(c)
-                                    if (
-                                        c := (dev.get("customized") or {}).get(
-                                            "battery_capacity"
-                                        )
-                                    )
-                                    and str(c).isdigit()
-                                    else int(dev.get("battery_capacity"))
+                except Exception as err:  # pylint: disable=broad-exception-caught  # noqa: BLE001
+                    self._logger.error(
+                        "Api %s error %s occurred when updating device details for key %s with value %s: %s",
+                        self.apisession.nickname,
+                        type(err),
+                        key,
+                        value,
+                        err,
+                    )
+
+            # Update main and sub device structure when PN was provided
+            if (
+                site_id
+                and (devData.get("product_code") or devData.get("device_pn"))
+                and (t := device.get("type"))
+            ):
+                if t == SolixDeviceType.PPS.value:
+                    device["is_subdevice"] = True
+                elif t == SolixDeviceType.POWERPANEL.value:
+                    device["main_sn"] = sn
+                    device["is_primary"] = True
+            site_devs = [
+                d for d in self.devices.values() if site_id == d.get("site_id")
+            ]
+            prim_dev = next((d for d in site_devs if d.get("is_primary")), {})
+            # check that main device is defined for all sub devices
+            if (
+                device.get("main_sn") != old_main_sn
+                or (device.get("is_subdevice") and not device.get("main_sn"))
+            ) and (main_sn := prim_dev.get("main_sn")):
+                for dev in [d for d in site_devs if d.get("is_subdevice")]:
+                    dev["main_sn"] = main_sn
+            # generate extra values when certain conditions are met
+            if calc_capacity:
+                # init calculated fields with 0 if not existing
+                if "battery_capacity" not in device:
+                    device["battery_capacity"] = "0"
+                # generate battery values for main device only when soc updated or PPS capacity triggered
+                is_primary = bool(device.get("is_primary"))
+                cap = device.get("battery_capacity")
+                if is_primary:
+                    # refresh (customized) capacity of sub devices in system
+                    cap = 0
+                    for dev in [
+                        d
+                        for d in self.devices.values()
+                        if d.get("main_sn") == sn
+                        and d.get("is_subdevice")
+                        and str(d.get("battery_capacity")).isdigit()
+                    ]:
+                        # consider customized capacity for calculation
+                        cap += (
+                            int(c)
+                            if (
+                                c := (dev.get("customized") or {}).get(
+                                    "battery_capacity"
                                 )
-                            if cap == 0:
-                                # add 1 F3800 base capacity as minimum if no PPS found with site relation
-                                cap = SolixDeviceCapacity.A1790
-                        device["battery_capacity"] = str(cap)
-                        soc = (
-                            devData.get("battery_soc")
-                            or devData.get("average_power", {}).get("state_of_charge")
-                            or device.get("battery_soc")
-                            or device.get("average_power", {}).get("state_of_charge")
+                            )
+                            and str(c).isdigit()
+                            else int(dev.get("battery_capacity"))
                         )
+                    if cap == 0:
+                        # add 1 F3800 base capacity as minimum if no PPS found with site relation
+                        cap = SolixDeviceCapacity.A1790
+                device["battery_capacity"] = str(cap)
+                soc = (
+                    devData.get("battery_soc")
+                    or devData.get("average_power", {}).get("state_of_charge")
+                    or device.get("battery_soc")
+                    or device.get("average_power", {}).get("state_of_charge")
+                )
+                if soc and str(soc).isdigit():
+                    custom_cap = (
+                        int(c)
+                        if (c := device.get("customized", {}).get("battery_capacity"))
+                        and str(c).isdigit()
+                        else int(device.get("battery_capacity", 0))
+                    )
+                    device["battery_energy"] = str(
+                        int(int(custom_cap) * int(soc) / 100)
+                    )
+                # get primary device to update energy values as well
+                if not is_primary:
+                    soc = prim_dev.get("battery_soc") or prim_dev.get(
+                        "average_power", {}
+                    ).get("state_of_charge")
+                    if soc and str(soc).isdigit():
                         custom_cap = (
                             int(c)
                             if (
-                                c := device.get("customized", {}).get(
+                                c := prim_dev.get("customized", {}).get(
                                     "battery_capacity"
                                 )
                             )
                             and str(c).isdigit()
-                            else int(device.get("battery_capacity", 0))
+                            else int(prim_dev.get("battery_capacity", 0))
                         )
-                        device["battery_energy"] = str(
+                        prim_dev["battery_energy"] = str(
                             int(int(custom_cap) * int(soc) / 100)
                         )
-                        # get primary device to update energy values as well
-                        if not is_primary:
-                            prim_dev = (
-                                [d for d in site_devs if d.get("is_primary")] or [{}]
-                            )[0]
-                            soc = prim_dev.get("battery_soc") or prim_dev.get(
-                                "average_power", {}
-                            ).get("state_of_charge")
-                            if soc and str(soc).isdigit():
-                                custom_cap = (
-                                    int(c)
-                                    if (
-                                        c := prim_dev.get("customized", {}).get(
-                                            "battery_capacity"
-                                        )
-                                    )
-                                    and str(c).isdigit()
-                                    else int(prim_dev.get("battery_capacity", 0))
-                                )
-                                prim_dev["battery_energy"] = str(
-                                    int(int(custom_cap) * int(soc) / 100)
-                                )
-                        calc_capacity = False
-
-                except Exception as err:  # pylint: disable=broad-exception-caught  # noqa: BLE001
-                    self._logger.error(
-                        "Api %s error %s occurred when updating device details for key %s with value %s: %s",
-                        self.apisession.nickname,
-                        type(err),
-                        key,
-                        value,
-                        err,
-                    )
 
             self.devices.update({str(sn): device})
         return sn
@@ -786,28 +717,40 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
                                 )
                             ).get("data") or {}
                         else:
-                            data = await self.energy_statistics(
+                            # use cached series for complete days
+                            data = await self.intradayCache.series(
+                                partial(
+                                    self.energy_statistics,
+                                    siteId=siteId,
+                                    rangeType="day",
+                                    sourceType=source,
+                                    startDay=checkdate,
+                                    endDay=checkdate,
+                                ),
                                 siteId=siteId,
-                                rangeType="day",
-                                sourceType=source,
-                                startDay=checkdate,
-                                endDay=checkdate,
+                                source=source,
+                                day=checkdate,
                             )
-                        # generate list of SOC timestamps different from 0 and pick last one
-                        if soclist := [
-                            item
-                            for item in (data.get("chargeLevel") or [])
-                            if (item.get("value") or "0") != "0"
-                        ]:
-                            if soclist[-1].get("time"):
-                                last = datetime.strptime(
-                                    checkdate.strftime("%Y-%m-%d")
-                                    + soclist[-1].get("time"),
-                                    "%Y-%m-%d%H:%M",
-                                )
-                                future: datetime = last + timedelta(minutes=5)
-                                validdata = data
-                                break
+                        # find last SOC slot different from 0
+                        if (
+                            idx := self.intradayCache.columns(
+                                data.get("chargeLevel")
+                            ).last(nonzero=True)
+                        ) >= 0:
+                            last = datetime.strptime(
+                                checkdate.strftime("%Y-%m-%d")
+                                + IntradaySeries.time(idx),
+                                "%Y-%m-%d%H:%M",
+                            )
+                            future: datetime = last + timedelta(minutes=5)
+                            validdata = data
+                            self.intradayCache.finalize(
+                                siteId=siteId,
+                                source=source,
+                                day=checkdate,
+                                slot=IntradaySeries.time(idx),
+                            )
+                            break
                     # get min offset to first invalid timestamp to find best check time (smallest delay after new value from cloud)
                     if future:
                         offset = min(
@@ -843,18 +786,28 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
                         )
                     ).get("data") or {}
                 else:
+                    # query only if the cached series is not finalized until the valid time slot
                     self._logger.debug(
-                        "Querying api %s %s data of %s",
+                        "Getting api %s %s data of %s",
                         self.apisession.nickname,
                         source,
                         validtime.strftime("%Y-%m-%d"),
                     )
-                    data = await self.energy_statistics(
+                    data = await self.intradayCache.series(
+                        partial(
+                            self.energy_statistics,
+                            siteId=siteId,
+                            rangeType="day",
+                            sourceType=source,
+                            startDay=validtime,
+                            endDay=validtime,
+                        ),
                         siteId=siteId,
-                        rangeType="day",
-                        sourceType=source,
-                        startDay=validtime,
-                        endDay=validtime,
+                        source=source,
+                        day=validtime,
+                        until=self.intradayCache.slot(validtime)
+                        if offset.total_seconds() != 0
+                        else None,
                     )
                 # set last check time more into past to ensure each run verifies until offset no longer increases
                 if (
@@ -880,63 +833,37 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
                 if unit := data.get("powerUnit"):
                     avg_data["power_unit"] = str(unit).lower().replace("w", "W")
                 # extract power values only if offset to last valid SOC entry was found
-                if offset.total_seconds() != 0 and (
-                    powerlist := [
-                        item
-                        for item in (data.get("power") or [])
-                        if (item.get("time") or "24:00") <= validtime.strftime("%H:%M")
-                    ]
+                power = self.intradayCache.columns(data.get("power"))
+                if (
+                    offset.total_seconds() != 0
+                    and (idx := power.latest(until=IntradaySeries.index(validtime)))
+                    >= 0
                 ):
                     entry["date"] = validtime.strftime("%Y-%m-%d")
                     if source == "hes":
-                        for idx, power in enumerate(
-                            powerlist[-1].get("powerInfos") or [], start=1
-                        ):
-                            if idx == 1:
-                                avg_data["charge_power_avg"] = str(
-                                    power.get("value") or ""
-                                ).replace("-", "")
-                            else:
-                                avg_data["discharge_power_avg"] = str(
-                                    power.get("value") or ""
-                                ).replace("-", "")
-                        if soclist := [
-                            item
-                            for item in (data.get("chargeLevel") or [])
-                            if (item.get("time") or "24:00")
-                            <= validtime.strftime("%H:%M")
-                        ]:
-                            avg_data["state_of_charge"] = soclist[-1].get("value") or ""
+                        # first element is charge power and second element discharge power
+                        avg_data["charge_power_avg"] = power.text(idx, absolute=True)
+                        if len(power.columns) > 1:
+                            avg_data["discharge_power_avg"] = power.text(
+                                idx, column=1, absolute=True
+                            )
+                        soc = self.intradayCache.columns(data.get("chargeLevel"))
+                        if (
+                            socidx := soc.latest(until=IntradaySeries.index(validtime))
+                        ) >= 0:
+                            avg_data["state_of_charge"] = soc.text(socidx)
                         # get todays totals from data to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "solar":
-                        avg_data["solar_power_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["solar_power_avg"] = power.text(idx)
                         # get todays totals from data to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "home":
-                        avg_data["home_usage_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["home_usage_avg"] = power.text(idx)
                         # get todays totals from data to avoid redundant daily query for today
                         entry.update(self.extract_energy(source=source, data=data))
                     elif source == "grid":
-                        avg_data["grid_import_avg"] = (
-                            next(
-                                iter(powerlist[-1].get("powerInfos") or []),
-                                {},
-                            ).get("value")
-                            or ""
-                        )
+                        avg_data["grid_import_avg"] = power.text(idx)
                         # Grid export data is not provided for daily queries.
                         # Calculate delta from last export total
                         avg_data["grid_export_avg"] = ""
@@ -1077,6 +1004,7 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
         devTypes: set | None = None,
         fromFile: bool = False,
         showProgress: bool = False,
+        useStore: bool = True,
     ) -> dict:
         """Fetch daily Energy data for given interval and provide it in a table format dictionary.
 
@@ -1085,7 +1013,22 @@ class AnkerSolixPowerpanelApi(AnkerSolixBaseApi):
         Example:
         {"2023-09-29": {"date": "2023-09-29", "solar_production": "1.21", "battery_discharge": "0.47", "battery_charge": "0.56"},
         "2023-09-30": {"date": "2023-09-30", "solar_production": "3.07", "battery_discharge": "1.06", "battery_charge": "1.39"}}
+        Final days are served from the local energy store if used, only missing or mutable days are queried.
         """
+        if self.energyStore and useStore and not fromFile:
+            return await self.energyStore.energy_daily(
+                fetch=partial(self.energy_daily, useStore=False),
+                scope=self.energyStore.scope(
+                    "powerpanel_energy_daily", dayTotals=dayTotals, devTypes=devTypes
+                ),
+                siteId=siteId,
+                startDay=startDay,
+                numDays=numDays,
+                tzOffset=(self.sites.get(siteId) or {}).get("energy_offset_tz") or 0,
+                dayTotals=dayTotals,
+                devTypes=devTypes,
+                showProgress=showProgress,
+            )
         table = {}
         if not devTypes or not isinstance(devTypes, set):
             devTypes = set()
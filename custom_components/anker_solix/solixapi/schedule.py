@@ -657,6 +657,7 @@ async def set_home_load(  # noqa: C901
     # obtain actual device schedule from internal dict or fetch via api
     if not isinstance(test_schedule, dict):
         test_schedule = None
+    old_schedule = None
     if test_schedule:
         schedule = test_schedule
     elif not (schedule := (self.devices.get(deviceSn) or {}).get("schedule") or {}):
@@ -665,6 +666,8 @@ async def set_home_load(  # noqa: C901
                 siteId=siteId, deviceSn=deviceSn, fromFile=toFile
             )
         ).get("home_load_data") or {}
+        # keep a copy of the schedule just queried to skip unchanged updates, a cached schedule may be outdated
+        old_schedule = copy.deepcopy(schedule)
     ranges = schedule.get("ranges") or []
     # get appliance load name from first existing slot to avoid mixture
     # NOTE: The solarbank may behave weird if a mixture is found or the name does not match with some internal settings
@@ -1446,6 +1449,11 @@ async def set_home_load(  # noqa: C901
             deviceSn=deviceSn,
         )
         return schedule
+    if old_schedule is not None and schedule == old_schedule:
+        self._logger.debug(
+            "Api %s schedule unchanged, skipping update", self.apisession.nickname
+        )
+        return schedule
     # Make the Api call with final schedule and return result, the set call will also update api dict
     # NOTE: set_device_load does not seem to be usable yet for changing the home load, or is only usable in dual bank setups for changing the appliance load share as well?
     return await self.set_device_parm(
@@ -1537,6 +1545,7 @@ async def set_sb2_home_load(  # noqa: C901
     # obtain actual device schedule from internal dict or fetch via api
     if not isinstance(test_schedule, dict):
         test_schedule = None
+    old_schedule = None
     if test_schedule:
         schedule = test_schedule
     elif not (schedule := (self.devices.get(deviceSn) or {}).get("schedule") or {}):
@@ -1548,6 +1557,8 @@ async def set_sb2_home_load(  # noqa: C901
                 fromFile=toFile,
             )
         ).get("param_data") or {}
+        # keep a copy of the schedule just queried to skip unchanged updates, a cached schedule may be outdated
+        old_schedule = copy.deepcopy(schedule)
 
     # get appliance limits
     if (min_load := str(schedule.get("min_load"))).isdigit():
@@ -2099,14 +2110,20 @@ async def set_sb2_home_load(  # noqa: C901
                 or [],
             }
         )
-    # Make the Api call with the schedule subset to be applied and return result, the set call will also re-read full schedule and update api dict
-    resp = await self.set_device_parm(
-        siteId=siteId,
-        paramType=SolixParmType.SOLARBANK_2_SCHEDULE.value,
-        paramData=schedule if toFile else new_schedule,
-        deviceSn=deviceSn,
-        toFile=toFile,
-    )
+    if old_schedule is not None and schedule == old_schedule:
+        self._logger.debug(
+            "Api %s schedule unchanged, skipping update", self.apisession.nickname
+        )
+        resp = schedule
+    else:
+        # Make the Api call with the schedule subset to be applied and return result, the set call will also re-read full schedule and update api dict
+        resp = await self.set_device_parm(
+            siteId=siteId,
+            paramType=SolixParmType.SOLARBANK_2_SCHEDULE.value,
+            paramData=schedule if toFile else new_schedule,
+            deviceSn=deviceSn,
+            toFile=toFile,
+        )
     # Make also the price type change if required by usage mode change
     # The mobile App only activates use_time price automatically with use_time mode, but may not toggle back to fixed price automatically
     price_type = ((self.sites.get(siteId) or {}).get("site_details") or {}).get(
@@ -2197,6 +2214,7 @@ async def set_sb2_ac_charge(
     # obtain actual device schedule from internal dict or fetch via api
     if not isinstance(test_schedule, dict):
         test_schedule = None
+    old_schedule = None
     if test_schedule:
         schedule = test_schedule
     elif not (schedule := (self.devices.get(deviceSn) or {}).get("schedule") or {}):
@@ -2208,6 +2226,8 @@ async def set_sb2_ac_charge(
                 fromFile=toFile,
             )
         ).get("param_data") or {}
+        # keep a copy of the schedule just queried to skip unchanged updates, a cached schedule may be outdated
+        old_schedule = copy.deepcopy(schedule)
 
     rate_plan_name = SolarbankRatePlan.backup
     # Consider time zone shifts of device, timestamp conversion is absolute and timezone aware
@@ -2286,6 +2306,11 @@ async def set_sb2_ac_charge(
                 or [],
             }
         )
+    if old_schedule is not None and schedule == old_schedule:
+        self._logger.debug(
+            "Api %s schedule unchanged, skipping update", self.apisession.nickname
+        )
+        return schedule
     # Make the Api call with the schedule subset to be applied and return result, the set call will also re-read full schedule and update api dict
     return await self.set_device_parm(
         siteId=siteId,
@@ -2600,6 +2625,7 @@ async def set_sb2_use_time(  # noqa: C901
     # obtain actual device schedule from internal dict or fetch via api
     if not isinstance(test_schedule, dict):
         test_schedule = None
+    old_schedule = None
     if test_schedule:
         schedule = test_schedule
     elif not (schedule := (self.devices.get(deviceSn) or {}).get("schedule") or {}):
@@ -2611,6 +2637,8 @@ async def set_sb2_use_time(  # noqa: C901
                 fromFile=toFile,
             )
         ).get("param_data") or {}
+        # keep a copy of the schedule just queried to skip unchanged updates, a cached schedule may be outdated
+        old_schedule = copy.deepcopy(schedule)
 
     rate_plan_name = SolarbankRatePlan.use_time
     new_ranges = []
@@ -3052,14 +3080,20 @@ async def set_sb2_use_time(  # noqa: C901
                 or [],
             }
         )
-    # Make the Api call with the schedule subset to be applied and return result, the set call will also re-read full schedule and update api dict
-    resp = await self.set_device_parm(
-        siteId=siteId,
-        paramType=SolixParmType.SOLARBANK_2_SCHEDULE.value,
-        paramData=schedule if toFile else new_schedule,
-        deviceSn=deviceSn,
-        toFile=toFile,
-    )
+    if old_schedule is not None and schedule == old_schedule:
+        self._logger.debug(
+            "Api %s schedule unchanged, skipping update", self.apisession.nickname
+        )
+        resp = schedule
+    else:
+        # Make the Api call with the schedule subset to be applied and return result, the set call will also re-read full schedule and update api dict
+        resp = await self.set_device_parm(
+            siteId=siteId,
+            paramType=SolixParmType.SOLARBANK_2_SCHEDULE.value,
+            paramData=schedule if toFile else new_schedule,
+            deviceSn=deviceSn,
+            toFile=toFile,
+        )
     # Make also the price type change if required by usage mode change
     # The mobile App only activates use_time price automatically with use_time mode, but may not toggle back to fixed price automatically
     price_type = ((self.sites.get(siteId) or {}).get("site_details") or {}).get(
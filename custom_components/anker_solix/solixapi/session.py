@@ -1,8 +1,19 @@
 """Anker Power/Solix Cloud API class to handle a client connection session for an account."""
 
-from asyncio import sleep
+from asyncio import (
+    CancelledError,
+    Future,
+    Lock,
+    current_task,
+    get_running_loop,
+    shield,
+    sleep,
+)
 from base64 import b64decode, b64encode
+from collections import deque
+from collections.abc import AsyncIterator
 import contextlib
+from copy import deepcopy
 from datetime import datetime
 
 # TODO(COMPRESSION): from gzip import compress, decompress
@@ -13,6 +24,7 @@ import os
 from pathlib import Path
 from random import randbytes, randrange
 import tempfile
+from time import monotonic
 from types import SimpleNamespace
 from typing import Any
 
@@ -36,7 +48,13 @@ from .apitypes import (
     API_SERVERS,
     SolixDefaults,
 )
-from .helpers import RequestCounter, generateTimestamp, getTimezoneGMTString, md5
+from .helpers import (
+    RequestCounter,
+    RequestStats,
+    generateTimestamp,
+    getTimezoneGMTString,
+    md5,
+)
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -94,8 +112,17 @@ class AnkerSolixClientSession:
         self._request_delay: float = SolixDefaults.REQUEST_DELAY_DEF
         self._request_timeout: int = SolixDefaults.REQUEST_TIMEOUT_DEF
         self._last_request_time: datetime | None = None
+        # serialize the request delay and throttle decisions of concurrent requests
+        self._delay_lock: Lock = Lock()
         # define limit of same endpoint requests per minute
         self._endpoint_limit: int = SolixDefaults.ENDPOINT_LIMIT_DEF
+        # single flight futures of active read requests with number of sharing requests, and recent reads for freshness window
+        self._request_freshness: float = SolixDefaults.REQUEST_FRESHNESS_DEF
+        self._inflight: dict[tuple, Future] = {}
+        self._shared: dict[tuple, int] = {}
+        self._recent: dict[tuple, tuple[float, dict | None]] = {}
+        # content hash of last response per endpoint and request body for change detection
+        self._fingerprints: dict[tuple[str, str], str] = {}
 
         # Define authentication Encryption for password, using ECDH asymmetric key exchange for shared secret calculation, which must be used to encrypt the password using AES-256-CBC with seed of 16
         # uncompressed public key from EU Anker server in the format 04 [32 byte x value] [32 byte y value]
@@ -128,6 +155,9 @@ class AnkerSolixClientSession:
         self.nickname: str = ""
         self.mask_credentials: bool = True
         self.request_count: RequestCounter = RequestCounter()
+        self.request_stats: RequestStats = RequestStats()
+        # optional scheduler shared by multiple client sessions
+        self.scheduler: AnkerSolixRequestScheduler | None = None
         # Flag whether compression should be used (Actually not supported by Anker Power servers)
         self.compress_data: bool = False
         # handler for encryption
@@ -149,6 +179,13 @@ class AnkerSolixClientSession:
         """Get the server used for the active session."""
         return self._api_base
 
+    @server.setter
+    def server(self, url: str) -> None:
+        """Set the server base url for the session, e.g. for a local mock server."""
+        if url and str(url).rstrip("/") != self._api_base:
+            self._api_base = str(url).rstrip("/")
+            self._logger.info("Set api %s server to: %s", self.nickname, url)
+
     def logger(self, logger: logging.Logger | None = None) -> logging.Logger:
         """Get or set the logger for API client."""
         if logger:
@@ -242,6 +279,27 @@ class AnkerSolixClientSession:
                 self.request_count.throttled.clear()
         return self._endpoint_limit
 
+    def requestFreshness(self, seconds: float | None = None) -> float:
+        """Get or set the window in seconds to reuse a completed read response for identical reads, 0 disables reuse."""
+        if (
+            seconds is not None
+            and isinstance(seconds, float | int)
+            and float(seconds) != float(self._request_freshness)
+        ):
+            self._request_freshness = float(
+                min(
+                    SolixDefaults.REQUEST_FRESHNESS_MAX,
+                    max(SolixDefaults.REQUEST_FRESHNESS_MIN, seconds),
+                )
+            )
+            self._recent.clear()
+            self._logger.info(
+                "Set api %s request freshness window to %.1f seconds",
+                self.nickname,
+                self._request_freshness,
+            )
+        return self._request_freshness
+
     def generate_header(self) -> dict:
         """Generate common header fields for Api requests."""
         # Start with fixed header fields
@@ -268,12 +326,28 @@ class AnkerSolixClientSession:
         return header
 
     async def _wait_delay(
-        self, delay: float | None = None, endpoint: str | None = None
+        self,
+        delay: float | None = None,
+        endpoint: str | None = None,
+        request_info: str | None = None,
     ) -> None:
         """Wait at least for the defined Api request delay or for the provided delay in seconds since the last request occurred.
 
         If the endpoint is provided and a request limit is defined, the request will be throttled to avoid exceeding endpoint limit per minute.
+        Concurrent requests wait in sequence, if request info is provided the request is counted as sent before the next request can pass.
         """
+        async with self._delay_lock:
+            await self._wait_delay_locked(delay=delay, endpoint=endpoint)
+            if request_info is not None:
+                self._last_request_time = datetime.now()
+                self.request_count.add(
+                    request_time=self._last_request_time, request_info=request_info
+                )
+
+    async def _wait_delay_locked(
+        self, delay: float | None = None, endpoint: str | None = None
+    ) -> None:
+        """Wait for the request delay or endpoint throttle, must be called with the delay lock."""
         if delay is not None and isinstance(delay, float | int):
             delay = float(
                 min(
@@ -320,6 +394,15 @@ class AnkerSolixClientSession:
             )
         )
 
+    @contextlib.asynccontextmanager
+    async def _request_slot(self) -> AsyncIterator[float]:
+        """Wait for a request slot if a shared request scheduler is used and provide the monotonic start time of the request."""
+        if self.scheduler:
+            async with self.scheduler.slot(server=self._api_base, account=self._email):
+                yield monotonic()
+        else:
+            yield monotonic()
+
     async def async_authenticate(self, restart: bool = False) -> bool:
         """Authenticate with server and get an access token. If restart is not enforced, cached login data may be used to obtain previous token."""
         if restart:
@@ -423,7 +506,45 @@ class AnkerSolixClientSession:
             self._loggedIn = False
         return self._loggedIn
 
-    async def request(  # noqa: C901
+    def _body_key(self, body: dict | None = None) -> str:
+        """Get a stable string representation of a request body."""
+        return json.dumps(
+            body or {}, sort_keys=True, separators=(",", ":"), default=str
+        )
+
+    def fingerprint(self, endpoint: str, json: dict | None = None) -> str | None:  # pylint: disable=redefined-outer-name
+        """Get the content hash of the last response received for the endpoint and request body."""
+        return self._fingerprints.get((endpoint, self._body_key(json)))
+
+    def _add_fingerprint(
+        self, endpoint: str, body: dict | None, data: dict | None
+    ) -> None:
+        """Save the content hash of the response data without volatile fields for the endpoint and request body."""
+
+        def stable(value: Any) -> Any:
+            """Remove volatile fields recursively."""
+            if isinstance(value, dict):
+                return {
+                    k: stable(v)
+                    for k, v in value.items()
+                    if k not in SolixDefaults.FINGERPRINT_IGNORED_KEYS
+                }
+            if isinstance(value, list):
+                return [stable(v) for v in value]
+            return value
+
+        key = (endpoint, self._body_key(body))
+        # move key to end and drop the oldest fingerprints, e.g. from date-varying request bodies
+        self._fingerprints.pop(key, None)
+        while len(self._fingerprints) >= SolixDefaults.FINGERPRINTS_MAX:
+            self._fingerprints.pop(next(iter(self._fingerprints)))
+        self._fingerprints[key] = hashlib.sha256(
+            json.dumps(
+                stable((data or {}).get("data")), sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+
+    async def request(
         self,
         method: str,
         endpoint: str,
@@ -431,7 +552,90 @@ class AnkerSolixClientSession:
         headers: dict | None = None,
         json: dict | None = None,  # pylint: disable=redefined-outer-name
     ) -> dict:
-        """Handle all requests to the API. This is also called recursively by login requests if necessary."""
+        """Handle all requests to the API and coalesce concurrent identical read requests into a single request.
+
+        Read requests share the response of an identical active request or reuse a response completed within the freshness window.
+        A response copy is kept only if the request was shared or repeated within the freshness window, other reads are returned without copies.
+        Any other request clears the recent read responses to ensure subsequent reads reflect the changes.
+        """
+        if not (
+            endpoint not in [API_LOGIN, API_KEY_EXCHANGE]
+            and endpoint.rsplit("/", 1)[-1].lower().startswith(("get", "list"))
+        ):
+            self._recent.clear()
+            return await self._request(method, endpoint, headers=headers, json=json)
+        key = (method.upper(), endpoint, self._body_key(json))
+        now = monotonic()
+        if (
+            (recent := self._recent.get(key))
+            and recent[1] is not None
+            and now - recent[0] < self._request_freshness
+        ):
+            self._logger.debug(
+                "Api %s reusing recent response for request: %s %s",
+                self.nickname,
+                method.upper(),
+                endpoint,
+            )
+            return deepcopy(recent[1])
+        while waiter := self._inflight.get(key):
+            self._logger.debug(
+                "Api %s sharing active request: %s %s",
+                self.nickname,
+                method.upper(),
+                endpoint,
+            )
+            self._shared[key] = self._shared.get(key, 0) + 1
+            try:
+                return deepcopy(await shield(waiter))
+            except CancelledError:
+                # retry if only the shared request was cancelled, the first retry becomes the new shared request
+                if not waiter.cancelled() or current_task().cancelling():
+                    raise
+        waiter = get_running_loop().create_future()
+        self._inflight[key] = waiter
+        try:
+            data = await self._request(method, endpoint, headers=headers, json=json)
+        except CancelledError:
+            waiter.cancel()
+            raise
+        except Exception as err:
+            waiter.set_exception(err)
+            # mark exception as retrieved to avoid warnings if no other request was waiting
+            waiter.exception()
+            raise
+        else:
+            now = monotonic()
+            if self._request_freshness:
+                # drop expired responses to limit the cache to reads within the freshness window
+                self._recent = {
+                    k: v
+                    for k, v in self._recent.items()
+                    if now - v[0] < self._request_freshness
+                }
+            # snapshot the response only for sharing requests or repeated reads, since the caller may modify the response
+            snapshot = (
+                deepcopy(data)
+                if self._shared.pop(key, 0) or key in self._recent
+                else None
+            )
+            waiter.set_result(snapshot)
+            if self._request_freshness:
+                self._recent[key] = (now, snapshot)
+            return data
+        finally:
+            self._inflight.pop(key, None)
+            self._shared.pop(key, None)
+
+    async def _request(  # noqa: C901
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        headers: dict | None = None,
+        json: dict | None = None,  # pylint: disable=redefined-outer-name
+    ) -> dict:
+        """Handle a single request to the API. This is also called recursively by login requests if necessary."""
         if not isinstance(headers, dict):
             headers = {}
         if not isinstance(json, dict):
@@ -546,29 +750,30 @@ class AnkerSolixClientSession:
         else:
             body_text = str(json)
         self._logger.debug("Request Body: %s", body_text)
-        # enforce configured delay between any subsequent request
-        await self._wait_delay(endpoint=endpoint)
+        # enforce configured delay between any subsequent request and count the request when it is sent
+        await self._wait_delay(
+            endpoint=endpoint,
+            request_info=(f"{method.upper()} {url} {body_text}").strip(),
+        )
         # uncompressed body must use json parameter, pre-compressed body must use data parameter
         data = {}
         # predefine response to handle TimeoutError like 522 timeouts from server
         resp = SimpleNamespace(status=0)
         try:
-            # make the request, auto_decompression of body enabled by default
-            async with self._session.request(
-                method,
-                url,
-                headers=merged_headers,
-                json=json,
-                # TODO(COMPRESSION): only response encoding seems to be accepted by servers
-                # json=None if self.compress_data else json,
-                # data=compress(str(json).encode()) if self.compress_data else None,
-                timeout=ClientTimeout(total=self._request_timeout),
-            ) as resp:
-                self._last_request_time = datetime.now()
-                self.request_count.add(
-                    request_time=self._last_request_time,
-                    request_info=(f"{method.upper()} {url} {body_text}").strip(),
-                )
+            # make the request within scheduled slot, auto_decompression of body enabled by default
+            async with (
+                self._request_slot() as started,
+                self._session.request(
+                    method,
+                    url,
+                    headers=merged_headers,
+                    json=json,
+                    # TODO(COMPRESSION): only response encoding seems to be accepted by servers
+                    # json=None if self.compress_data else json,
+                    # data=compress(str(json).encode()) if self.compress_data else None,
+                    timeout=ClientTimeout(total=self._request_timeout),
+                ) as resp,
+            ):
                 # request handler has auto-decompression enabled
                 self._logger.debug(
                     "Api %s response received for request: %s %s",
@@ -581,6 +786,12 @@ class AnkerSolixClientSession:
                 # get first the body text for usage in error detail logging if necessary
 
                 body_text = await resp.text()
+                self.request_stats.add(
+                    endpoint=endpoint,
+                    seconds=monotonic() - started,
+                    size=len(body_text),
+                    status=resp.status,
+                )
                 resp.raise_for_status()  # any response status >= 400
                 # get json data without strict checking for json content
                 data = await resp.json(content_type=None)
@@ -621,6 +832,7 @@ class AnkerSolixClientSession:
                 # TODO(ENCRYPTION): data field has to be decoded when encrypted and signature field in response
                 if self.encrypt_payload and data.get("signature"):
                     data["data"] = self._eh.decryptApiData(data.get("data"))
+                self._add_fingerprint(endpoint=endpoint, body=json, data=data)
                 return data
 
         # Exception from ClientSession based on standard response status codes
@@ -628,6 +840,10 @@ class AnkerSolixClientSession:
             if isinstance(err, TimeoutError):
                 resp.status = 522
                 body_text = "Timeout Error"
+                self.request_stats.add_error(endpoint=endpoint, code=resp.status)
+            elif not resp.status:
+                # no response received from server
+                self.request_stats.add_error(endpoint=endpoint, code="no_response")
             # Prepare data dict for Api error lookup
             if not data:
                 data = {}
@@ -653,7 +869,7 @@ class AnkerSolixClientSession:
                         (" for " + str(self.nickname)) if self.nickname else "",
                     )
                     if await self.async_authenticate(restart=True):
-                        return await self.request(
+                        return await self._request(
                             method, endpoint, headers=headers, json=json
                         )
                     self._logger.error("Login failed for user %s", self._email)
@@ -679,7 +895,7 @@ class AnkerSolixClientSession:
                         ),
                         endpoint,
                     )
-                    return await self.request(
+                    return await self._request(
                         method, endpoint, headers=headers, json=json
                     )
                 # Raise error if retry failed too, add stats to message
@@ -713,7 +929,7 @@ class AnkerSolixClientSession:
                         endpoint,
                     )
                     await self._wait_delay(delay=delay)
-                    return await self.request(
+                    return await self._request(
                         method, endpoint, headers=headers, json=json
                     )
             self._logger.error(
@@ -732,6 +948,7 @@ class AnkerSolixClientSession:
             ) from err
         except errors.AnkerSolixError as err:  # Other Exception from API
             if isinstance(err, errors.BusyError):
+                self.request_stats.add_busy(endpoint=endpoint)
                 # Api fails to respond to standard query, repeat once after delay
                 self._logger.error(
                     "Api %s Busy Error %s for request: %s %s\nResponse Text: %s",
@@ -751,9 +968,13 @@ class AnkerSolixClientSession:
                         endpoint,
                     )
                     await self._wait_delay(delay=delay)
-                    return await self.request(
+                    return await self._request(
                         method, endpoint, headers=headers, json=json
                     )
+            else:
+                self.request_stats.add_error(
+                    endpoint=endpoint, code=data.get("code") or type(err).__name__
+                )
             self._logger.error(
                 "Api %s Error %s for request: %s %s\nResponse Text: %s",
                 self.nickname,
@@ -1088,3 +1309,178 @@ class AnkerEncryptionHandler:
         # Remove PKCS7 padding
         padding_length = decrypted[-1]
         return decrypted[:-padding_length].decode()
+
+
+class AnkerSolixRequestScheduler:
+    """Process wide scheduler for Api requests of multiple client sessions.
+
+    Requests are queued per server and dispatched round robin across accounts for fair queuing.
+    A global and a per account request budget per minute can be enforced. The scheduler is shared by assigning it to the client sessions.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SolixDefaults.SCHEDULER_CONCURRENCY,
+        global_limit: int = SolixDefaults.SCHEDULER_GLOBAL_LIMIT,
+        account_limit: int = SolixDefaults.SCHEDULER_ACCOUNT_LIMIT,
+    ) -> None:
+        """Initialize."""
+        # parallel requests per server
+        self.concurrency: int = max(1, int(concurrency))
+        # request budgets per minute, 0 disables the budget
+        self.global_limit: int = max(0, int(global_limit))
+        self.account_limit: int = max(0, int(account_limit))
+        # server queues with active count and waiting futures per account in round robin order
+        self._servers: dict[str, dict] = {}
+        # dispatch timestamps for budget checks
+        self._dispatched: deque[float] = deque()
+        self._account_dispatched: dict[str, deque[float]] = {}
+        # metrics per account
+        self._stats: dict[str, dict] = {}
+
+    def _server(self, server: str) -> dict:
+        """Get the queue structure for a server."""
+        return self._servers.setdefault(
+            server, {"active": 0, "queues": {}, "handle": None, "throttled": set()}
+        )
+
+    def _budget_wait(self, account: str, now: float) -> float:
+        """Get seconds until the global and account budget allow the next request."""
+        wait = 0.0
+        for stamps, limit in [
+            (self._dispatched, self.global_limit),
+            (self._account_dispatched.setdefault(account, deque()), self.account_limit),
+        ]:
+            while stamps and now - stamps[0] >= 60:
+                stamps.popleft()
+            if limit and len(stamps) >= limit:
+                wait = max(wait, 60 - (now - stamps[0]))
+        return wait
+
+    def _dispatch(self, server: str) -> None:
+        """Dispatch waiting requests of a server in round robin order of the accounts."""
+        srv = self._server(server)
+        if srv["handle"]:
+            srv["handle"].cancel()
+            srv["handle"] = None
+        queues: dict[str, deque] = srv["queues"]
+        retry = 0.0
+        while srv["active"] < self.concurrency and queues:
+            now = monotonic()
+            for account in list(queues):
+                queue = queues[account]
+                # drop cancelled waiters
+                while queue and queue[0].done():
+                    srv["throttled"].discard(queue.popleft())
+                if not queue:
+                    queues.pop(account)
+                    continue
+                if wait := self._budget_wait(account, now):
+                    retry = min(retry or wait, wait)
+                    # count each waiter only once, it may be checked again on every dispatch
+                    if queue[0] not in srv["throttled"]:
+                        srv["throttled"].add(queue[0])
+                        self._stats[account]["throttled"] += 1
+                    continue
+                # move account to end for round robin and dispatch the oldest waiter
+                queues[account] = queues.pop(account)
+                waiter = queue.popleft()
+                srv["throttled"].discard(waiter)
+                waiter.set_result(now)
+                srv["active"] += 1
+                self._dispatched.append(now)
+                self._account_dispatched[account].append(now)
+                break
+            else:
+                # no account could be dispatched
+                break
+        if retry and queues:
+            srv["handle"] = get_running_loop().call_later(retry, self._dispatch, server)
+
+    async def acquire(self, server: str, account: str) -> float:
+        """Wait for the turn of the account request on the server and return the wait time in seconds."""
+        start = monotonic()
+        waiter: Future = get_running_loop().create_future()
+        self._server(server)["queues"].setdefault(account, deque()).append(waiter)
+        stats = self._stats.setdefault(
+            account,
+            {
+                "requests": 0,
+                "throttled": 0,
+                "wait_total": 0.0,
+                "wait_max": 0.0,
+                "wait_last": 0.0,
+            },
+        )
+        self._dispatch(server)
+        try:
+            await waiter
+        except CancelledError:
+            # release the slot if the waiter was dispatched already
+            if waiter.done() and not waiter.cancelled():
+                self.release(server)
+            raise
+        wait = monotonic() - start
+        stats["requests"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+        stats["wait_last"] = wait
+        return wait
+
+    def release(self, server: str) -> None:
+        """Release the request slot of the server and dispatch the next waiting request."""
+        srv = self._server(server)
+        srv["active"] = max(0, srv["active"] - 1)
+        self._dispatch(server)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, server: str, account: str) -> AsyncIterator[float]:
+        """Context manager to run a request within a scheduled slot."""
+        wait = await self.acquire(server=server, account=account)
+        try:
+            yield wait
+        finally:
+            self.release(server)
+
+    def queue_depth(self, server: str | None = None) -> int:
+        """Get number of waiting requests for a server or all servers."""
+        return sum(
+            len([w for w in queue if not w.done()])
+            for name, srv in self._servers.items()
+            if server is None or name == server
+            for queue in srv["queues"].values()
+        )
+
+    def metrics(self, account: str | None = None) -> dict:
+        """Get the scheduler metrics with queue depth per server and wait times per account or only for the given account."""
+        accounts = {
+            acc: {
+                "requests": stats["requests"],
+                "throttled": stats["throttled"],
+                "wait_avg": round(stats["wait_total"] / stats["requests"], 3)
+                if stats["requests"]
+                else 0.0,
+                "wait_max": round(stats["wait_max"], 3),
+                "wait_last": round(stats["wait_last"], 3),
+            }
+            for acc, stats in self._stats.items()
+        }
+        return {
+            "concurrency": self.concurrency,
+            "global_limit": self.global_limit,
+            "account_limit": self.account_limit,
+            "requests_last_minute": len(
+                [t for t in self._dispatched if monotonic() - t < 60]
+            ),
+            "servers": {
+                name: {
+                    "active": srv["active"],
+                    "queue_depth": self.queue_depth(server=name),
+                }
+                for name, srv in self._servers.items()
+            },
+        } | (
+            {"account": accounts.get(account) or {}}
+            if account
+            else {"accounts": accounts}
+        )
@@ -1298,6 +1298,7 @@ class AnkerSolixSwitch(CoordinatorEntity, SwitchEntity):
                         export_path=exportpath,
                         mqttdata=bool(kwargs.get(INCLUDE_MQTT)),
                         toggle_cache=self.coordinator.client.toggle_cache,
+                        keep_folder=False,
                     ):
                         # convert path to public available url folder and filename
                         result = urllib.parse.quote(
@@ -1315,6 +1316,11 @@ class AnkerSolixSwitch(CoordinatorEntity, SwitchEntity):
                         "error": str(exception),
                     }
                 finally:
+                    LOGGER.debug(
+                        "'%s' action event loop stats: %s",
+                        service_name,
+                        myexport.loop_stall,
+                    )
                     # Ensure to validate the coordinator client cache again
                     self.coordinator.client.toggle_cache(True)
                     # reset action blocker
@@ -0,0 +1,478 @@
+"""Anker Power/Solix Cloud API mock server to serve example folder responses under the real endpoint paths for offline load testing.
+
+Requests pass the full client session handling with request delays, throttling, retries and aiohttp, unlike the file based test mode.
+Latency, http errors, timeouts, busy errors and endpoint rate limits can be injected.
+Each account can be fanned out to synthetic sites and devices, which are derived from the example sites and devices.
+Run from the repository root of the development environment with the custom_components folder in the Python path:
+PYTHONPATH=custom_components python tools/mockserver.py folder [--port 8080] [--latency 0.2] [--error-rate 0.01] [--rate-limit 10] [--sites N] [--devices M]
+"""
+
+import argparse
+import asyncio
+from collections import deque
+import contextlib
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+from pathlib import Path
+import random
+import re
+import time
+from typing import Any
+import uuid
+
+from aiohttp import web
+
+from anker_solix.solixapi.apitypes import (
+    API_CHARGING_ENDPOINTS,
+    API_ENDPOINTS,
+    API_FILEPREFIXES,
+    API_HES_SVC_ENDPOINTS,
+    API_KEY_EXCHANGE,
+    API_LOGIN,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# energy endpoints with file prefix and request field for the energy source
+ENERGY_ENDPOINTS: dict[str, tuple[str, str]] = {
+    API_ENDPOINTS["energy_analysis"]: ("energy", "device_type"),
+    API_CHARGING_ENDPOINTS["energy_statistics"]: ("charging_energy", "sourceType"),
+    API_HES_SVC_ENDPOINTS["energy_statistics"]: ("hes_energy", "sourceType"),
+}
+# response fields that identify sites and devices in list items
+ID_FIELDS: list[str] = ["site_id", "siteId", "device_sn", "sn", "deviceSn"]
+
+
+class AnkerSolixMockServer:
+    """Define the class to serve the responses of an example folder as Anker cloud server on a local port.
+
+    Responses are looked up by the file prefix of the endpoint and the ids or parameters of the request body that are used as file suffix.
+    Known endpoints without response file are answered with empty data, unknown paths with status 404.
+    Synthetic sites and devices of an account are derived from the example sites and devices by replacing their ids in requests and responses.
+    """
+
+    def __init__(
+        self,
+        folder: str | Path,
+        logger: logging.Logger | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        timeout_rate: float = 0,
+        timeout: float = 30,
+        busy_rate: float = 0,
+        rate_limit: int = 0,
+        sites: int = 0,
+        devices: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize."""
+        self._logger: logging.Logger = logger or _LOGGER
+        self.folder: Path = Path(folder)
+        self.host: str = host
+        self.port: int = port
+        self.latency: float = max(0, latency)
+        self.jitter: float = max(0, jitter)
+        self.error_rate: float = max(0, error_rate)
+        self.timeout_rate: float = max(0, timeout_rate)
+        self.timeout: float = max(0, timeout)
+        self.busy_rate: float = max(0, busy_rate)
+        self.rate_limit: int = max(0, int(rate_limit))
+        self.sites: int = max(0, int(sites))
+        self.devices: int = max(0, int(devices))
+        self._random: random.Random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        # endpoint paths with file prefix key
+        self._endpoints: dict[str, str] = (
+            {path: key for key, path in API_ENDPOINTS.items()}
+            | {path: f"charging_{key}" for key, path in API_CHARGING_ENDPOINTS.items()}
+            | {path: f"hes_{key}" for key, path in API_HES_SVC_ENDPOINTS.items()}
+        )
+        # response file stems of the folder
+        self._files: dict[str, Path] = {}
+        # example site ids with their device serials
+        self._templates: dict[str, list[str]] = {}
+        # synthetic accounts with substitutions per synthetic site, and account email per token
+        self._accounts: dict[str, dict] = {}
+        self._tokens: dict[str, str] = {}
+        self._patterns: dict[frozenset, re.Pattern] = {}
+        # recent request times per account and endpoint for rate limits
+        self._requests: dict[tuple[str, str], deque] = {}
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def __str__(self) -> str:
+        """Return the server statistics as string."""
+        status: dict[str, int] = {}
+        for counts in self.stats.values():
+            for code, count in counts.items():
+                status[code] = status.get(code, 0) + count
+        return f"{sum(status.values())} requests for {len(self.stats)} endpoints, status {dict(sorted(status.items()))}, {len(self._accounts)} accounts"
+
+    @property
+    def url(self) -> str:
+        """Get the base url of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """Index the folder, start the server and return the base url."""
+        self._index()
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # get assigned port if random port was requested
+        if not self.port and self._runner.addresses:
+            self.port = self._runner.addresses[0][1]
+        self._logger.info(
+            "Mock server for folder %s listening on %s", self.folder, self.url
+        )
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def replicate(self, target: str | Path, email: str = "replica@localhost") -> int:
+        """Write the response files fanned out to the synthetic sites and devices of the account into the target folder for file mode and return the number of files.
+
+        Files of an example site or device are written once per synthetic site or device that is derived from it.
+        """
+        self._index()
+        account = self._account(email)
+        target = Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for stem, file in self._files.items():
+            text = file.read_text(encoding="utf-8")
+            copies: list[tuple[str, str]] = []
+            if not account["sites"]:
+                copies = [(stem, text)]
+            elif site_ids := [t for t in self._templates if t in stem]:
+                copies = [
+                    (
+                        self._substitute(stem, site["subst"]),
+                        self._fanout(text, account, index),
+                    )
+                    for index, site in enumerate(account["sites"])
+                    if site["template"] in site_ids
+                ]
+            elif serials := [
+                sn for sns in self._templates.values() for sn in sns if sn in stem
+            ]:
+                copies = [
+                    (
+                        self._substitute(stem, site["subst"] | {template: sn}),
+                        self._fanout(
+                            self._substitute(text, {template: sn}), account, index
+                        ),
+                    )
+                    for index, site in enumerate(account["sites"])
+                    for template, sn in site["devices"]
+                    if template in serials
+                ]
+            else:
+                copies = [(stem, self._fanout(text, account, None))]
+            for name, content in copies:
+                (target / f"{name}.json").write_text(content, encoding="utf-8")
+            count += len(copies)
+        return count
+
+    def _index(self) -> None:
+        """Index the response files and example sites and devices of the folder."""
+        self._files = {file.stem: file for file in self.folder.glob("*.json")}
+        self._templates = {}
+        with contextlib.suppress(OSError, ValueError, AttributeError):
+            for site in self._load("site_list").get("data", {}).get("site_list") or []:
+                if site_id := site.get("site_id"):
+                    self._templates[site_id] = []
+        devices = {}
+        with contextlib.suppress(OSError, ValueError, KeyError):
+            devices = json.loads(
+                self._files[API_FILEPREFIXES["api_devices"]].read_text(encoding="utf-8")
+            )
+        for sn, device in devices.items() if isinstance(devices, dict) else []:
+            if isinstance(device, dict) and device.get("site_id") in self._templates:
+                self._templates[device["site_id"]].append(sn)
+
+    def _load(self, stem: str) -> dict:
+        """Load the response file with the given stem."""
+        if file := self._files.get(stem):
+            return json.loads(file.read_text(encoding="utf-8") or "{}")
+        return {}
+
+    def _account(self, email: str) -> dict:
+        """Get the synthetic sites and devices of the account."""
+        if account := self._accounts.get(email):
+            return account
+        account = {"sites": [], "ids": {}}
+        if self.sites and self._templates:
+            templates = list(self._templates.items())
+            for index in range(self.sites):
+                template_site, template_devices = templates[index % len(templates)]
+                site_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{email}/{index}"))
+                devices = [
+                    (
+                        template_devices[count % len(template_devices)],
+                        hashlib.md5(f"{email}/{index}/{count}".encode())
+                        .hexdigest()[:16]
+                        .upper(),
+                    )
+                    for count in range(
+                        (self.devices or len(template_devices))
+                        if template_devices
+                        else 0
+                    )
+                ]
+                account["sites"].append(
+                    {
+                        "template": template_site,
+                        "site_id": site_id,
+                        "devices": devices,
+                        # default substitution of example ids for this site
+                        "subst": {template_site: site_id} | dict(reversed(devices)),
+                    }
+                )
+                account["ids"][site_id] = (index, template_site)
+                for template, sn in devices:
+                    account["ids"][sn] = (index, template)
+        self._accounts[email] = account
+        return account
+
+    def _substitute(self, text: str, subst: dict[str, str]) -> str:
+        """Replace all ids of the substitution map in the text."""
+        if not subst:
+            return text
+        if not (pattern := self._patterns.get(key := frozenset(subst))):
+            pattern = self._patterns[key] = re.compile(
+                "|".join(re.escape(k) for k in sorted(subst, key=len, reverse=True))
+            )
+        return pattern.sub(lambda m: subst[m.group()], text)
+
+    def _expand(self, data: Any, copies: dict[str, list[dict[str, str]]]) -> Any:
+        """Replace list items of example sites or devices by substituted copies for each synthetic site or device."""
+        if isinstance(data, dict):
+            return {key: self._expand(value, copies) for key, value in data.items()}
+        if isinstance(data, list):
+            items = []
+            for item in data:
+                if isinstance(item, dict) and (
+                    subs := copies.get(
+                        next(
+                            (
+                                item[field]
+                                for field in ID_FIELDS
+                                if isinstance(item.get(field), str)
+                                and item[field] in copies
+                            ),
+                            "",
+                        )
+                    )
+                ):
+                    text = json.dumps(item)
+                    items.extend(
+                        json.loads(self._substitute(text, sub)) for sub in subs
+                    )
+                else:
+                    items.append(self._expand(item, copies))
+            return items
+        return data
+
+    def _fanout(self, text: str, account: dict, index: int | None) -> str:
+        """Fan out the example response to the synthetic sites and devices of the account or the given site index."""
+        sites = (
+            account["sites"] if index is None else account["sites"][index : index + 1]
+        )
+        copies: dict[str, list[dict[str, str]]] = {}
+        for site in sites:
+            if index is None:
+                copies.setdefault(site["template"], []).append(site["subst"])
+            for template, sn in site["devices"]:
+                copies.setdefault(template, []).append(site["subst"] | {template: sn})
+        data = self._expand(json.loads(text), copies)
+        return self._substitute(json.dumps(data), sites[0]["subst"] if sites else {})
+
+    def _resolve(self, prefix: str, body: dict) -> str | None:
+        """Get the response file stem for the file prefix and request body.
+
+        The file suffix must be composed of request values, the most specific suffix is used.
+        """
+        values = set()
+        stack: list = [body]
+        while stack:
+            if isinstance(item := stack.pop(), dict):
+                stack.extend(item.values())
+            elif isinstance(item, list):
+                stack.extend(item)
+            elif item not in [None, ""]:
+                values.add(str(item))
+        best = None
+        for stem in self._files:
+            if stem != prefix and not stem.startswith(f"{prefix}_"):
+                continue
+            # remove request values from suffix, values may contain underscores
+            rest = f"_{stem[len(prefix) + 1 :]}_"
+            for value in sorted(values, key=len, reverse=True):
+                rest = rest.replace(f"_{value}_", "_", 1)
+            if rest.strip("_"):
+                continue
+            if best is None or len(stem) > len(best):
+                best = stem
+        return best
+
+    def _limited(self, account: str, endpoint: str) -> bool:
+        """Check if the request exceeds the rate limit per minute for account and endpoint."""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        requests = self._requests.setdefault((account, endpoint), deque())
+        while requests and now - requests[0] > 60:
+            requests.popleft()
+        if len(requests) >= self.rate_limit:
+            return True
+        requests.append(now)
+        return False
+
+    def _count(self, endpoint: str, status: int | str) -> None:
+        """Count the response status for the endpoint."""
+        counts = self.stats.setdefault(endpoint, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Handle an Api request with injected latency, errors and rate limits."""
+        endpoint = request.match_info.get("path", "")
+        body = {}
+        with contextlib.suppress(ValueError):
+            body = await request.json()
+        if not isinstance(body, dict):
+            body = {}
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if endpoint == API_LOGIN:
+            email = str(body.get("email") or "")
+            self._account(email)
+            self._tokens[token := hashlib.sha256(email.encode()).hexdigest()] = email
+            self._count(endpoint, 200)
+            return web.json_response(
+                {
+                    "code": 0,
+                    "msg": "success!",
+                    "data": {
+                        "user_id": hashlib.md5(email.encode()).hexdigest(),
+                        "email": email,
+                        "nick_name": email.split("@", 1)[0],
+                        "auth_token": token,
+                        "token_expires_at": int(
+                            (datetime.now() + timedelta(days=7)).timestamp()
+                        ),
+                        "country_code": body.get("ab") or "",
+                    },
+                }
+            )
+        if endpoint == API_KEY_EXCHANGE or (
+            endpoint not in self._endpoints and endpoint not in ENERGY_ENDPOINTS
+        ):
+            self._count(endpoint, 404)
+            return web.Response(status=404, text="Not Found")
+        # tokens of previous server runs are unknown and require a new login
+        if not (
+            email := self._tokens.get(token := request.headers.get("x-auth-token", ""))
+        ):
+            self._count(endpoint, 401)
+            return web.Response(status=401, text="Unauthorized")
+        if self._limited(token, endpoint):
+            self._count(endpoint, 429)
+            return web.Response(status=429, text="Too Many Requests")
+        if (rnd := self._random.random()) < self.timeout_rate:
+            self._count(endpoint, "timeout")
+            await asyncio.sleep(self.timeout)
+            return web.Response(status=504, text="Gateway Timeout")
+        if rnd < self.timeout_rate + self.error_rate:
+            status = self._random.choice([500, 502, 503, 504])
+            self._count(endpoint, status)
+            return web.Response(status=status, text="Server Error")
+        if rnd < self.timeout_rate + self.error_rate + self.busy_rate:
+            self._count(endpoint, 21105)
+            return web.json_response(
+                {"code": 21105, "msg": "The system is busy, please try again later"}
+            )
+        # replace synthetic ids in request by example ids
+        account = self._account(email)
+        index = None
+        text = json.dumps(body)
+        if account["ids"]:
+            used = [i for i in account["ids"] if i in text]
+            if used:
+                index = account["ids"][used[0]][0]
+                text = self._substitute(text, {i: account["ids"][i][1] for i in used})
+        body = json.loads(text)
+        if energy := ENERGY_ENDPOINTS.get(endpoint):
+            key = f"{energy[0]}_{body.get(energy[1]) or ''}"
+            prefix = API_FILEPREFIXES.get(key, key)
+        else:
+            prefix = API_FILEPREFIXES.get(self._endpoints[endpoint], "")
+        if prefix and (stem := self._resolve(prefix, body)):
+            text = self._files[stem].read_text(encoding="utf-8")
+        else:
+            text = json.dumps({"code": 0, "msg": "success!", "data": {}})
+        if account["sites"]:
+            text = self._fanout(text, account, index)
+        self._count(endpoint, 200)
+        return web.Response(text=text, content_type="application/json")
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the mock server until cancelled."""
+    server = AnkerSolixMockServer(
+        folder=args.folder,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        busy_rate=args.busy_rate,
+        rate_limit=args.rate_limit,
+        sites=args.sites,
+        devices=args.devices,
+    )
+    await server.start()
+    print(f"Serving {args.folder} on {server.url}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(server)  # noqa: T201
+
+
+def main() -> None:
+    """Run the mock server for the given example folder."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", help="example folder with Api response files")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--timeout-rate", type=float, default=0)
+    parser.add_argument("--busy-rate", type=float, default=0)
+    parser.add_argument(
+        "--rate-limit", type=int, default=0, help="requests per minute and endpoint"
+    )
+    parser.add_argument("--sites", type=int, default=0, help="synthetic sites")
+    parser.add_argument(
+        "--devices", type=int, default=0, help="synthetic devices per site"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+"""Benchmark for the MQTT message pipeline by replaying recorded message files of example folders at maximum throughput.
+
+The messages are passed through the MQTT session message processing, the Api MQTT message callback,
+the device MQTT data update and the MQTT update callback, without cloud or MQTT server connection.
+The codec benchmark measures the decode and command encode throughput per mapped model instead, using frames
+synthesized from the MQTT map field descriptions and recorded messages of the folders.
+Codec results can be saved as baseline, a later run fails if a model throughput regresses beyond the threshold.
+Run from the repository root of the development environment with the custom_components folder in the Python path:
+PYTHONPATH=custom_components python tools/mqttbench.py [folder ...] [--cycles N] [--no-trace]
+PYTHONPATH=custom_components python tools/mqttbench.py [folder ...] --codec [--save FILE] [--baseline FILE] [--threshold 0.3] [--min-time 0.1]
+"""
+
+import argparse
+import asyncio
+from base64 import b64decode
+from collections.abc import Callable
+import gc
+import json
+import logging
+from pathlib import Path
+from statistics import median
+import time
+import tracemalloc
+from typing import Any
+
+from aiohttp import ClientSession
+
+from anker_solix.solixapi.api import AnkerSolixApi
+from anker_solix.solixapi.apitypes import DeviceHexDataTypes
+from anker_solix.solixapi.mqtt import generate_mqtt_command
+from anker_solix.solixapi.mqttcmdmap import (
+    BYTES,
+    COMMAND_LIST,
+    COMMAND_NAME,
+    EMBEDDED,
+    LENGTH,
+    NAME,
+    OFFSET,
+    TYPE,
+    VALUE_DEFAULT,
+    VALUE_MAX,
+    VALUE_MIN,
+    VALUE_OPTIONS,
+    VALUE_STEP,
+)
+from anker_solix.solixapi.mqttmap import SOLIXMQTTMAP
+from anker_solix.solixapi.mqttreplay import AnkerSolixMqttReplay
+from anker_solix.solixapi.mqtttypes import (
+    DeviceHexData,
+    DeviceHexDataField,
+    DeviceHexDataHeader,
+    DeviceJsonData,
+    MqttCmdValidator,
+    MqttDataStats,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+# example folders of the integration in the repository
+EXAMPLES = (
+    Path(__file__).parent.parent / "custom_components" / "anker_solix" / "examples"
+)
+
+# pipeline stages with measured latencies, outer stages include the inner stages
+STAGES = ["read", "process", "received", "update", "callback"]
+# codec operations with measured throughput per model
+CODEC_OPS = ["decode", "extract", "encode", "validate"]
+# fixed data for the reference workload
+REFERENCE_DATA = [bytes(range(idx, idx + 64)) for idx in range(10)]
+# value bytes used for synthesized fields per field type
+TYPE_SIZES = {
+    DeviceHexDataTypes.ui.value: 1,
+    DeviceHexDataTypes.sile.value: 2,
+    DeviceHexDataTypes.var.value: 4,
+    DeviceHexDataTypes.sfle.value: 4,
+    DeviceHexDataTypes.str.value: 16,
+    DeviceHexDataTypes.bin.value: 8,
+}
+
+
+def percentiles(values: list[float]) -> dict:
+    """Get count and latency percentiles in milliseconds of the given nanosecond values."""
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    return {
+        "count": len(values),
+        **{
+            f"p{p}": round(
+                values[min(len(values) - 1, len(values) * p // 100)] / 1e6, 4
+            )
+            for p in [50, 90, 99]
+        },
+        "max": round(values[-1] / 1e6, 4),
+    }
+
+
+def timed(func: Callable, latencies: list, state: dict) -> Callable:
+    """Wrap the function to add the latency of each call to the given list while the state is measuring."""
+
+    def wrapper(*args, **kwargs) -> Any:
+        if not state.get("measure"):
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter_ns() - start)
+
+    return wrapper
+
+
+async def replay_benchmark(
+    folder: str | Path,
+    cycles: int = 1,
+    trace: bool = True,
+    logger: logging.Logger | None = None,
+) -> dict:
+    """Replay all recorded MQTT messages of the folder as fast as possible and return the throughput, latency and allocation statistics."""
+    logger = logger or _LOGGER
+    folder = Path(folder)
+    async with ClientSession() as websession:
+        api = AnkerSolixApi(
+            email="benchmark@localhost",
+            password="",
+            countryId="DE",
+            websession=websession,
+            logger=logger,
+        )
+        api.testDir(str(folder))
+        await api.update_sites(fromFile=True)
+        await api.update_device_details(fromFile=True)
+        session = await api.startMqttSession(fromFile=True)
+        session.mqtt_stats = MqttDataStats()
+        latencies: dict[str, list] = {stage: [] for stage in STAGES}
+        state = {"measure": True}
+        # measure the pipeline stages
+        session.message_callback(
+            func=timed(api.mqtt_received, latencies["received"], state)
+        )
+        api.update_device_mqtt = timed(
+            api.update_device_mqtt, latencies["update"], state
+        )
+        api.mqtt_update_callback(
+            func=timed(api.notify_device, latencies["callback"], state)
+        )
+        replay = AnkerSolixMqttReplay(logger=logger)
+        replay.build(await session.get_mqtt_files(folder))
+
+        def run(count: int, measure: bool) -> int:
+            """Replay all messages for the given number of cycles and return number of messages."""
+            state["measure"] = measure
+            messages = 0
+            for _ in range(count):
+                for index in range(len(replay)):
+                    start = time.perf_counter_ns()
+                    items = replay.messages(index)
+                    if measure and items:
+                        latencies["read"].extend(
+                            [(time.perf_counter_ns() - start) / len(items)] * len(items)
+                        )
+                    for message, size in items:
+                        start = time.perf_counter_ns()
+                        session.process_message(
+                            topic=str(message.pop("topic", "")),
+                            message=message,
+                            size=size,
+                        )
+                        if measure:
+                            latencies["process"].append(time.perf_counter_ns() - start)
+                    messages += len(items)
+            return messages
+
+        start = time.perf_counter()
+        messages = run(count=max(1, cycles), measure=True)
+        seconds = time.perf_counter() - start
+        # measure allocations in separate cycle since tracing slows down the pipeline
+        memory = {}
+        if trace:
+            tracemalloc.start()
+            run(count=1, measure=False)
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory = {
+                "current_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": [
+                    f"{stat.traceback[0].filename.rsplit('/', 1)[-1]}:{stat.traceback[0].lineno} {stat.size / 1024:.1f} KiB in {stat.count} blocks"
+                    for stat in snapshot.statistics("lineno")[:5]
+                ],
+            }
+        replay.close()
+        api.stopMqttSession()
+    return {
+        "folder": folder.name,
+        "devices": len(api.devices),
+        "index": str(replay),
+        "messages": messages,
+        "seconds": round(seconds, 4),
+        "msgs_per_sec": round(messages / seconds, 1) if seconds else 0,
+        "latency_ms": {
+            stage: percentiles(values) for stage, values in latencies.items()
+        },
+        "memory": memory,
+    }
+
+
+def field_length(desc: dict) -> int:
+    """Get the value length in bytes required for the field description and its byte descriptions."""
+    if length := abs(int(desc.get(LENGTH) or 0)):
+        return length
+    subfields = desc.get(BYTES) or {}
+    if isinstance(subfields, list):
+        # byte descriptions with relative positions
+        return sum(
+            int(sub.get(OFFSET, 0)) + field_length(sub)
+            for sub in subfields
+            if isinstance(sub, dict)
+        )
+    if isinstance(subfields, dict) and subfields:
+        return max(
+            int(pos)
+            + (
+                1
+                if isinstance(sub, list)
+                else field_length(sub)
+                if isinstance(sub, dict)
+                else 1
+            )
+            for pos, sub in subfields.items()
+        )
+    return TYPE_SIZES.get(desc.get(TYPE), 4)
+
+
+def json_values(fieldmap: dict) -> dict:
+    """Synthesize json data with representative values for all described keys of the json field map."""
+    return {
+        key: 1 if desc.get(NAME) else json_values(desc)
+        for key, desc in fieldmap.items()
+        if isinstance(desc, dict)
+    }
+
+
+def synthesize_frame(model: str, msgtype: str) -> tuple[bool, bytes] | None:
+    """Synthesize a received hex or json message frame with representative values for all described fields of the model message type."""
+    fieldmap = SOLIXMQTTMAP.get(model, {}).get(msgtype, {})
+    if not isinstance(fieldmap, dict) or fieldmap.get(EMBEDDED):
+        return None
+    if msgtype == DeviceHexDataTypes.json.name:
+        return False, json.dumps(json_values(fieldmap)).encode()
+    if cmd_list := fieldmap.get(COMMAND_LIST):
+        fieldmap = {
+            k: v
+            for key, value in fieldmap.items()
+            if key in cmd_list and isinstance(value, dict)
+            for k, v in value.items()
+        }
+    hexdata = DeviceHexData(
+        model=model, msg_header=DeviceHexDataHeader(cmd_msg=msgtype)
+    )
+    # use pattern of received messages
+    hexdata.msg_header.pattern = bytearray(bytes.fromhex("03010f"))
+    for key, desc in fieldmap.items():
+        if len(key) > 2 or not isinstance(desc, dict):
+            continue
+        typ = desc.get(TYPE) or (
+            DeviceHexDataTypes.bin.value
+            if desc.get(BYTES)
+            else DeviceHexDataTypes.var.value
+        )
+        if typ not in TYPE_SIZES:
+            continue
+        length = field_length(desc) if desc.get(BYTES) else TYPE_SIZES[typ]
+        hexdata.update_field(
+            DeviceHexDataField(
+                f_name=bytes.fromhex(f"{key:>02}"),
+                f_type=typ,
+                f_value=b"A" * length
+                if typ == DeviceHexDataTypes.str.value
+                else bytes((idx * 7 + 1) % 256 for idx in range(length)),
+            )
+        )
+    return (True, bytes(hexdata.hexbytes)) if hexdata.msg_fields else None
+
+
+def recorded_frames(folders: list[str | Path]) -> dict[str, list[tuple[bool, bytes]]]:
+    """Get the unique recorded hex or json payload frames per model of the MQTT message files in the folders."""
+    frames: dict[str, dict[tuple[bool, bytes], None]] = {}
+    for file in [
+        f
+        for folder in folders
+        for f in Path(folder).glob("mqtt_msg_*")
+        if f.suffix != ".gz"
+    ]:
+        try:
+            with file.open(encoding="utf-8") as handle:
+                for line in handle:
+                    message = json.loads(line)
+                    payload = json.loads(message.get("payload") or "{}")
+                    if not isinstance(payload, dict) or not (
+                        model := payload.get("pn")
+                        or (str(message.get("topic")).split("/")[2:3] or [""])[0]
+                    ):
+                        continue
+                    if isinstance(data := payload.get("data"), str):
+                        frames.setdefault(model, {})[(True, b64decode(data))] = None
+                    elif isinstance(data := payload.get("trans"), str):
+                        frames.setdefault(model, {})[(False, b64decode(data))] = None
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Skipped MQTT message file %s: %s", file, err)
+    return {model: list(items) for model, items in frames.items()}
+
+
+def parameter_value(desc: dict) -> Any:
+    """Get a valid parameter value for the command field description."""
+    if VALUE_DEFAULT in desc:
+        return desc[VALUE_DEFAULT]
+    if isinstance(options := desc.get(VALUE_OPTIONS), dict) and options:
+        return next(iter(options))
+    if isinstance(options, list) and options:
+        return options[-1]
+    if VALUE_MIN in desc or VALUE_MAX in desc:
+        return desc.get(VALUE_MAX, desc.get(VALUE_MIN))
+    if str(desc.get(NAME)).endswith("_time"):
+        return "12:00"
+    if desc.get(TYPE) == DeviceHexDataTypes.str.value:
+        return "benchmark"
+    return 1
+
+
+def command_samples(model: str) -> tuple[list, list]:
+    """Get the command parameter and validator samples for all described commands of the model."""
+    commands = []
+    validators = []
+    for value in SOLIXMQTTMAP.get(model, {}).values():
+        if not isinstance(value, dict):
+            continue
+        cmdmaps = (
+            {cmd: value.get(cmd) or {} for cmd in value.get(COMMAND_LIST) or []}
+            if COMMAND_LIST in value
+            else {value[COMMAND_NAME]: value}
+            if COMMAND_NAME in value
+            else {}
+        )
+        for command, cmdmap in cmdmaps.items():
+            descs = [
+                sub
+                for desc in cmdmap.values()
+                if isinstance(desc, dict)
+                for sub in (
+                    [
+                        s
+                        for item in (
+                            desc[BYTES]
+                            if isinstance(desc[BYTES], list)
+                            else desc[BYTES].values()
+                        )
+                        for s in (item if isinstance(item, list) else [item])
+                    ]
+                    if isinstance(desc.get(BYTES), dict | list)
+                    else [desc]
+                )
+                if isinstance(sub, dict) and sub.get(NAME)
+            ]
+            commands.append(
+                (command, {desc[NAME]: parameter_value(desc) for desc in descs})
+            )
+            for desc in descs:
+                if any(
+                    desc.get(k) for k in [VALUE_MIN, VALUE_MAX, VALUE_OPTIONS]
+                ) and not isinstance(value := parameter_value(desc), list | dict):
+                    try:
+                        validator = MqttCmdValidator(
+                            min=desc.get(VALUE_MIN),
+                            max=desc.get(VALUE_MAX),
+                            step=desc.get(VALUE_STEP),
+                            options=desc.get(VALUE_OPTIONS),
+                        )
+                        validator.check(value)
+                    except (TypeError, ValueError):
+                        continue
+                    validators.append((validator, value))
+    return commands, validators
+
+
+def reference(data: bytes) -> dict:
+    """Run a fixed workload similar to the codec operations, used to normalize throughput against the actual machine speed."""
+    return {
+        f"{idx:02x}": int.from_bytes(data[idx : idx + 4], byteorder="little")
+        for idx in range(0, len(data), 4)
+    } | json.loads(json.dumps({"hex": data.hex()}))
+
+
+def cpu_elapsed(func: Callable, items: list, number: int) -> int:
+    """Get the CPU time in nanoseconds to call the function for all items the given number of times."""
+    start = time.process_time_ns()
+    for _ in range(number):
+        for item in items:
+            func(*item)
+    return time.process_time_ns() - start
+
+
+def autorange(func: Callable, items: list, min_time: float) -> int:
+    """Get the number of repetitions of all items that take at least the minimum time in seconds, like timeit autorange."""
+    # untimed call to complete lazy initialization before calibration
+    cpu_elapsed(func, items, 1)
+    number = 1
+    # use the fastest of repeated timings, so a slow outlier does not end the calibration early
+    while (
+        elapsed := min(cpu_elapsed(func, items, number) for _ in range(3))
+    ) < min_time * 1e9:
+        # scale to the expected number with some margin, at least double the number
+        number = max(number * 2, int(number * min_time * 1.2e9 / max(1, elapsed)))
+    return number
+
+
+def throughput(
+    func: Callable,
+    items: list,
+    number: int = 1,
+    rounds: int = 5,
+    min_time: float = 0.1,
+    slices: int = 5,
+) -> tuple[float, float, float]:
+    """Get the median throughput in calls per second of CPU time of the function for all items across the timed rounds.
+
+    The number of repetitions per round is increased until a round takes at least the minimum time in seconds.
+    The median throughput relative to the reference workload is returned as well, which is less sensitive to varying machine speed
+    than the absolute throughput, and the median round time in milliseconds. Each round alternates slices of the function and the
+    reference workload, so both are timed under the same machine conditions.
+    """
+    if not items:
+        return 0, 0, 0
+    slices = max(1, slices)
+    ref_items = [(data,) for data in REFERENCE_DATA]
+    rates: list[float] = []
+    relatives: list[float] = []
+    times: list[float] = []
+    # disable garbage collection during timing like timeit
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = max(1, number, autorange(func, items, min_time / slices))
+        ref_number = autorange(reference, ref_items, min_time / slices)
+        for _ in range(max(1, rounds)):
+            elapsed = ref_elapsed = 0
+            for _ in range(slices):
+                elapsed += cpu_elapsed(func, items, number)
+                ref_elapsed += cpu_elapsed(reference, ref_items, ref_number)
+            elapsed, ref_elapsed = max(1, elapsed), max(1, ref_elapsed)
+            number_round, ref_round = number * slices, ref_number * slices
+            rates.append(len(items) * number_round * 1e9 / elapsed)
+            relatives.append(
+                len(items)
+                * number_round
+                / elapsed
+                / (len(ref_items) * ref_round / ref_elapsed)
+            )
+            times.append(elapsed / 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return round(median(rates), 1), round(median(relatives), 4), round(median(times), 1)
+
+
+def codec_benchmark(
+    folders: list[str | Path] | None = None,
+    models: list[str] | None = None,
+    number: int = 1,
+    rounds: int = 5,
+    min_time: float = 0.1,
+) -> dict:
+    """Measure the decode, field extraction, command encode and parameter validation throughput per model."""
+    recorded = recorded_frames(folders or [])
+    results = {}
+    for model in models or sorted(set(SOLIXMQTTMAP) | set(recorded)):
+        frames = [
+            frame
+            for msgtype in SOLIXMQTTMAP.get(model, {})
+            if (frame := synthesize_frame(model, msgtype))
+        ] + recorded.get(model, [])
+        decoded = [
+            DeviceHexData(model=model, hexbytes=frame)
+            for ishex, frame in frames
+            if ishex
+        ]
+        fields = [
+            (datafield, item)
+            for hexdata in decoded
+            for key, item in hexdata._get_fieldmap().items()  # noqa: SLF001
+            if isinstance(item, dict) and (datafield := hexdata.msg_fields.get(key))
+        ]
+        commands, validators = command_samples(model)
+        encode_errors = 0
+        valid_commands = []
+        for command, parameters in commands:
+            try:
+                generate_mqtt_command(command, parameters, model)
+                valid_commands.append((command, parameters, model))
+            except (TypeError, ValueError):
+                encode_errors += 1
+
+        def decode(ishex: bool, frame: bytes, model: str = model) -> dict:
+            """Decode the frame and extract the described values."""
+            if ishex:
+                return DeviceHexData(model=model, hexbytes=frame).values()
+            return DeviceJsonData(model=model, hexbytes=frame).values()
+
+        results[model] = {
+            "frames": len(frames),
+            "recorded": len(recorded.get(model, [])),
+            "fields": len(fields),
+            "commands": len(valid_commands),
+            "encode_errors": encode_errors,
+            "validators": len(validators),
+        }
+        for op, func, items in [
+            ("decode", decode, frames),
+            ("extract", lambda f, m: f.values(fieldmap=m), fields),
+            ("encode", generate_mqtt_command, valid_commands),
+            ("validate", lambda v, x: v.check(x), validators),
+        ]:
+            (
+                results[model][f"{op}_per_sec"],
+                results[model][f"{op}_relative"],
+                results[model][f"{op}_ms"],
+            ) = throughput(func, items, number, rounds, min_time)
+    return results
+
+
+def regressions(
+    results: dict, baseline: dict, threshold: float = 0.3, min_ms: float = 50
+) -> list[str]:
+    """Get the model codec operations with a throughput relative to the reference workload below the baseline by more than the threshold.
+
+    Operations with a baseline round time below the minimum milliseconds are skipped, since their timing is dominated by noise.
+    """
+    return [
+        f"{model} {op}: {current:.4f} < {base:.4f} relative throughput (-{(1 - current / base):.0%})"
+        for model, values in results.items()
+        for op in CODEC_OPS
+        if (base := (baseline.get(model) or {}).get(f"{op}_relative"))
+        and ((baseline.get(model) or {}).get(f"{op}_ms") or 0) >= min_ms
+        and (current := values.get(f"{op}_relative", 0)) < base * (1 - threshold)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark for the given or all example folders with recorded MQTT messages."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "folders", nargs="*", help="folders with recorded MQTT message files"
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=10, help="replay cycles per folder"
+    )
+    parser.add_argument(
+        "--no-trace", action="store_true", help="skip allocation tracing"
+    )
+    parser.add_argument(
+        "--codec",
+        action="store_true",
+        help="benchmark decode and encode throughput per mapped model",
+    )
+    parser.add_argument("--save", help="save codec results as baseline file")
+    parser.add_argument(
+        "--baseline", help="fail if codec results regress against baseline file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.3,
+        help="allowed relative throughput regression against baseline",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="minimum seconds per codec timing round",
+    )
+    args = parser.parse_args()
+    folders = args.folders or sorted(
+        {file.parent for file in EXAMPLES.glob("*/mqtt_msg_*")}
+    )
+    logging.basicConfig(level=logging.WARNING)
+    if args.codec:
+        results = codec_benchmark(folders=folders, min_time=args.min_time)
+        print(json.dumps(results, indent=2))  # noqa: T201
+        if args.save:
+            Path(args.save).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        if args.baseline:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            if failed := regressions(
+                results, baseline, args.threshold, min_ms=args.min_time * 500
+            ):
+                parser.exit(
+                    1, "Codec throughput regressions:\n" + "\n".join(failed) + "\n"
+                )
+        return
+    for folder in folders:
+        result = asyncio.run(
+            replay_benchmark(folder=folder, cycles=args.cycles, trace=not args.no_trace)
+        )
+        print(json.dumps(result, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""Synthetic MQTT load generator to stress test the MQTT session with many simulated devices.
+
+The generator replaces the paho client of an MQTT session in process and acts as broker and device stand-in.
+Simulated devices publish message frames that are synthesized per model from the MQTT map, with drifting numeric values.
+Each message type is published in the idle interval, or in the realtime interval while a realtime trigger is active.
+Realtime trigger and status request commands are answered like the devices do, other commands with a state message.
+Subscriptions, trigger scheduling and message processing are measured end to end through the session message poller.
+Run from the repository root of the development environment with the custom_components folder in the Python path:
+PYTHONPATH=custom_components python tools/mqttload.py [--devices 100] [--models A17C1 ...] [--duration 60] [--interval 4] [--timeout 120]
+"""
+
+import argparse
+import asyncio
+from base64 import b64decode, b64encode
+import contextlib
+from dataclasses import dataclass, field
+import heapq
+import json
+import logging
+import random
+import string
+import struct
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+import paho.mqtt.client as mqtt
+
+from anker_solix.solixapi.api import AnkerSolixApi
+from anker_solix.solixapi.apitypes import DeviceHexDataTypes
+from anker_solix.solixapi.helpers import convert_timestamp
+from anker_solix.solixapi.mqttcmdmap import (
+    BYTES,
+    COMMAND_LIST,
+    COMMAND_NAME,
+    NAME,
+    TOPIC,
+    SolixMqttCommands,
+)
+from anker_solix.solixapi.mqttmap import SOLIXMQTTMAP
+from anker_solix.solixapi.mqtttypes import DeviceHexData, MqttDataStats
+from mqttbench import percentiles, synthesize_frame
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# struct format, value range and max step of drifting field values per field type
+DRIFT: dict[bytes, tuple[str, float, float, float]] = {
+    DeviceHexDataTypes.ui.value: ("<B", 0, 100, 2),
+    DeviceHexDataTypes.sile.value: ("<h", -1000, 3000, 25),
+    DeviceHexDataTypes.var.value: ("<I", 0, 10000, 50),
+    DeviceHexDataTypes.sfle.value: ("<f", -100, 1000, 2.5),
+}
+
+
+@dataclass
+class MqttLoadDevice:
+    """Dataclass to hold the state of a simulated MQTT device."""
+
+    sn: str
+    pn: str
+    # message frame per message type, hex data or json values
+    frames: dict[str, DeviceHexData | dict] = field(default_factory=dict)
+    # next publish time per message type
+    due: dict[str, float] = field(default_factory=dict)
+    first_trigger: float = 0
+    trigger_start: float = 0
+    trigger_until: float = 0
+    realtime_seconds: float = 0
+    msg_seq: int = 0
+
+    def realtime(self, now: float) -> bool:
+        """Return whether the realtime trigger is active."""
+        return now < self.trigger_until
+
+    def trigger(self, now: float, timeout: float) -> None:
+        """Start or extend the realtime trigger and accumulate the realtime time of an expired trigger."""
+        self.first_trigger = self.first_trigger or now
+        if not self.realtime(now):
+            self.realtime_seconds += self.trigger_until - self.trigger_start
+            self.trigger_start = now
+        self.trigger_until = now + max(0, timeout)
+
+    def stop(self, now: float) -> None:
+        """Stop the realtime trigger and accumulate the realtime time."""
+        self.trigger(now=now, timeout=0)
+
+
+class MqttLoadMessageInfo:
+    """Define the class to return the results of a publish, like the paho MQTTMessageInfo."""
+
+    def __init__(self, mid: int) -> None:
+        """Initialize."""
+        self.mid: int = mid
+        self.rc: mqtt.MQTTErrorCode = mqtt.MQTT_ERR_SUCCESS
+
+    def __str__(self) -> str:
+        """Return the message info as string."""
+        return str((self.rc, self.mid))
+
+    def is_published(self) -> bool:
+        """Return whether the message was published."""
+        return True
+
+    def wait_for_publish(self, timeout: float | None = None) -> None:
+        """Return immediately since messages are published synchronously."""
+
+
+class AnkerSolixMqttLoadGenerator:
+    """Define the class to simulate MQTT devices in process as stand-in for the MQTT client and server.
+
+    The generator implements the parts of the paho client interface that are used by the MQTT session.
+    Messages are only delivered for subscribed topics, commands are decoded with the MQTT map of the device model.
+    """
+
+    def __init__(
+        self,
+        devices: int = 50,
+        models: list[str] | None = None,
+        interval: float = 4,
+        jitter: float = 1,
+        idle_interval: float = 300,
+        app_name: str = "anker_power",
+        seed: int | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initialize."""
+        self._logger: logging.Logger = logger or _LOGGER
+        self._random: random.Random = random.Random(seed)
+        self.interval: float = max(0.1, interval)
+        self.jitter: float = max(0, jitter)
+        self.idle_interval: float = max(self.interval, idle_interval)
+        self.app_name: str = app_name
+        self.connect_timeout: int = 15
+        self.on_message = None
+        self.subscriptions: set[str] = set()
+        self.devices: dict[str, MqttLoadDevice] = {}
+        self._matches: dict[str, bool] = {}
+        self._queue: list[tuple[float, str, str]] = []
+        self._wakeup: asyncio.Event | None = None
+        self._connected: bool = False
+        self._mid: int = 0
+        self._start: float = 0
+        self.stats: dict[str, Any] = {}
+        self.lags: list[float] = []
+        self.durations: list[float] = []
+        self._create_devices(count=devices, models=models)
+
+    def __str__(self) -> str:
+        """Return the generator statistics as string."""
+        return (
+            f"{len(self.devices)} devices of {len({d.pn for d in self.devices.values()})} models, "
+            f"{self.stats.get('messages', 0)} messages ({self.stats.get('bytes', 0) / 1024:.1f} KB), "
+            f"{self.stats.get('dropped', 0)} dropped, commands {self.stats.get('commands', {})}"
+        )
+
+    def _create_devices(self, count: int, models: list[str] | None) -> None:
+        """Create the simulated devices with the message frames of the models in round robin."""
+        templates: dict[str, dict[str, DeviceHexData | dict]] = {}
+        for model in models or list(SOLIXMQTTMAP):
+            frames = {}
+            for msgtype, fieldmap in SOLIXMQTTMAP.get(model, {}).items():
+                # skip command descriptions
+                if (
+                    not isinstance(fieldmap, dict)
+                    or COMMAND_NAME in fieldmap
+                    or COMMAND_LIST in fieldmap
+                    or not (frame := synthesize_frame(model, msgtype))
+                ):
+                    continue
+                frames[msgtype] = frame
+            if frames:
+                templates[model] = frames
+            else:
+                self._logger.warning(
+                    "Skipped model %s without MQTT message descriptions", model
+                )
+        chars = string.ascii_uppercase + string.digits
+        for idx in range(max(0, count) if templates else 0):
+            model = list(templates)[idx % len(templates)]
+            sn = "".join(self._random.choices(chars, k=16))
+            device = MqttLoadDevice(sn=sn, pn=model)
+            for msgtype, (is_hex, frame) in templates[model].items():
+                if is_hex:
+                    device.frames[msgtype] = DeviceHexData(model=model, hexbytes=frame)
+                    self._drift(
+                        device.frames[msgtype], SOLIXMQTTMAP[model][msgtype], init=True
+                    )
+                else:
+                    device.frames[msgtype] = self._drift_json(
+                        json.loads(frame), init=True
+                    )
+            self.devices[sn] = device
+
+    def topics(self) -> set[str]:
+        """Get the topics to subscribe for all simulated devices."""
+        return {f"dt/{self.app_name}/{d.pn}/{d.sn}/#" for d in self.devices.values()}
+
+    def attach(self, session: Any) -> None:
+        """Replace the client of the MQTT session by the generator."""
+        session.mqtt_info = session.mqtt_info or {
+            "app_name": self.app_name,
+            "user_id": "loadtest",
+            "certificate_id": "loadtest",
+        }
+        self.app_name = session.mqtt_info.get("app_name") or self.app_name
+        session.mqtt_stats = session.mqtt_stats or MqttDataStats()
+        session.client = self
+        self.on_message = session.on_message
+        self._connected = True
+
+    # paho client interface used by the MQTT session
+
+    def is_connected(self) -> bool:
+        """Return the connection state."""
+        return self._connected
+
+    def connect_async(self, *args, **kwargs) -> None:
+        """Connect the client."""
+        self._connected = True
+
+    def loop_start(self) -> None:
+        """Start the network loop, not required in process."""
+
+    def loop_stop(self) -> None:
+        """Stop the network loop, not required in process."""
+
+    def disconnect(self, *args, **kwargs) -> None:
+        """Disconnect the client."""
+        self._connected = False
+
+    def subscribe(self, topic: str, *args, **kwargs) -> tuple[mqtt.MQTTErrorCode, int]:
+        """Subscribe the topic."""
+        self.subscriptions.add(str(topic))
+        self._matches = {}
+        self._mid += 1
+        return mqtt.MQTT_ERR_SUCCESS, self._mid
+
+    def unsubscribe(
+        self, topic: str, *args, **kwargs
+    ) -> tuple[mqtt.MQTTErrorCode, int]:
+        """Unsubscribe the topic."""
+        self.subscriptions.discard(str(topic))
+        self._matches = {}
+        self._mid += 1
+        return mqtt.MQTT_ERR_SUCCESS, self._mid
+
+    def publish(
+        self, topic: str, payload: str | bytes | None = None, *args, **kwargs
+    ) -> MqttLoadMessageInfo:
+        """Receive a published command and let the device answer it."""
+        self._mid += 1
+        commands = self.stats.setdefault("commands", {})
+        try:
+            device = self.devices[(str(topic).split("/")[3:4] or [""])[0]]
+            message = json.loads(payload)
+            data = b64decode(json.loads(message.get("payload") or "{}").get("data"))
+            hexdata = DeviceHexData(model=device.pn, hexbytes=data)
+        except (KeyError, TypeError, ValueError) as err:
+            commands["invalid"] = commands.get("invalid", 0) + 1
+            self._logger.warning("Invalid command on topic %s: %s", topic, err)
+            return MqttLoadMessageInfo(mid=self._mid)
+        msgtype = hexdata.msg_header.msgtype.hex()
+        desc = SOLIXMQTTMAP.get(device.pn, {}).get(msgtype) or {}
+        command = str(
+            desc.get(COMMAND_NAME) or "|".join(desc.get(COMMAND_LIST) or []) or msgtype
+        )
+        commands[command] = commands.get(command, 0) + 1
+        now = time.monotonic()
+        if command == SolixMqttCommands.realtime_trigger:
+            values = hexdata.values()
+            if values.get("set_realtime_trigger", 1):
+                device.trigger(
+                    now=now, timeout=float(values.get("trigger_timeout_sec") or 60)
+                )
+            else:
+                device.stop(now=now)
+        # the device answers commands with its state messages
+        for msgtype in device.frames:
+            self._schedule(device=device, msgtype=msgtype, due=now)
+        if self._wakeup:
+            self._wakeup.set()
+        return MqttLoadMessageInfo(mid=self._mid)
+
+    def _schedule(self, device: MqttLoadDevice, msgtype: str, due: float) -> None:
+        """Schedule the next message of the device message type."""
+        device.due[msgtype] = due
+        heapq.heappush(self._queue, (due, device.sn, msgtype))
+
+    def _next_due(self, device: MqttLoadDevice, now: float) -> float:
+        """Get the next publish time of the device message types."""
+        if device.realtime(now):
+            return now + self.interval + self._random.uniform(-1, 1) * self.jitter
+        return now + self.idle_interval
+
+    def _drift(
+        self, hexdata: DeviceHexData, fieldmap: dict, init: bool = False
+    ) -> None:
+        """Drift or initialize the numeric values of the described fields and update timestamps in place."""
+        for name, datafield in (hexdata.msg_fields or {}).items():
+            desc = fieldmap.get(name) or {}
+            if not isinstance(desc, dict) or desc.get(BYTES):
+                continue
+            if desc.get(NAME) == "msg_timestamp":
+                if len(datafield.f_value) == 4:
+                    datafield.f_value = bytearray(convert_timestamp(time.time()))
+                continue
+            fmt, low, high, step = DRIFT.get(bytes(datafield.f_type), (None, 0, 0, 0))
+            if not fmt or len(datafield.f_value) != struct.calcsize(fmt):
+                continue
+            value = (
+                self._random.uniform(low, high)
+                if init
+                else struct.unpack(fmt, datafield.f_value)[0]
+                + self._random.uniform(-step, step)
+            )
+            value = min(high, max(low, value))
+            datafield.f_value = bytearray(
+                struct.pack(fmt, value if fmt == "<f" else round(value))
+            )
+        # fields were changed in place, update any field to refresh the message bytes
+        hexdata.update_field(next(iter(hexdata.msg_fields.values())))
+
+    def _drift_json(self, values: dict, init: bool = False) -> dict:
+        """Drift or initialize the numeric values of the json data in place."""
+        for key, value in values.items():
+            if isinstance(value, dict):
+                self._drift_json(value, init=init)
+            elif isinstance(value, int | float):
+                values[key] = (
+                    self._random.randint(0, 1000)
+                    if init
+                    else min(10000, max(0, value + self._random.randint(-50, 50)))
+                )
+        return values
+
+    def _message(self, device: MqttLoadDevice, msgtype: str) -> tuple[str, bytes]:
+        """Compose the next message of the device message type with drifted values."""
+        frame = device.frames[msgtype]
+        device.msg_seq += 1
+        if isinstance(frame, DeviceHexData):
+            self._drift(frame, SOLIXMQTTMAP[device.pn][msgtype])
+            payload = {"data": b64encode(bytes(frame.hexbytes)).decode()}
+        else:
+            payload = {
+                "trans": b64encode(
+                    json.dumps(self._drift_json(frame)).encode()
+                ).decode()
+            }
+        message = {
+            "head": {
+                "version": "1.0.0.1",
+                "client_id": device.sn,
+                "sess_id": "1234-5678",
+                "msg_seq": device.msg_seq,
+                "cmd": 16,
+                "cmd_status": 1,
+                "sign_code": 0,
+                "seed": "null",
+                "timestamp": int(time.time()),
+            },
+            "payload": json.dumps(payload | {"sn": device.sn, "pn": device.pn}),
+        }
+        topic = f"dt/{self.app_name}/{device.pn}/{device.sn}/{SOLIXMQTTMAP[device.pn][msgtype].get(TOPIC) or 'param_info'}"
+        return topic, json.dumps(message).encode()
+
+    def _subscribed(self, topic: str) -> bool:
+        """Return whether the topic matches any subscription."""
+        if (matched := self._matches.get(topic)) is None:
+            matched = self._matches[topic] = any(
+                mqtt.topic_matches_sub(sub, topic) for sub in self.subscriptions
+            )
+        return matched
+
+    def _deliver(self, device: MqttLoadDevice, msgtype: str, lag: float) -> None:
+        """Publish the next message of the device message type to the client callback."""
+        topic, payload = self._message(device=device, msgtype=msgtype)
+        if not (self._connected and self._subscribed(topic)):
+            self.stats["dropped"] = self.stats.get("dropped", 0) + 1
+            return
+        msg = mqtt.MQTTMessage(topic=topic.encode())
+        msg.payload = payload
+        start = time.perf_counter_ns()
+        if callable(self.on_message):
+            self.on_message(self, None, msg)
+        self.durations.append(time.perf_counter_ns() - start)
+        self.lags.append(lag)
+        self.stats["messages"] = self.stats.get("messages", 0) + 1
+        self.stats["bytes"] = self.stats.get("bytes", 0) + len(payload)
+
+    async def run(self, duration: float = 60) -> dict:
+        """Publish the device messages for the given duration in seconds and return the statistics."""
+        self._wakeup = asyncio.Event()
+        self._start = now = time.monotonic()
+        # stagger the first messages of all devices over the idle interval, unless already scheduled by commands
+        for device in self.devices.values():
+            for msgtype in set(device.frames) - set(device.due):
+                self._schedule(
+                    device=device,
+                    msgtype=msgtype,
+                    due=now + self._random.uniform(0, self.idle_interval),
+                )
+        end = now + max(0, duration)
+        while (now := time.monotonic()) < end:
+            while self._queue and self._queue[0][0] <= now:
+                due, sn, msgtype = heapq.heappop(self._queue)
+                device = self.devices[sn]
+                # skip entries that were rescheduled
+                if device.due.get(msgtype) != due:
+                    continue
+                self._deliver(device=device, msgtype=msgtype, lag=(now - due) * 1e9)
+                self._schedule(
+                    device=device, msgtype=msgtype, due=self._next_due(device, now)
+                )
+            self._wakeup.clear()
+            wait = min(end, self._queue[0][0] if self._queue else end) - now
+            if wait > 0:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            else:
+                # give other tasks a chance when the generator falls behind
+                await asyncio.sleep(0)
+        self._wakeup = None
+        return self.results(now=end)
+
+    def results(self, now: float | None = None) -> dict:
+        """Get the statistics of the run."""
+        now = now or time.monotonic()
+        seconds = max(now - self._start, 1e-9)
+        triggered = [d for d in self.devices.values() if d.trigger_until]
+        realtime = sum(
+            d.realtime_seconds + min(now, d.trigger_until) - d.trigger_start
+            for d in triggered
+        )
+        return {
+            "devices": len(self.devices),
+            "models": len({d.pn for d in self.devices.values()}),
+            "subscriptions": len(self.subscriptions),
+            "seconds": round(seconds, 1),
+            "messages": self.stats.get("messages", 0),
+            "msgs_per_sec": round(self.stats.get("messages", 0) / seconds, 1),
+            "kb": round(self.stats.get("bytes", 0) / 1024, 1),
+            "dropped": self.stats.get("dropped", 0),
+            "commands": self.stats.get("commands", {}),
+            "triggered_devices": len(triggered),
+            # share of time that triggered devices published realtime messages since their first trigger
+            "realtime_coverage": round(
+                realtime / max(sum(now - d.first_trigger for d in triggered), 1e-9), 3
+            )
+            if triggered
+            else 0,
+            "lag_ms": percentiles(self.lags),
+            "process_ms": percentiles(self.durations),
+        }
+
+
+async def load_test(
+    devices: int = 50,
+    models: list[str] | None = None,
+    duration: float = 60,
+    interval: float = 4,
+    idle_interval: float = 300,
+    timeout: int = 120,
+    trigger: float = 1,
+    seed: int | None = None,
+    logger: logging.Logger | None = None,
+) -> dict:
+    """Run the message poller of an Api MQTT session against simulated devices and return the statistics."""
+    logger = logger or _LOGGER
+    generator = AnkerSolixMqttLoadGenerator(
+        devices=devices,
+        models=models,
+        interval=interval,
+        idle_interval=idle_interval,
+        seed=seed,
+        logger=logger,
+    )
+    async with ClientSession() as websession:
+        api = AnkerSolixApi(
+            email="loadtest@localhost",
+            password="",
+            countryId="DE",
+            websession=websession,
+            logger=logger,
+        )
+        # register the simulated devices to pass the Api device MQTT data updates
+        for device in generator.devices.values():
+            api.devices[device.sn] = {
+                "device_sn": device.sn,
+                "device_pn": device.pn,
+                "mqtt_supported": True,
+            }
+        session = await api.startMqttSession(fromFile=True)
+        generator.attach(session)
+        serials = list(generator.devices)
+        poller = asyncio.create_task(
+            session.message_poller(
+                topics=generator.topics(),
+                trigger_devices=set(serials[: round(len(serials) * trigger)]),
+                timeout=timeout,
+            )
+        )
+        try:
+            result = await generator.run(duration=duration)
+            result["updated_devices"] = len(
+                [d for d in api.devices.values() if d.get("mqtt_data")]
+            )
+        finally:
+            poller.cancel()
+            await asyncio.gather(poller, return_exceptions=True)
+            api.stopMqttSession()
+    return result
+
+
+def main() -> None:
+    """Run the MQTT load test with simulated devices."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50, help="simulated devices")
+    parser.add_argument(
+        "--models", nargs="*", help="device models to simulate, default all mapped"
+    )
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument(
+        "--interval", type=float, default=4, help="realtime message interval seconds"
+    )
+    parser.add_argument(
+        "--idle-interval",
+        type=float,
+        default=300,
+        help="message interval seconds without realtime trigger",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=120, help="realtime trigger timeout seconds"
+    )
+    parser.add_argument(
+        "--trigger", type=float, default=1, help="share of devices to trigger"
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(
+        load_test(
+            devices=args.devices,
+            models=args.models,
+            duration=args.duration,
+            interval=args.interval,
+            idle_interval=args.idle_interval,
+            timeout=args.timeout,
+            trigger=args.trigger,
+            seed=args.seed,
+        )
+    )
+    print(json.dumps(result, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Benchmark for the Api poller cycle by running the poller functions in file mode over the example folders.
+
+Each cycle runs update_sites, update_device_details, update_site_details and update_device_energy in the coordinator sequence.
+Wall time and CPU time per call are measured per poller function, peak memory and top allocation sites in a separate traced cycle.
+Each timed round repeats a poller function until it takes at least the minimum time and alternates slices of the function and a reference
+workload, so the CPU time relative to the reference workload is timed under the same machine conditions. Medians across the rounds are reported.
+Sites and devices of a folder can be replicated with the mock server fan out to measure the scaling with the account size.
+Results can be saved as baseline, a later run fails if the relative CPU time of a poller function regresses beyond the threshold.
+Poller functions with a baseline CPU time per call below the minimum milliseconds are not checked, since their timing is dominated by noise.
+Run from the repository root of the development environment with the custom_components folder in the Python path:
+PYTHONPATH=custom_components python tools/pollbench.py [folder ...] [--rounds N] [--min-time 0.1] [--sites N] [--devices M] [--no-trace]
+PYTHONPATH=custom_components python tools/pollbench.py [folder ...] [--save FILE] [--baseline FILE] [--threshold 0.3] [--min-ms 0.5]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+from pathlib import Path
+from statistics import median
+import tempfile
+import time
+import tracemalloc
+
+from aiohttp import ClientSession
+
+from anker_solix.solixapi.api import AnkerSolixApi
+from anker_solix.solixapi.helpers import RequestCounter
+from mockserver import AnkerSolixMockServer
+from mqttbench import EXAMPLES, REFERENCE_DATA, autorange, cpu_elapsed, reference
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# poller functions of a full cycle in coordinator sequence
+POLLER_FUNCTIONS = [
+    "update_sites",
+    "update_device_details",
+    "update_site_details",
+    "update_device_energy",
+]
+
+
+async def _poll_elapsed(api: AnkerSolixApi, name: str, number: int) -> tuple[int, int]:
+    """Get the CPU time and wall time in nanoseconds to run the poller function the given number of times."""
+    # reset the request counter of the session, which keeps each file load of the last hour and would add a rising cost over the rounds
+    api.apisession.request_count = RequestCounter()
+    poll = getattr(api, name)
+    wall = time.perf_counter_ns()
+    cpu = time.process_time_ns()
+    for _ in range(number):
+        await poll(fromFile=True)
+    return time.process_time_ns() - cpu, time.perf_counter_ns() - wall
+
+
+async def _poll_autorange(api: AnkerSolixApi, name: str, min_time: float) -> int:
+    """Get the number of poller function runs that take at least the minimum CPU time in seconds, like timeit autorange."""
+    number = 1
+    # use the fastest of repeated timings, so a slow outlier does not end the calibration early
+    while (
+        elapsed := min([(await _poll_elapsed(api, name, number))[0] for _ in range(3)])
+    ) < min_time * 1e9:
+        # scale to the expected number with some margin, at least double the number
+        number = max(number * 2, int(number * min_time * 1.2e9 / max(1, elapsed)))
+    return number
+
+
+async def poll_benchmark(
+    folder: str | Path,
+    rounds: int = 5,
+    min_time: float = 0.1,
+    slices: int = 5,
+    sites: int = 0,
+    devices: int = 0,
+    trace: bool = True,
+    logger: logging.Logger | None = None,
+) -> dict:
+    """Run the timed poller rounds in file mode for the folder and return the time and allocation statistics per poller function.
+
+    If sites are specified, the folder sites and devices are replicated to the given number of synthetic sites with optional devices per site.
+    """
+    logger = logger or _LOGGER
+    folder = Path(folder)
+    slices = max(1, slices)
+    ref_items = [(data,) for data in REFERENCE_DATA]
+    timings: dict[str, dict[str, list]] = {
+        name: {"wall": [], "cpu": [], "relative": []} for name in POLLER_FUNCTIONS
+    }
+    memory: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tempdir:
+        testdir = folder
+        if sites:
+            AnkerSolixMockServer(
+                folder=folder, logger=logger, sites=sites, devices=devices
+            ).replicate(target=tempdir)
+            testdir = Path(tempdir)
+        async with ClientSession() as websession:
+            api = AnkerSolixApi(
+                email="benchmark@localhost",
+                password="",
+                countryId="DE",
+                websession=websession,
+                logger=logger,
+            )
+            api.testDir(str(testdir))
+            # untimed cycle to populate the caches and complete lazy imports
+            for name in POLLER_FUNCTIONS:
+                await getattr(api, name)(fromFile=True)
+            # disable garbage collection during timing like timeit
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                numbers = {
+                    name: await _poll_autorange(api, name, min_time / slices)
+                    for name in POLLER_FUNCTIONS
+                }
+                ref_number = autorange(reference, ref_items, min_time / slices)
+                for _ in range(max(1, rounds)):
+                    for name in POLLER_FUNCTIONS:
+                        cpu = wall = ref = 0
+                        for _ in range(slices):
+                            cpu_slice, wall_slice = await _poll_elapsed(
+                                api, name, numbers[name]
+                            )
+                            cpu += cpu_slice
+                            wall += wall_slice
+                            ref += cpu_elapsed(reference, ref_items, ref_number)
+                        calls = numbers[name] * slices
+                        timings[name]["cpu"].append(cpu / calls)
+                        timings[name]["wall"].append(wall / calls)
+                        # CPU time per call relative to the CPU time per reference workload run
+                        timings[name]["relative"].append(
+                            cpu / calls / (max(1, ref) / (ref_number * slices))
+                        )
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            # measure allocations in separate cycle since tracing slows down the poller
+            if trace:
+                tracemalloc.start()
+                ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+                for name in POLLER_FUNCTIONS:
+                    before = tracemalloc.take_snapshot().filter_traces(ignore)
+                    tracemalloc.reset_peak()
+                    start, _ = tracemalloc.get_traced_memory()
+                    await getattr(api, name)(fromFile=True)
+                    current, peak = tracemalloc.get_traced_memory()
+                    after = tracemalloc.take_snapshot().filter_traces(ignore)
+                    memory[name] = {
+                        "peak_kb": round((peak - start) / 1024, 1),
+                        "retained_kb": round((current - start) / 1024, 1),
+                        "top": [
+                            f"{stat.traceback[0].filename.rsplit('/', 1)[-1]}:{stat.traceback[0].lineno} {stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+} blocks"
+                            for stat in after.compare_to(before, "lineno")[:5]
+                        ],
+                    }
+                tracemalloc.stop()
+    functions = {
+        name: {
+            "wall_ms": round(median(values["wall"]) / 1e6, 3),
+            "cpu_ms": round(median(values["cpu"]) / 1e6, 3),
+            "cpu_relative": round(median(values["relative"]), 4),
+        }
+        | memory.get(name, {})
+        for name, values in timings.items()
+    }
+    return {
+        "folder": folder.name,
+        "sites": len(api.sites),
+        "devices": len(api.devices),
+        "rounds": max(1, rounds),
+        "cycle_wall_ms": round(sum(f["wall_ms"] for f in functions.values()), 3),
+        "cycle_cpu_ms": round(sum(f["cpu_ms"] for f in functions.values()), 3),
+        "functions": functions,
+    }
+
+
+def regressions(
+    results: dict, baseline: dict, threshold: float = 0.3, min_ms: float = 0.5
+) -> list[str]:
+    """Get the poller functions with a CPU time relative to the reference workload above the baseline by more than the threshold.
+
+    Poller functions with a baseline CPU time per call below the minimum milliseconds are skipped, since their timing is dominated by noise.
+    """
+    return [
+        f"{key} {name}: {current:.4f} > {base:.4f} relative CPU time (+{(current / base - 1):.0%})"
+        for key, result in results.items()
+        for name, values in result.get("functions", {}).items()
+        if (
+            base := ((baseline.get(key) or {}).get("functions") or {})
+            .get(name, {})
+            .get("cpu_relative")
+        )
+        and (
+            ((baseline.get(key) or {}).get("functions") or {})
+            .get(name, {})
+            .get("cpu_ms")
+            or 0
+        )
+        >= min_ms
+        and (current := values.get("cpu_relative", 0)) > base * (1 + threshold)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark for the given or all example folders."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folders", nargs="*", help="folders with Api response files")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="minimum seconds per poller function timing round",
+    )
+    parser.add_argument(
+        "--sites", type=int, default=0, help="replicate folder to synthetic sites"
+    )
+    parser.add_argument(
+        "--devices", type=int, default=0, help="synthetic devices per site"
+    )
+    parser.add_argument(
+        "--no-trace", action="store_true", help="skip allocation tracing"
+    )
+    parser.add_argument("--save", help="save results as baseline file")
+    parser.add_argument(
+        "--baseline", help="fail if results regress against baseline file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.3,
+        help="allowed relative CPU time regression against baseline",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=0.5,
+        help="skip poller functions with lower baseline CPU milliseconds per call",
+    )
+    args = parser.parse_args()
+    folders = args.folders or sorted(
+        folder for folder in EXAMPLES.iterdir() if folder.is_dir()
+    )
+    logging.basicConfig(level=logging.ERROR)
+    results = {}
+    for folder in folders:
+        result = asyncio.run(
+            poll_benchmark(
+                folder=folder,
+                rounds=args.rounds,
+                min_time=args.min_time,
+                sites=args.sites,
+                devices=args.devices,
+                trace=not args.no_trace,
+            )
+        )
+        results[
+            f"{result['folder']}_x{args.sites}" if args.sites else result["folder"]
+        ] = result
+    print(json.dumps(results, indent=2))  # noqa: T201
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if failed := regressions(results, baseline, args.threshold, args.min_ms):
+            parser.exit(1, "Poller CPU time regressions:\n" + "\n".join(failed) + "\n")
+
+
+if __name__ == "__main__":
+    main()